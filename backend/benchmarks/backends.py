@@ -0,0 +1,103 @@
+"""Compare primary-model backends on fit time, predict latency and quality.
+
+Usage::
+
+    python -m backend.benchmarks.backends --sizes 100000,1000000 --backends gbm,hist \
+        --output backend_comparison.json
+
+Each size draws a synthetic labelled frame, splits it like training does and
+fits every backend with calibration on the same splits.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from backend.src.training.data import FEATURE_COLUMNS, TARGET_COLUMN, Dataset, clean_frame
+from backend.src.training.metrics import classification_metrics
+from backend.src.training.pipeline import BACKENDS, fit_primary_with_calibration
+from backend.src.training.split import split_dataset
+
+from .harness import measure, synthetic_frame
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+PREDICT_BATCH_ROWS = 10_000
+
+
+def compare_backends(size: int, backends: List[str], n_threads: int | None, seed: int = 4) -> List[Dict]:
+    frame = clean_frame(synthetic_frame(size, seed=seed, with_target=True))
+    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(
+        Dataset(X=frame[FEATURE_COLUMNS], y=frame[TARGET_COLUMN])
+    )
+    single = X_test.iloc[:1]
+    batch = X_test.iloc[:PREDICT_BATCH_ROWS]
+
+    results = []
+    for backend in backends:
+        print(f"[backends] {backend} rows={size}", file=sys.stderr)
+        start = time.perf_counter()
+        base_model, model = fit_primary_with_calibration(X_train, y_train, X_val, y_val, backend, n_threads)
+        fit_seconds = time.perf_counter() - start
+
+        probs = model.predict_proba(X_test)[:, 1]
+        quality = classification_metrics(y_test.to_numpy(), probs)
+        estimator = base_model.steps[-1][1]
+        results.append(
+            {
+                "backend": backend,
+                "rows": size,
+                "train_rows": int(len(X_train)),
+                "fit_seconds": fit_seconds,
+                "n_iter": int(getattr(estimator, "n_iter_", getattr(estimator, "n_estimators_", 0))),
+                "predict_1": measure(lambda: model.predict_proba(single), rows=1),
+                f"predict_{len(batch)}": measure(lambda: model.predict_proba(batch), rows=len(batch), repeats=3),
+                "auroc": quality["auroc"],
+                "ece": quality["ece"],
+            }
+        )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare primary-model training backends")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma-separated row counts")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backends")
+    parser.add_argument("--threads", type=int, default=None, help="OpenMP threads for the hist backend")
+    parser.add_argument("--output", default="backend_comparison.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    results = [record for size in sizes for record in compare_backends(size, backends, args.threads)]
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with Path(args.output).open("w") as handle:
+        json.dump(report, handle, indent=2)
+    for record in results:
+        print(
+            f"{record['backend']:>5} rows={record['rows']}: fit {record['fit_seconds']:.1f}s, "
+            f"predict(1) p50 {record['predict_1']['latency_ms']['p50']:.2f}ms, "
+            f"AUROC {record['auroc']:.4f}, ECE {record['ece']:.4f}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# metric path -> True when larger values are worse
+TRACKED_METRICS = {
+    ("latency_ms", "p50"): True,
+    ("latency_ms", "p95"): True,
+    ("peak_memory_mb",): True,
+    ("throughput_rows_per_s",): False,
+}
+
+
+def _index(report: Dict) -> Dict[Tuple[str, int], Dict]:
+    return {(r["case"], int(r["rows"])): r for r in report["results"]}
+
+
+def _lookup(record: Dict, path: Tuple[str, ...]):
+    value = record
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float = 0.1) -> List[Dict]:
+    """Return one row per tracked metric present in both reports, flagging regressions beyond ``tolerance``."""
+    rows = []
+    base_index = _index(baseline)
+    for key, record in sorted(_index(current).items()):
+        base = base_index.get(key)
+        if base is None:
+            continue
+        for path, higher_is_worse in TRACKED_METRICS.items():
+            old, new = _lookup(base, path), _lookup(record, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change > tolerance if higher_is_worse else change < -tolerance
+            rows.append(
+                {
+                    "case": key[0],
+                    "rows": key[1],
+                    "metric": ".".join(path),
+                    "baseline": old,
+                    "current": new,
+                    "change": change,
+                    "regression": worse,
+                }
+            )
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a stored baseline")
+    parser.add_argument("current", help="Benchmark JSON produced by backend.benchmarks.run")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline benchmark JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative slowdown (0.1 = 10%%)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        # baselines are machine-specific, so none is committed
+        print(f"No baseline at {baseline_path}; record one on this machine with `make bench-baseline`.", file=sys.stderr)
+        return
+    with baseline_path.open() as handle:
+        baseline = json.load(handle)
+    with Path(args.current).open() as handle:
+        current = json.load(handle)
+    if baseline.get("environment") != current.get("environment"):
+        print(
+            f"Baseline was recorded on {baseline.get('environment')}, not {current.get('environment')}; "
+            "timings may not be comparable.",
+            file=sys.stderr,
+        )
+
+    rows = compare(baseline, current, args.tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(
+            f"{flag:<10} {row['case']:<28} rows={row['rows']:<9} {row['metric']:<24} "
+            f"{row['baseline']:.4g} -> {row['current']:.4g} ({row['change']:+.1%})"
+        )
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
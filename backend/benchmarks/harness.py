@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from backend.src.training.data import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_COLUMNS, TARGET_COLUMN
+from backend.src.validation import CATEGORY_VALUES, NUMERIC_RANGES
+
+
+def synthetic_frame(n_rows: int, seed: int = 0, with_target: bool = False) -> pd.DataFrame:
+    """Schema-valid rows drawn uniformly from the validation ranges.
+
+    The label follows a fixed logistic model of a few features so trained
+    models have real signal to find. Same ``(n_rows, seed)`` gives the same frame.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in CATEGORICAL_COLUMNS:
+        values = np.array(sorted(CATEGORY_VALUES[col]))
+        data[col] = values[rng.integers(0, len(values), n_rows)]
+    for col in NUMERIC_COLUMNS:
+        low, high = NUMERIC_RANGES[col]
+        data[col] = rng.integers(low, high + 1, n_rows)
+    df = pd.DataFrame(data)[FEATURE_COLUMNS]
+    if with_target:
+        logit = (
+            -2.0
+            + 0.6 * df["number_inpatient"].to_numpy() / 10
+            + 0.08 * df["time_in_hospital"].to_numpy() / 3
+            + 0.5 * (df["insulin"].to_numpy() == "Up")
+        )
+        prob = 1 / (1 + np.exp(-logit))
+        df[TARGET_COLUMN] = np.where(rng.random(n_rows) < prob, "<30", "NO")
+    return df
+
+
+def measure(fn: Callable[[], object], rows: int, repeats: int = 5, warmup: int = 1) -> Dict:
+    """Time ``fn`` and report latency percentiles, row throughput and peak traced memory."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    # memory is traced in a separate run so tracemalloc overhead does not skew latency
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.array(timings) * 1000
+    median_s = float(np.median(timings))
+    return {
+        "rows": rows,
+        "repeats": repeats,
+        "latency_ms": {
+            "mean": float(latencies.mean()),
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(latencies.max()),
+        },
+        "throughput_rows_per_s": rows / median_s if median_s > 0 else None,
+        "peak_memory_mb": peak / 1024 / 1024,
+    }
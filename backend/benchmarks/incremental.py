@@ -0,0 +1,107 @@
+"""Wall time and quality of an incremental update against a full retrain.
+
+Usage::
+
+    python -m backend.benchmarks.incremental --history-rows 100000 --new-rows 20000 \
+        --output incremental_comparison.json
+
+A model is first trained on ``history`` synthetic rows. ``new`` rows then
+arrive and the model is updated twice: by ``training.incremental`` (warm-start
+rounds on the new rows) and by a full retrain on history plus new rows. Both
+are scored on the same held-out test rows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+from backend.src.training.data import FEATURE_COLUMNS, TARGET_COLUMN, Dataset, clean_frame
+from backend.src.training.incremental import warm_start_fit
+from backend.src.training.metrics import classification_metrics
+from backend.src.training.pipeline import decision_scores, fit_primary_with_calibration
+from backend.src.training.recalibrate import calibrate_scores
+from backend.src.training.split import split_dataset
+
+from .harness import synthetic_frame
+
+
+def _splits(frame: pd.DataFrame):
+    return split_dataset(Dataset(X=frame[FEATURE_COLUMNS], y=frame[TARGET_COLUMN]))
+
+
+def compare_update(history_rows: int, new_rows: int, n_new_trees: int = 50, seed: int = 5) -> Dict:
+    # only gbm models can be warm-started; see training.incremental
+    backend = "gbm"
+    history = clean_frame(synthetic_frame(history_rows, seed=seed, with_target=True))
+    new = clean_frame(synthetic_frame(new_rows, seed=seed + 1, with_target=True))
+    X_train, X_val, _, y_train, y_val, _ = _splits(history)
+    base_model, _ = fit_primary_with_calibration(X_train, y_train, X_val, y_val, backend)
+
+    new_train, new_val, X_test, new_y_train, new_y_val, y_test = _splits(new)
+    results: Dict = {"backend": backend, "history_rows": history_rows, "new_rows": new_rows}
+
+    print(f"[incremental] warm start +{n_new_trees} rounds on {len(new_train)} rows", file=sys.stderr)
+    start = time.perf_counter()
+    updated = warm_start_fit(base_model, new_train, new_y_train, n_new_trees)
+    scores = decision_scores(updated.steps[-1][1], updated[:-1].transform(new_val))
+    model = calibrate_scores(updated, scores, new_y_val.to_numpy())
+    results["incremental"] = {
+        "seconds": time.perf_counter() - start,
+        **classification_metrics(y_test.to_numpy(), model.predict_proba(X_test)[:, 1]),
+    }
+
+    print(f"[incremental] full retrain on {len(X_train) + len(new_train)} rows", file=sys.stderr)
+    start = time.perf_counter()
+    _, full = fit_primary_with_calibration(
+        pd.concat([X_train, new_train]), pd.concat([y_train, new_y_train]), new_val, new_y_val, backend
+    )
+    results["full_retrain"] = {
+        "seconds": time.perf_counter() - start,
+        **classification_metrics(y_test.to_numpy(), full.predict_proba(X_test)[:, 1]),
+    }
+    results["speedup"] = results["full_retrain"]["seconds"] / results["incremental"]["seconds"]
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare incremental warm-start updates with a full retrain")
+    parser.add_argument("--history-rows", type=int, default=100_000)
+    parser.add_argument("--new-rows", type=int, default=20_000)
+    parser.add_argument("--trees", type=int, default=50, help="Boosting rounds added by the incremental update")
+    parser.add_argument("--output", default="incremental_comparison.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    result = compare_update(args.history_rows, args.new_rows, args.trees)
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": [result],
+    }
+    with Path(args.output).open("w") as handle:
+        json.dump(report, handle, indent=2)
+    print(
+        f"incremental {result['incremental']['seconds']:.1f}s (AUROC {result['incremental']['auroc']:.4f}) vs "
+        f"full retrain {result['full_retrain']['seconds']:.1f}s (AUROC {result['full_retrain']['auroc']:.4f}): "
+        f"{result['speedup']:.1f}x",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
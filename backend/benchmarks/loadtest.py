@@ -0,0 +1,229 @@
+"""Closed-loop load generator for the API.
+
+Drives ``backend.src.main.app`` in-process through ``httpx.ASGITransport``
+(default) or a running server given with ``--url``::
+
+    python -m backend.benchmarks.loadtest --concurrency 16 --duration 30 \
+        --mix predict=70,predict-batch=10,risk-surface=10,auth=10 --output loadtest.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+from .harness import synthetic_frame
+
+DEFAULT_MIX = "predict=70,predict-batch=10,risk-surface=10,auth=10"
+SURFACE_FEATURES = ["time_in_hospital", "num_lab_procedures", "num_medications", "number_inpatient"]
+LOADTEST_EMAIL = "loadtest@example.com"
+LOADTEST_PASSWORD = "loadtest-password"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in REQUESTS:
+            raise ValueError(f"Unknown request kind {name!r}; choose from {', '.join(REQUESTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    def __init__(self, seed: int, batch_rows: int) -> None:
+        self.rng = random.Random(seed)
+        frame = synthetic_frame(512, seed=seed)
+        self.payloads = [
+            {k: (v.item() if hasattr(v, "item") else v) for k, v in row.items()}
+            for row in frame.to_dict(orient="records")
+        ]
+        buffer = io.StringIO()
+        synthetic_frame(batch_rows, seed=seed + 1).to_csv(buffer, index=False)
+        self.batch_csv = buffer.getvalue().encode()
+
+
+async def _predict(client: httpx.AsyncClient, workload: Workload) -> httpx.Response:
+    return await client.post("/predict", json=workload.rng.choice(workload.payloads))
+
+
+async def _predict_batch(client: httpx.AsyncClient, workload: Workload) -> httpx.Response:
+    files = {"file": ("loadtest.csv", workload.batch_csv, "text/csv")}
+    return await client.post("/predict-batch", files=files)
+
+
+async def _risk_surface(client: httpx.AsyncClient, workload: Workload) -> httpx.Response:
+    feature_x, feature_y = workload.rng.sample(SURFACE_FEATURES, 2)
+    steps = workload.rng.choice([10, 15, 20, 25])
+    return await client.get("/risk-surface", params={"feature_x": feature_x, "feature_y": feature_y, "steps": steps})
+
+
+async def _auth(client: httpx.AsyncClient, workload: Workload) -> httpx.Response:
+    response = await client.post("/auth/login", json={"email": LOADTEST_EMAIL, "password": LOADTEST_PASSWORD})
+    if response.status_code != 200:
+        return response
+    token = response.json()["token"]
+    return await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+REQUESTS = {
+    "predict": _predict,
+    "predict-batch": _predict_batch,
+    "risk-surface": _risk_surface,
+    "auth": _auth,
+}
+
+
+async def _ensure_user(client: httpx.AsyncClient) -> None:
+    await client.post(
+        "/auth/register",
+        json={"email": LOADTEST_EMAIL, "name": "Load Test", "password": LOADTEST_PASSWORD},
+    )
+
+
+def _summarize(latencies: List[float], errors: int, duration: float) -> Dict:
+    count = len(latencies)
+    values = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "rps": count / duration if duration > 0 else 0.0,
+        "latency_ms": {
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "p99": float(np.percentile(values, 99)),
+            "max": float(values.max()),
+        },
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed: int = 0,
+    batch_rows: int = 50,
+) -> Dict:
+    await _ensure_user(client)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def worker(worker_id: int) -> None:
+        workload = Workload(seed + worker_id, batch_rows)
+        while time.perf_counter() < deadline:
+            kind = workload.rng.choices(kinds, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await REQUESTS[kind](client, workload)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[kind].append(time.perf_counter() - start)
+            if failed:
+                errors[kind] += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "overall": _summarize(all_latencies, sum(errors.values()), elapsed),
+        "by_request": {kind: _summarize(latencies[kind], errors[kind], elapsed) for kind in kinds},
+        "elapsed_s": elapsed,
+    }
+
+
+async def _run_in_process(args: argparse.Namespace, mix: Dict[str, float]) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="dc-loadtest-") as tmp:
+        workdir = Path(tmp)
+        if not args.use_artifacts:
+            from .run import build_fixture, configure_artifacts
+
+            configure_artifacts(workdir)
+            build_fixture(workdir)
+
+        from backend.src import database
+
+        database.DB_PATH = workdir / "loadtest.db"
+        from backend.src.main import app, init_db
+
+        init_db()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", headers=_headers(args)) as client:
+            return await run_load(client, mix, args.concurrency, args.duration, args.seed, args.batch_rows)
+
+
+async def _run_remote(args: argparse.Namespace, mix: Dict[str, float]) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, headers=_headers(args), limits=limits, timeout=60) as client:
+        return await run_load(client, mix, args.concurrency, args.duration, args.seed, args.batch_rows)
+
+
+def _headers(args: argparse.Namespace) -> Dict[str, str]:
+    return {"X-API-Key": args.api_key} if args.api_key else {}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the Discharge Compass API")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process ASGI)")
+    parser.add_argument(
+        "--use-artifacts",
+        action="store_true",
+        help="In-process only: serve the configured artifacts instead of training a synthetic fixture",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted request mix, e.g. predict=70,auth=30")
+    parser.add_argument("--batch-rows", type=int, default=50, help="Rows per /predict-batch upload")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="loadtest_results.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    mix = parse_mix(args.mix)
+    runner = _run_remote if args.url else _run_in_process
+    report = asyncio.run(runner(args, mix))
+    report.update(
+        {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": mix,
+        }
+    )
+    with Path(args.output).open("w") as handle:
+        json.dump(report, handle, indent=2)
+    overall = report["overall"]
+    print(
+        f"{overall['requests']} requests, {overall['rps']:.1f} rps, "
+        f"p50 {overall['latency_ms']['p50']:.1f}ms p99 {overall['latency_ms']['p99']:.1f}ms, "
+        f"error rate {overall['error_rate']:.2%}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
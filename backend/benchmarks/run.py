@@ -0,0 +1,175 @@
+"""Reproducible performance benchmarks for inference, explanation, surfaces and training.
+
+Usage::
+
+    python -m backend.benchmarks.run --sizes 1,100,10000 --output bench.json
+    python -m backend.benchmarks.run --large --output bench.json   # adds 1M rows
+    python -m backend.benchmarks.compare bench.json --baseline backend/benchmarks/baseline.json
+
+All data is synthetic with fixed seeds, so results are comparable across
+commits on the same machine.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .harness import measure, synthetic_frame
+
+DEFAULT_SIZES = [1, 100, 10_000]
+# opt-in with --large: minutes per case and several GB of memory
+LARGE_SIZES = [1_000_000]
+FIXTURE_ROWS = 5_000
+MIN_TRAIN_ROWS = 1_000
+
+
+def configure_artifacts(workdir: Path) -> None:
+    """Point the backend config at ``workdir``; must run before importing backend modules."""
+    if "backend.src.config" in sys.modules:
+        raise RuntimeError("backend.src.config was imported before configure_artifacts; it would serve the wrong artifacts")
+    os.environ["ARTIFACT_DIR"] = str(workdir)
+    for name, filename in {
+        "MODEL_PATH": "model.joblib",
+        "BASE_MODEL_PATH": "base_model.joblib",
+        "REFERENCE_PATH": "feature_reference.json",
+        "METADATA_PATH": "model_metadata.json",
+        "BACKGROUND_PATH": "background_sample.csv",
+    }.items():
+        os.environ[name] = str(workdir / filename)
+
+
+def build_fixture(workdir: Path) -> None:
+    from backend.src.training.train import train
+
+    data_path = workdir / "fixture.csv"
+    synthetic_frame(FIXTURE_ROWS, seed=1, with_target=True).to_csv(data_path, index=False)
+    train(data_path.as_posix(), workdir)
+
+
+def inference_cases(sizes: List[int]) -> Dict[str, Dict[int, Callable[[], object]]]:
+    from backend.src import explain, modeling
+    from backend.src.batch_io import iter_batch_chunks
+    from backend.src.main import _compute_surface
+    from backend.src.validation import validate_frame
+
+    model = modeling.load_model()
+    base_model = modeling.load_base_model()
+    reference = modeling.load_reference()
+    single = synthetic_frame(1, seed=2)
+    payload = single.iloc[0].to_dict()
+    payload = {k: (v.item() if hasattr(v, "item") else v) for k, v in payload.items()}
+
+    cases: Dict[str, Dict[int, Callable[[], object]]] = {
+        "predict": {1: lambda: modeling.predict(payload)},
+        "shap_local_contributions": {1: lambda: explain.shap_local_contributions(base_model, single)},
+        "ablation_contributions": {1: lambda: explain.ablation_contributions(model, single, reference)},
+        "risk_surface": {
+            625: lambda: _compute_surface.__wrapped__("time_in_hospital", "num_medications", 25, 0.0)
+        },
+        "predict_proba": {},
+        "predict_batch_parse": {},
+    }
+    for size in sizes:
+        frame = synthetic_frame(size, seed=3)
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False)
+        csv_bytes = buffer.getvalue().encode()
+
+        def parse(csv_bytes=csv_bytes):
+            for chunk in iter_batch_chunks("batch.csv", csv_bytes, 50_000):
+                validate_frame(chunk, max_errors=1000)
+
+        cases["predict_proba"][size] = lambda frame=frame: model.predict_proba(frame)
+        cases["predict_batch_parse"][size] = parse
+    return cases
+
+
+def training_cases(sizes: List[int], workdir: Path) -> Dict[str, Dict[int, Callable[[], object]]]:
+    from backend.src.training.evaluate import evaluate
+    from backend.src.training.train import train
+
+    cases: Dict[str, Dict[int, Callable[[], object]]] = {"train": {}, "evaluate": {}}
+    for size in sizes:
+        if size < MIN_TRAIN_ROWS:
+            continue
+        run_dir = workdir / f"train_{size}"
+        run_dir.mkdir(exist_ok=True)
+        data_path = run_dir / "data.csv"
+        synthetic_frame(size, seed=4, with_target=True).to_csv(data_path, index=False)
+        cases["train"][size] = lambda p=data_path, d=run_dir: train(p.as_posix(), d)
+        cases["evaluate"][size] = lambda p=data_path, d=run_dir: evaluate(p.as_posix(), d, None)
+    return cases
+
+
+def run(sizes: List[int], selected: List[str] | None, repeats: int, max_train_rows: int) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="dc-bench-") as tmp:
+        workdir = Path(tmp)
+        configure_artifacts(workdir)
+        build_fixture(workdir)
+
+        cases = inference_cases(sizes)
+        cases.update(training_cases([s for s in sizes if s <= max_train_rows], workdir))
+
+        results = []
+        for name, by_size in cases.items():
+            if selected and name not in selected:
+                continue
+            for size, fn in by_size.items():
+                # training cases are slow and deterministic; fewer repeats suffice
+                case_repeats = 1 if name in {"train", "evaluate"} else repeats
+                print(f"[bench] {name} rows={size}", file=sys.stderr)
+                record = measure(fn, rows=size, repeats=case_repeats, warmup=0 if case_repeats == 1 else 1)
+                record["case"] = name
+                results.append(record)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run Discharge Compass performance benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma-separated row counts")
+    parser.add_argument("--large", action="store_true", help=f"Also run {', '.join(str(s) for s in LARGE_SIZES)} rows")
+    parser.add_argument("--cases", default=None, help="Comma-separated case names (default: all)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per inference case")
+    parser.add_argument(
+        "--max-train-rows",
+        type=int,
+        default=100_000,
+        help="Skip train/evaluate cases above this many rows",
+    )
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if args.large:
+        sizes += [size for size in LARGE_SIZES if size not in sizes]
+    selected = [c.strip() for c in args.cases.split(",")] if args.cases else None
+    report = run(sizes, selected, args.repeats, args.max_train_rows)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {len(report['results'])} results to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
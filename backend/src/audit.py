@@ -0,0 +1,273 @@
+"""Append-only audit trail of every served prediction.
+
+Request handlers append the raw record (inputs, output, model version, top
+features) to an in-memory deque. Nothing is serialized or written on the
+request path. A background thread wakes every ``flush_seconds``, or sooner
+once ``batch_size`` records are waiting. It serializes the pending records
+and hands them to a sink in one write:
+
+- ``FileSink`` appends one gzip member of JSON lines per flush to the
+  current segment and starts a new segment once it passes ``max_bytes``.
+  Concatenated gzip members are still one valid gzip file. A crash can lose
+  at most the member being written, and the replay reader skips such a
+  truncated tail.
+- ``SqliteSink`` inserts each flush into the ``audit_log`` table in a single
+  transaction.
+
+When the queue is full, new records are dropped and counted rather than
+blocking requests. ``stop`` flushes whatever is still queued.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import database
+from .instrumentation import QUEUE_DEPTH, REGISTRY
+from .modeling import RISK_TIERS, risk_tier_codes
+
+logger = logging.getLogger("discharge-compass")
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+AUDIT_RECORDS = REGISTRY.counter("dc_audit_records_total", "Prediction audit records by outcome", ("result",))
+AUDIT_FLUSH_LATENCY = REGISTRY.histogram("dc_audit_flush_seconds", "Time to serialize and write one audit batch")
+
+
+class FileSink:
+    def __init__(self, directory: Path, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._segment: Optional[Path] = None
+        self._sequence = 0
+
+    def _current_segment(self) -> Path:
+        if self._segment is None or self._segment.stat().st_size >= self.max_bytes:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            self._sequence += 1
+            self._segment = self.directory / f"{SEGMENT_PREFIX}{stamp}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+            self._segment.touch()
+        return self._segment
+
+    def write(self, lines: List[str]) -> None:
+        member = gzip.compress(("\n".join(lines) + "\n").encode(), compresslevel=6)
+        with self._current_segment().open("ab") as handle:
+            handle.write(member)
+
+
+class SqliteSink:
+    """Writes through its own connection, used only by the audit writer.
+
+    Sharing the process-wide connection would let this transaction's commit
+    or rollback take in half of a request handler's transaction.
+    """
+
+    def __init__(self) -> None:
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def write(self, lines: List[str]) -> None:
+        if self._conn is None:
+            self._conn = database.connect()
+        database.insert_audit_records(lines, self._conn)
+
+
+def _batch_lines(item) -> List[str]:
+    """Serialize a scored batch with the same keys as a single prediction.
+
+    Batch scoring computes no per-row explanations, so ``top_features`` is
+    always null for these records.
+    """
+    _, frame, probabilities, prediction_ids, timestamp, model_version, scored_by = item
+    inputs = frame.to_dict(orient="records")
+    tiers = RISK_TIERS[risk_tier_codes(np.asarray(probabilities, dtype=float))]
+    created_at = datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+    if scored_by is None:
+        scored_by = ["model"] * len(inputs)
+    return [
+        json.dumps(
+            {
+                "prediction_id": str(prediction_id),
+                "created_at": created_at,
+                "model_version": model_version,
+                "scored_by": str(by),
+                "inputs": row,
+                "probability": float(probability),
+                "risk_tier": str(tier),
+                "top_features": None,
+            },
+            default=_json_default,
+        )
+        for row, probability, tier, prediction_id, by in zip(inputs, probabilities, tiers, prediction_ids, scored_by)
+    ]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class AuditLog:
+    def __init__(
+        self,
+        sink,
+        model_version: Callable[[], str],
+        max_queue: int = 100_000,
+        batch_size: int = 1000,
+        flush_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.sink = sink
+        self._model_version = model_version
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._clock = clock
+        # items are single records or whole scored batches; _pending_rows counts records
+        self._queue: deque = deque()
+        self._pending_rows = 0
+        self._count_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- request path --
+
+    def record_prediction(self, prediction_id: str, inputs: Dict, result: Dict) -> None:
+        self._enqueue(("single", prediction_id, inputs, result, self._clock(), self._model_version()), 1)
+
+    def record_batch(self, frame: pd.DataFrame, probabilities, prediction_ids, scored_by=None) -> None:
+        """Queue a scored batch; ``scored_by`` labels each row ``"model"`` or ``"student"`` (default all ``"model"``)."""
+        self._enqueue(
+            ("batch", frame, probabilities, prediction_ids, self._clock(), self._model_version(), scored_by), len(frame)
+        )
+
+    def _enqueue(self, item, n_rows: int) -> None:
+        if self._thread is None:
+            self.start()
+        with self._count_lock:
+            if self._pending_rows + n_rows > self.max_queue:
+                AUDIT_RECORDS.inc("dropped", amount=n_rows)
+                return
+            self._queue.append(item)
+            self._pending_rows += n_rows
+            wake = self._pending_rows >= self.batch_size
+        if wake:
+            self._wake.set()
+
+    # -- background --
+
+    def start(self) -> None:
+        with self._flush_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and flush everything still queued."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10)
+        self._thread = None
+        self.flush()
+
+    def queue_depth(self) -> int:
+        return self._pending_rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every queued record to the sink; returns the number written."""
+        with self._flush_lock:
+            items = []
+            while True:
+                try:
+                    items.append(self._queue.popleft())
+                except IndexError:
+                    break
+            if not items:
+                return 0
+            start = time.perf_counter()
+            lines: List[str] = []
+            for item in items:
+                if item[0] == "single":
+                    lines.append(self._single_line(item))
+                else:
+                    lines.extend(_batch_lines(item))
+            with self._count_lock:
+                self._pending_rows -= len(lines)
+            try:
+                self.sink.write(lines)
+            except Exception:
+                logger.exception("Audit flush failed; %d records lost", len(lines))
+                AUDIT_RECORDS.inc("failed", amount=len(lines))
+                return 0
+            AUDIT_RECORDS.inc("written", amount=len(lines))
+            AUDIT_FLUSH_LATENCY.observe(time.perf_counter() - start)
+            return len(lines)
+
+    @staticmethod
+    def _single_line(item) -> str:
+        _, prediction_id, inputs, result, timestamp, model_version = item
+        return json.dumps(
+            {
+                "prediction_id": prediction_id,
+                "created_at": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                "model_version": model_version,
+                "scored_by": "model",
+                "inputs": inputs,
+                "probability": result["probability"],
+                "risk_tier": result.get("risk_tier"),
+                "top_features": result.get("top_features"),
+            },
+            default=_json_default,
+        )
+
+
+def register_audit_gauge(audit_log: AuditLog) -> None:
+    QUEUE_DEPTH.set_function(lambda: {("audit",): float(audit_log.queue_depth())})
+
+
+def read_audit_files(directory: Path) -> Iterator[Dict]:
+    """Replay every record in ``directory``'s segments, oldest first.
+
+    A segment whose last gzip member was cut short (crash mid-write) yields
+    the records before it.
+    """
+    for path in sorted(Path(directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+        data = path.read_bytes()
+        while data:
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                chunk = decompressor.decompress(data)
+            except zlib.error:
+                break
+            if not decompressor.eof:
+                break
+            for line in chunk.decode().splitlines():
+                if line:
+                    yield json.loads(line)
+            data = decompressor.unused_data
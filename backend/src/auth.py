@@ -14,3 +14,10 @@ def api_key_dependency(expected_key: str):
             raise HTTPException(status_code=401, detail="Unauthorized")
 
     return dependency
+
+
+def admin_disabled_dependency():
+    async def dependency():
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_API_KEY to enable them.")
+
+    return dependency
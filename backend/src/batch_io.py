@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import io
+import json
+import pickle
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from .training.data import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+    import pyarrow.ipc as pa_ipc  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    PYARROW_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pa_csv = None
+    pa_ipc = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+REQUIRED_COLUMNS: List[str] = list(FEATURE_COLUMNS)
+
+CSV_EXTENSIONS = (".csv",)
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+SUPPORTED_EXTENSIONS = CSV_EXTENSIONS + EXCEL_EXTENSIONS + PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+
+OUTPUT_FORMATS = ("json", "parquet", "arrow")
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+# Categorical columns are read as nullable strings up front so the CSV engine
+# never guesses (e.g. the "None" A1C result becoming NaN) while empty cells
+# stay missing. Numerics are read as floats so an empty cell is NaN rather
+# than turning the whole column into objects.
+CSV_DTYPES: Dict[str, str] = {
+    **{col: "string" for col in CATEGORICAL_COLUMNS},
+    **{col: "float64" for col in NUMERIC_COLUMNS},
+}
+
+
+class BatchParseError(ValueError):
+    pass
+
+
+class MissingColumnsError(BatchParseError):
+    def __init__(self, missing: List[str]) -> None:
+        super().__init__(f"Missing columns: {', '.join(missing)}")
+        self.missing = missing
+
+
+def is_supported(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def iter_batch_chunks(filename: str, source: bytes | BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield the required columns of an upload in chunks of at most ``chunk_rows`` rows.
+
+    ``source`` is the upload's bytes or a seekable binary file, such as the
+    spooled file behind ``UploadFile``. CSV, XLSX, Parquet and Arrow uploads
+    are streamed, so only the current chunk is decoded; legacy ``.xls``
+    workbooks are parsed in one go and sliced. Each chunk is indexed by the
+    0-based position of its rows among the file's data rows. Raises
+    ``MissingColumnsError`` before the first chunk when the header lacks a
+    required column, and ``BatchParseError`` when the file cannot be read.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    fname = filename.lower()
+    if fname.endswith(".xlsx"):
+        yield from iter_xlsx_chunks(source, chunk_rows)
+        return
+    if fname.endswith(CSV_EXTENSIONS):
+        chunks = _iter_csv(source, chunk_rows)
+    elif fname.endswith(PARQUET_EXTENSIONS + ARROW_EXTENSIONS):
+        chunks = _iter_columnar(fname, source, chunk_rows)
+    else:
+        chunks = _iter_excel(source, chunk_rows)
+    try:
+        yield from chunks
+    except BatchParseError:
+        raise
+    except Exception as exc:
+        raise BatchParseError(f"Could not parse file: {exc}") from exc
+
+
+def iter_xlsx_chunks(source: bytes | BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Stream the first sheet of a workbook with openpyxl's read-only mode.
+
+    Only the current chunk of cell values is held in memory, so sheet size
+    no longer drives peak memory the way ``pd.read_excel`` does. Blank rows
+    are skipped but still counted, so chunk indexes follow the sheet.
+    """
+    from openpyxl import load_workbook
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except Exception as exc:
+        raise BatchParseError(f"Could not parse file: {exc}") from exc
+    try:
+        sheet_rows = workbook.active.iter_rows(values_only=True)
+        header = next(sheet_rows, None) or ()
+        positions = {str(name).strip(): idx for idx, name in enumerate(header) if name is not None}
+        missing = [c for c in REQUIRED_COLUMNS if c not in positions]
+        if missing:
+            raise MissingColumnsError(missing)
+        indices = [positions[c] for c in REQUIRED_COLUMNS]
+
+        buffer: List[Tuple] = []
+        index: List[int] = []
+        try:
+            for position, values in enumerate(sheet_rows):
+                if values is None or all(v is None for v in values):
+                    continue
+                buffer.append(tuple(values[i] if i < len(values) else None for i in indices))
+                index.append(position)
+                if len(buffer) >= chunk_rows:
+                    yield _typed_chunk(buffer, index)
+                    buffer, index = [], []
+        except BatchParseError:
+            raise
+        except Exception as exc:
+            raise BatchParseError(f"Could not parse file: {exc}") from exc
+        if buffer:
+            yield _typed_chunk(buffer, index)
+    finally:
+        workbook.close()
+
+
+def _typed_chunk(buffer: List[Tuple], index: List[int]) -> pd.DataFrame:
+    columns = list(zip(*buffer))
+    data = {}
+    for col, values in zip(REQUIRED_COLUMNS, columns):
+        if col in CATEGORICAL_COLUMNS:
+            data[col] = pd.array([None if v is None else str(v) for v in values], dtype="string")
+        else:
+            # openpyxl returns typed cells; text in a numeric column stays
+            # object so validation can report it
+            data[col] = pd.Series(values)
+    frame = pd.DataFrame(data)
+    frame.index = pd.Index(index)
+    return frame
+
+
+def _required_names(header) -> List:
+    """Header names of the required columns, matched after stripping whitespace."""
+    names = {str(name).strip(): name for name in header}
+    missing = [c for c in REQUIRED_COLUMNS if c not in names]
+    if missing:
+        raise MissingColumnsError(missing)
+    return [names[c] for c in REQUIRED_COLUMNS]
+
+
+def _iter_csv(source: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _required_names(pd.read_csv(source, nrows=0).columns)
+    source.seek(0)
+    emitted = 0
+    if PYARROW_AVAILABLE:
+        # multithreaded block reader with the column types pinned
+        try:
+            for chunk in _iter_csv_arrow(source, chunk_rows):
+                yield chunk
+                emitted += len(chunk)
+            return
+        except pa.ArrowInvalid:
+            # a cell the pinned types reject, such as text in a numeric
+            # column; the C engine picks up after the rows already yielded
+            # and keeps that column for validation to report
+            source.seek(0)
+    dtypes = {col: dtype for col, dtype in CSV_DTYPES.items() if col in CATEGORICAL_COLUMNS}
+    reader = pd.read_csv(source, chunksize=chunk_rows, dtype=dtypes, keep_default_na=False, na_values=[""])
+    with reader:
+        for frame in reader:
+            frame = frame[frame.index >= emitted]
+            if len(frame):
+                frame = frame[_required_names(frame.columns)]
+                frame.columns = REQUIRED_COLUMNS
+                yield frame
+
+
+def _iter_csv_arrow(source: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    convert = pa_csv.ConvertOptions(
+        column_types={col: pa.type_for_alias(dtype) for col, dtype in CSV_DTYPES.items()},
+        null_values=[""],
+        strings_can_be_null=True,
+    )
+    reader = pa_csv.open_csv(source, convert_options=convert)
+    names = _required_names(reader.schema.names)
+    offset = 0
+    for batch in reader:
+        for frame in _batch_frames(batch.select(names), chunk_rows, offset, {pa.string(): pd.StringDtype()}.get):
+            offset += len(frame)
+            yield frame
+
+
+def _iter_columnar(fname: str, source: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if not PYARROW_AVAILABLE:
+        raise ValueError("Parquet and Arrow uploads require pyarrow to be installed.")
+    if fname.endswith(PARQUET_EXTENSIONS):
+        parquet = pq.ParquetFile(source)
+        names = _required_names(parquet.schema_arrow.names)
+        batches = parquet.iter_batches(batch_size=chunk_rows, columns=names)
+    else:
+        try:
+            reader = pa_ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            reader = pa_ipc.open_stream(source)
+            batches = iter(reader)
+        names = _required_names(reader.schema.names)
+    offset = 0
+    for batch in batches:
+        # Arrow-backed columns wrap the decoded buffers instead of copying
+        # them into numpy/object arrays.
+        for frame in _batch_frames(batch.select(names), chunk_rows, offset, pd.ArrowDtype):
+            offset += len(frame)
+            yield frame
+
+
+def _batch_frames(batch, chunk_rows: int, offset: int, types_mapper) -> Iterator[pd.DataFrame]:
+    for start in range(0, batch.num_rows, chunk_rows):
+        frame = batch.slice(start, chunk_rows).to_pandas(types_mapper=types_mapper)
+        frame.columns = REQUIRED_COLUMNS
+        frame.index = pd.RangeIndex(offset + start, offset + start + len(frame))
+        yield frame
+
+
+def _iter_excel(source: BinaryIO, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    df = pd.read_excel(source)
+    df = df[_required_names(df.columns)]
+    df.columns = REQUIRED_COLUMNS
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start : start + chunk_rows]
+
+
+class ChunkSpool:
+    """Scored chunks parked in a temporary file until an upload is accepted.
+
+    Small uploads stay in memory; past ``max_memory`` bytes the spool moves
+    to disk, so a large upload holds one chunk in memory at a time.
+    """
+
+    def __init__(self, max_memory: int = 8 * 1024 * 1024) -> None:
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+
+    def append(self, item) -> None:
+        pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __iter__(self) -> Iterator:
+        self._file.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._file)
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ChunkSpool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ColumnarWriter:
+    """Writes result chunks to one Parquet or Arrow IPC file as they are produced.
+
+    The summary travels in the schema metadata.
+    """
+
+    def __init__(self, fmt: str, summary: Dict) -> None:
+        if not PYARROW_AVAILABLE:
+            raise ValueError("Columnar output requires pyarrow to be installed.")
+        self.fmt = fmt
+        self._summary = json.dumps(summary).encode()
+        self._sink = pa.BufferOutputStream()
+        self._writer = None
+
+    def write(self, results: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(results, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"summary"] = self._summary
+        table = table.replace_schema_metadata(metadata)
+        if self._writer is None:
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self._sink, table.schema)
+            else:
+                self._writer = pa_ipc.new_file(self._sink, table.schema)
+        self._writer.write_table(table)
+
+    def finish(self) -> Tuple[bytes, str]:
+        self._writer.close()
+        return self._sink.getvalue().to_pybytes(), MEDIA_TYPES[self.fmt]
+
+
+def write_results(results: pd.DataFrame, summary: Dict, fmt: str) -> Tuple[bytes, str]:
+    """Serialize batch results to Parquet or Arrow IPC; the summary travels in the schema metadata."""
+    writer = ColumnarWriter(fmt, summary)
+    writer.write(results)
+    return writer.finish()
@@ -14,9 +14,34 @@ FAIRNESS_PATH = Path(os.getenv("FAIRNESS_PATH", ARTIFACT_DIR / "fairness_report.
 METRICS_PATH = Path(os.getenv("METRICS_PATH", ARTIFACT_DIR / "eval_metrics.json"))
 BACKGROUND_PATH = Path(os.getenv("BACKGROUND_PATH", ARTIFACT_DIR / "background_sample.csv"))
 GLOBAL_IMPORTANCE_PATH = Path(os.getenv("GLOBAL_IMPORTANCE_PATH", ARTIFACT_DIR / "global_importance.json"))
+STUDENT_MODEL_PATH = Path(os.getenv("STUDENT_MODEL_PATH", ARTIFACT_DIR / "student_model.joblib"))
+
+_DATA_CACHE_DIR = os.getenv("DATA_CACHE_DIR", str(BACKEND_ROOT / "data" / "cache"))
+DATA_CACHE_DIR = Path(_DATA_CACHE_DIR) if _DATA_CACHE_DIR else None
+# least recently used cache files are deleted once the directory grows past this
+DATA_CACHE_MAX_BYTES = int(os.getenv("DATA_CACHE_MAX_BYTES", str(2 * 1024**3)))
+# /admin/recalibrate only reads data files under this directory
+ADMIN_DATA_DIR = Path(os.getenv("ADMIN_DATA_DIR", BACKEND_ROOT / "data"))
+
+# "gbm" (GradientBoostingClassifier, one-hot) or "hist" (HistGradientBoostingClassifier, native categoricals)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "gbm")
+TRAIN_THREADS = int(os.getenv("TRAIN_THREADS")) if os.getenv("TRAIN_THREADS") else None
+# bootstrap resamples behind the 95% intervals in eval_metrics.json; 0 disables them
+BOOTSTRAP_REPLICATES = int(os.getenv("BOOTSTRAP_REPLICATES", "1000"))
+# incremental training: boosting rounds added per update, and how far validation
+# AUROC may fall below the previous model's before a full retrain runs instead
+INCREMENTAL_TREES = int(os.getenv("INCREMENTAL_TREES", "50"))
+INCREMENTAL_AUROC_TOLERANCE = float(os.getenv("INCREMENTAL_AUROC_TOLERANCE", "0.005"))
+# rows per permutation-importance repeat during evaluation; unset scores the whole test split
+IMPORTANCE_MAX_ROWS = int(os.getenv("IMPORTANCE_MAX_ROWS")) if os.getenv("IMPORTANCE_MAX_ROWS") else None
 
 LOW_RISK_THRESHOLD = float(os.getenv("LOW_RISK_THRESHOLD", "0.2"))
 HIGH_RISK_THRESHOLD = float(os.getenv("HIGH_RISK_THRESHOLD", "0.5"))
+# fast tier: rows whose student probability is within this distance of a risk
+# threshold are rescored by the full model
+ESCALATION_MARGIN = float(os.getenv("ESCALATION_MARGIN", "0.05"))
+# distilled student: "linear" (one-hot ridge on teacher logits) or "trees" (small hist GBM)
+DISTILL_STUDENT = os.getenv("DISTILL_STUDENT", "linear")
 
 CAUTION_MESSAGE = os.getenv(
     "CAUTION_MESSAGE",
@@ -39,6 +64,37 @@ AUTO_TRAIN_DATA = os.getenv(
 )
 
 API_KEY = os.getenv("API_KEY")
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
 
 RISK_SURFACE_MAX_STEPS = int(os.getenv("RISK_SURFACE_MAX_STEPS", "50"))
 RISK_SURFACE_CACHE_SIZE = int(os.getenv("RISK_SURFACE_CACHE_SIZE", "8"))
+
+BATCH_MAX_ROWS = int(os.getenv("BATCH_MAX_ROWS", "50000"))
+BATCH_CHUNK_ROWS = int(os.getenv("BATCH_CHUNK_ROWS", "5000"))
+
+DRIFT_MONITOR_ENABLED = os.getenv("DRIFT_MONITOR_ENABLED", "true").lower() == "true"
+DRIFT_WINDOW_SECONDS = float(os.getenv("DRIFT_WINDOW_SECONDS", "300"))
+# number of windows kept; with the defaults, 24 hours of traffic
+DRIFT_WINDOWS = int(os.getenv("DRIFT_WINDOWS", "288"))
+DRIFT_QUEUE_SIZE = int(os.getenv("DRIFT_QUEUE_SIZE", "10000"))
+
+# outcome feedback: rolling metrics are kept per window of prediction time
+FEEDBACK_WINDOW_SECONDS = int(os.getenv("FEEDBACK_WINDOW_SECONDS", "86400"))
+FEEDBACK_MAX_ROWS = int(os.getenv("FEEDBACK_MAX_ROWS", "10000"))
+PREDICTION_LOG_BATCH = int(os.getenv("PREDICTION_LOG_BATCH", "500"))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "1.0"))
+
+# audit trail of served predictions: "file" (rotated gzip segments) or "sqlite"
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+AUDIT_SINK = os.getenv("AUDIT_SINK", "file")
+AUDIT_DIR = Path(os.getenv("AUDIT_DIR", BACKEND_ROOT / "data" / "audit"))
+AUDIT_MAX_BYTES = int(os.getenv("AUDIT_MAX_BYTES", str(64 * 1024 * 1024)))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "100000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "1000"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0"))
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", BACKEND_ROOT / "data" / "profiles"))
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS")) if os.getenv("PROFILE_SLOW_MS") else None
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
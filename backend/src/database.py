@@ -4,21 +4,31 @@ import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "compass.db"
 
 _conn: Optional[sqlite3.Connection] = None
 
 
+def connect() -> sqlite3.Connection:
+    """A new connection to ``DB_PATH``.
+
+    Background writers each open their own, so their transactions never
+    share a connection with request handlers.
+    """
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
 def get_conn() -> sqlite3.Connection:
     global _conn
     if _conn is None:
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
-        _conn.row_factory = sqlite3.Row
-        _conn.execute("PRAGMA journal_mode=WAL")
-        _conn.execute("PRAGMA foreign_keys=ON")
+        _conn = connect()
     return _conn
 
 
@@ -44,6 +54,39 @@ def init_db() -> None:
         );
 
         CREATE INDEX IF NOT EXISTS idx_uploads_user ON uploads(user_id);
+
+        CREATE TABLE IF NOT EXISTS predictions (
+            id            TEXT    PRIMARY KEY,
+            created_at    REAL    NOT NULL,
+            model_version TEXT    NOT NULL,
+            probability   REAL    NOT NULL,
+            race          TEXT,
+            gender        TEXT,
+            age           TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS outcomes (
+            prediction_id TEXT    PRIMARY KEY REFERENCES predictions(id),
+            readmitted    INTEGER NOT NULL,
+            received_at   TEXT    NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            record_json   TEXT    NOT NULL
+        );
+
+        -- per (prediction window, group, score bin) sums, updated as outcomes arrive
+        CREATE TABLE IF NOT EXISTS feedback_histograms (
+            window_start  INTEGER NOT NULL,
+            grp           TEXT    NOT NULL,
+            bin           INTEGER NOT NULL,
+            pos           INTEGER NOT NULL,
+            neg           INTEGER NOT NULL,
+            sum_prob      REAL    NOT NULL,
+            sum_sq_error  REAL    NOT NULL,
+            PRIMARY KEY (window_start, grp, bin)
+        );
     """)
     conn.commit()
 
@@ -80,13 +123,15 @@ def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
 
 
 def save_upload(
-    user_id: int, filename: str, row_count: int, summary: dict, results: list
+    user_id: int, filename: str, row_count: int, summary: dict, results: list | str
 ) -> int:
+    """Store an upload; ``results`` may be passed already serialized to JSON."""
     conn = get_conn()
     now = datetime.now(timezone.utc).isoformat()
+    results_json = results if isinstance(results, str) else json.dumps(results)
     cur = conn.execute(
         "INSERT INTO uploads (user_id, filename, row_count, summary_json, results_json, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-        (user_id, filename, row_count, json.dumps(summary), json.dumps(results), now),
+        (user_id, filename, row_count, json.dumps(summary), results_json, now),
     )
     conn.commit()
     return cur.lastrowid  # type: ignore
@@ -118,3 +163,83 @@ def get_upload(upload_id: int, user_id: int) -> Optional[Dict[str, Any]]:
     d["summary"] = json.loads(d.pop("summary_json"))
     d["results"] = json.loads(d.pop("results_json"))
     return d
+
+
+# ── prediction feedback queries ──
+
+# stays under SQLite's bound-parameter limit in IN (...) lookups
+_LOOKUP_CHUNK = 500
+
+
+def log_predictions(rows: List[Tuple], conn: Optional[sqlite3.Connection] = None) -> None:
+    """Insert (id, created_at, model_version, probability, race, gender, age) rows in one transaction."""
+    if not rows:
+        return
+    conn = conn or get_conn()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO predictions (id, created_at, model_version, probability, race, gender, age) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def get_predictions(prediction_ids: List[str], conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Logged predictions for ``prediction_ids`` that have no outcome recorded yet."""
+    conn = conn or get_conn()
+    found: List[Dict[str, Any]] = []
+    for start in range(0, len(prediction_ids), _LOOKUP_CHUNK):
+        chunk = prediction_ids[start : start + _LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            "SELECT p.id, p.created_at, p.probability, p.race, p.gender, p.age FROM predictions p "
+            f"LEFT JOIN outcomes o ON o.prediction_id = p.id WHERE p.id IN ({placeholders}) AND o.prediction_id IS NULL",
+            chunk,
+        ).fetchall()
+        found.extend(dict(row) for row in rows)
+    return found
+
+
+def record_outcomes(
+    outcomes: List[Tuple[str, int]], histogram_rows: List[Tuple], conn: Optional[sqlite3.Connection] = None
+) -> None:
+    """Store outcomes and add their histogram contributions in a single transaction.
+
+    ``histogram_rows`` are (window_start, grp, bin, pos, neg, sum_prob, sum_sq_error).
+    """
+    conn = conn or get_conn()
+    now = datetime.now(timezone.utc).isoformat()
+    with conn:
+        conn.executemany(
+            "INSERT INTO outcomes (prediction_id, readmitted, received_at) VALUES (?, ?, ?)",
+            [(prediction_id, label, now) for prediction_id, label in outcomes],
+        )
+        conn.executemany(
+            "INSERT INTO feedback_histograms (window_start, grp, bin, pos, neg, sum_prob, sum_sq_error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (window_start, grp, bin) DO UPDATE SET "
+            "pos = pos + excluded.pos, neg = neg + excluded.neg, "
+            "sum_prob = sum_prob + excluded.sum_prob, sum_sq_error = sum_sq_error + excluded.sum_sq_error",
+            histogram_rows,
+        )
+
+
+def feedback_histograms(since: float) -> List[Dict[str, Any]]:
+    """Histogram sums per (group, bin) over windows starting at or after ``since``."""
+    conn = get_conn()
+    rows = conn.execute(
+        "SELECT grp, bin, SUM(pos) AS pos, SUM(neg) AS neg, SUM(sum_prob) AS sum_prob, "
+        "SUM(sum_sq_error) AS sum_sq_error FROM feedback_histograms WHERE window_start >= ? GROUP BY grp, bin",
+        (since,),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+# ── audit log ──
+
+
+def insert_audit_records(lines: List[str], conn: Optional[sqlite3.Connection] = None) -> None:
+    """Append serialized audit records in a single transaction."""
+    conn = conn or get_conn()
+    with conn:
+        conn.executemany("INSERT INTO audit_log (record_json) VALUES (?)", [(line,) for line in lines])
@@ -0,0 +1,262 @@
+"""Outcome feedback: join observed readmissions to logged predictions and track live performance.
+
+Every served prediction gets an id and is buffered in memory. A background
+thread writes the buffer to the ``predictions`` table in batched
+transactions, so request handlers never wait on SQLite. When outcomes arrive
+they are matched by id and folded into per-window, per-group score
+histograms in ``feedback_histograms``. A window is one
+``FEEDBACK_WINDOW_SECONDS`` span of prediction time. Each outcome is read
+once, and reports only sum the histogram rows of the requested windows, so
+their cost does not grow with the number of outcomes.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import database
+from .training.fairness import CURVE_THRESHOLDS, GroupConfusion, compute_group_fairness
+from .training.metrics import (
+    histogram_bin_ids,
+    histogram_calibration_curve,
+    histogram_metrics,
+    score_grid,
+)
+
+logger = logging.getLogger("discharge-compass")
+
+FEEDBACK_ATTRIBUTES = ("race", "gender", "age")
+OVERALL_GROUP = "all"
+# fixed grid: changing it would invalidate the stored bin indices
+FEEDBACK_EDGES = score_grid(100, exact_thresholds=CURVE_THRESHOLDS)
+# groups need this many outcomes of each class before they count towards gaps
+MIN_GROUP_CLASS_COUNT = 10
+
+
+def new_prediction_id() -> str:
+    return uuid.uuid4().hex
+
+
+def batch_prediction_ids(n: int) -> np.ndarray:
+    """Ids for a scored batch: one random prefix plus the position in the batch."""
+    return np.char.add(uuid.uuid4().hex + "-", np.arange(n).astype(str))
+
+
+class PredictionLog:
+    """Buffers served predictions; a background thread writes them in batched transactions.
+
+    The writer wakes every ``flush_seconds``, or sooner once ``batch_size``
+    rows are waiting, and uses its own SQLite connection. The buffer lives
+    in one process: a crash loses at most the rows since the last flush,
+    and with several server workers an outcome only matches once the worker
+    that served the prediction has flushed it.
+    """
+
+    def __init__(
+        self,
+        model_version: Callable[[], str],
+        batch_size: int = 500,
+        clock: Callable[[], float] = time.time,
+        flush_seconds: float = 1.0,
+    ) -> None:
+        self._model_version = model_version
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._clock = clock
+        self._rows: List[Tuple] = []
+        self._lock = threading.Lock()
+        # serializes writes on the log's own connection
+        self._write_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        prediction_ids: Sequence[str],
+        probabilities: Sequence[float],
+        groups: Dict[str, Sequence[str]],
+        scored_by: Sequence[str] | None = None,
+    ) -> None:
+        """Buffer served predictions.
+
+        ``scored_by`` marks rows a fast-mode batch scored with something other
+        than the full model; their ``model_version`` becomes e.g.
+        ``"<version>+student"``.
+        """
+        now = self._clock()
+        version = self._model_version()
+        if scored_by is None:
+            versions = [version] * len(prediction_ids)
+        else:
+            versions = [version if by == "model" else f"{version}+{by}" for by in scored_by]
+        rows = list(
+            zip(
+                [str(i) for i in prediction_ids],
+                [now] * len(prediction_ids),
+                versions,
+                [float(p) for p in probabilities],
+                *[[str(v) for v in groups[attribute]] for attribute in FEEDBACK_ATTRIBUTES],
+            )
+        )
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            self._rows.extend(rows)
+            wake = len(self._rows) >= self.batch_size
+        if wake:
+            self._wake.set()
+
+    def start(self) -> None:
+        with self._write_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and flush everything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10)
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Prediction log flush failed; buffered predictions lost")
+
+    def flush(self) -> None:
+        """Write every buffered row now, in the calling thread."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._rows = self._rows, []
+            if not pending:
+                return
+            if self._conn is None:
+                self._conn = database.connect()
+            database.log_predictions(pending, self._conn)
+
+
+def _histogram_rows(predictions: pd.DataFrame, window_seconds: float) -> List[Tuple]:
+    """(window_start, grp, bin, pos, neg, sum_prob, sum_sq_error) sums for joined outcomes."""
+    p = predictions["probability"].to_numpy(dtype=float)
+    y = predictions["readmitted"].to_numpy(dtype=float)
+    frame = pd.DataFrame(
+        {
+            "window_start": (predictions["created_at"].to_numpy() // window_seconds * window_seconds).astype(np.int64),
+            "bin": histogram_bin_ids(FEEDBACK_EDGES, p),
+            "pos": y,
+            "neg": 1.0 - y,
+            "sum_prob": p,
+            "sum_sq_error": (p - y) ** 2,
+        }
+    )
+    parts = [frame.assign(grp=OVERALL_GROUP)]
+    for attribute in FEEDBACK_ATTRIBUTES:
+        parts.append(frame.assign(grp=attribute + "=" + predictions[attribute].astype(str)))
+    sums = pd.concat(parts).groupby(["window_start", "grp", "bin"], sort=False).sum().reset_index()
+    return [
+        (int(w), g, int(b), int(pos), int(neg), float(sp), float(sq))
+        for w, g, b, pos, neg, sp, sq in sums[
+            ["window_start", "grp", "bin", "pos", "neg", "sum_prob", "sum_sq_error"]
+        ].itertuples(index=False)
+    ]
+
+
+def ingest_outcomes(outcomes: Dict[str, int], log: PredictionLog, window_seconds: float) -> Dict[str, int]:
+    """Record ``{prediction_id: readmitted}`` outcomes.
+
+    Ids that were never logged, or whose outcome is already recorded, count as unmatched.
+    Runs on a connection of its own and takes SQLite's write lock before the
+    "no outcome yet" lookup, so concurrent deliveries of an id, from other
+    threads or worker processes, wait instead of both matching it.
+    """
+    log.flush()
+    ids = list(outcomes)
+    conn = database.connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        found = database.get_predictions(ids, conn)
+        matched = pd.DataFrame(found, columns=["id", "created_at", "probability", "race", "gender", "age"])
+        matched["readmitted"] = matched["id"].map(outcomes).astype(int)
+        if len(matched):
+            database.record_outcomes(
+                list(zip(matched["id"], matched["readmitted"].tolist())),
+                _histogram_rows(matched, window_seconds),
+                conn,
+            )
+    finally:
+        # closing discards the transaction when nothing was recorded
+        conn.close()
+    return {"received": len(ids), "matched": len(matched), "unmatched": len(ids) - len(matched)}
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def performance_report(since: float, threshold: float) -> Dict:
+    """Rolling metrics over every window starting at or after ``since``."""
+    rows = database.feedback_histograms(since)
+    n_bins = len(FEEDBACK_EDGES)
+    sums: Dict[str, np.ndarray] = {}
+    for row in rows:
+        counts = sums.setdefault(row["grp"], np.zeros((4, n_bins)))
+        counts[:, row["bin"]] = (row["pos"], row["neg"], row["sum_prob"], row["sum_sq_error"])
+
+    overall = sums.get(OVERALL_GROUP, np.zeros((4, n_bins)))
+    n_outcomes = int(overall[0].sum() + overall[1].sum())
+    report: Dict = {"outcomes": n_outcomes, "metrics": None, "calibration_curve": [], "subgroups": {}}
+    if n_outcomes == 0:
+        return report
+    report["metrics"] = {k: _optional(v) for k, v in histogram_metrics(FEEDBACK_EDGES, *overall).items()}
+    report["calibration_curve"] = histogram_calibration_curve(FEEDBACK_EDGES, overall[0], overall[1], overall[2])
+
+    # thresholds off the grid are moved up to the next edge
+    threshold = float(FEEDBACK_EDGES[min(np.searchsorted(FEEDBACK_EDGES, threshold), n_bins - 1)])
+    for attribute in FEEDBACK_ATTRIBUTES:
+        prefix = attribute + "="
+        groups = sorted(g[len(prefix) :] for g in sums if g.startswith(prefix))
+        if not groups:
+            continue
+        stacked = np.stack([sums[prefix + g] for g in groups])
+        by_group = {}
+        for g, counts in zip(groups, stacked):
+            n_pos, n_neg = int(counts[0].sum()), int(counts[1].sum())
+            supported = n_pos >= MIN_GROUP_CLASS_COUNT and n_neg >= MIN_GROUP_CLASS_COUNT
+            by_group[g] = {
+                "count": n_pos + n_neg,
+                "positive_rate": n_pos / (n_pos + n_neg),
+                "metrics": {k: _optional(v) for k, v in histogram_metrics(FEEDBACK_EDGES, *counts).items()}
+                if supported
+                else None,
+            }
+        aurocs = [info["metrics"]["auroc"] for info in by_group.values() if info["metrics"] and info["metrics"]["auroc"] is not None]
+        confusion = GroupConfusion.from_histograms(groups, FEEDBACK_EDGES, stacked[:, 0], stacked[:, 1])
+        fairness = compute_group_fairness(None, None, None, threshold=threshold, confusion=confusion)
+        report["subgroups"][attribute] = {
+            "by_group": by_group,
+            "auroc_gap": max(aurocs) - min(aurocs) if len(aurocs) >= 2 else None,
+            "tpr_difference": fairness["tpr_difference"],
+            "fpr_difference": fairness["fpr_difference"],
+            "threshold_used": fairness["threshold_used"],
+            "reliable_groups": fairness["reliable_groups"],
+        }
+    return report
@@ -1,30 +1,68 @@
 from __future__ import annotations
 
+import json
 import logging
 import time
+import uuid
 from functools import lru_cache
+from typing import Literal
 
 from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 import numpy as np
 import pandas as pd
-import io
 
 from pathlib import Path
 
 from .config import (
+    ADMIN_API_KEY,
+    ADMIN_DATA_DIR,
     API_KEY,
+    AUDIT_BATCH_SIZE,
+    AUDIT_DIR,
+    AUDIT_ENABLED,
+    AUDIT_FLUSH_SECONDS,
+    AUDIT_MAX_BYTES,
+    AUDIT_QUEUE_SIZE,
+    AUDIT_SINK,
     AUTO_TRAIN,
     AUTO_TRAIN_DATA,
+    BATCH_CHUNK_ROWS,
+    BATCH_MAX_ROWS,
     CORS_ORIGINS,
+    DRIFT_MONITOR_ENABLED,
+    DRIFT_QUEUE_SIZE,
+    DRIFT_WINDOW_SECONDS,
+    DRIFT_WINDOWS,
+    FEEDBACK_MAX_ROWS,
+    FEEDBACK_WINDOW_SECONDS,
+    HIGH_RISK_THRESHOLD,
     MODEL_PATH,
+    PREDICTION_LOG_BATCH,
+    PREDICTION_LOG_FLUSH_SECONDS,
+    PROFILE_DIR,
+    PROFILE_ENABLED,
+    PROFILE_MAX_FILES,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_SLOW_MS,
     RATE_LIMIT_ENABLED,
     RATE_LIMIT_PER_MINUTE,
     RISK_SURFACE_CACHE_SIZE,
     RISK_SURFACE_MAX_STEPS,
 )
-from .auth import api_key_dependency
+from .audit import AuditLog, FileSink, SqliteSink, register_audit_gauge
+from .auth import admin_disabled_dependency, api_key_dependency
+from .batch_io import (
+    OUTPUT_FORMATS,
+    BatchParseError,
+    ChunkSpool,
+    ColumnarWriter,
+    MissingColumnsError,
+    is_supported,
+    iter_batch_chunks,
+)
 from .auth_jwt import (
     create_token,
     get_current_user,
@@ -33,17 +71,50 @@ from .auth_jwt import (
     verify_password,
 )
 from .database import create_user, get_upload, get_user_by_email, init_db, list_uploads, save_upload
+from .instrumentation import (
+    CACHE_REQUESTS,
+    MODEL_INFO,
+    REGISTRY,
+    REQUESTS_IN_FLIGHT,
+    begin_request,
+    record_request,
+    server_timing_header,
+    timed_stage,
+)
 from .modeling import (
+    clear_model_caches,
     get_fairness_report,
     get_metadata,
     get_metrics_report,
     load_model,
+    load_reference,
+    model_version,
+    batch_results_frame,
     predict,
-    risk_tier,
+    scored_by_labels,
+    summarize_probabilities,
+    tiered_predict_proba,
+)
+from .feedback import (
+    FEEDBACK_ATTRIBUTES,
+    PredictionLog,
+    batch_prediction_ids,
+    ingest_outcomes,
+    new_prediction_id,
+    performance_report,
 )
+from .monitoring import DriftMonitor, register_queue_gauge
+from .profiling import ProfilerSettings, RequestProfiler
 from .rate_limiter import RateLimiter, rate_limit_dependency
-from .schemas import FairnessReport, MetricsReport, ModelMetadata, PredictRequest, PredictResponse
-from .validation import NUMERIC_RANGES, validate_features
+from .schemas import (
+    FairnessReport,
+    FeedbackRequest,
+    MetricsReport,
+    ModelMetadata,
+    PredictRequest,
+    PredictResponse,
+)
+from .validation import NUMERIC_RANGES, validate_features, validate_frame
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("discharge-compass")
@@ -59,22 +130,89 @@ app.add_middleware(
 )
 
 route_dependencies = []
+admin_dependencies = []
 if RATE_LIMIT_ENABLED:
     limiter = RateLimiter(RATE_LIMIT_PER_MINUTE)
     route_dependencies.append(Depends(rate_limit_dependency(limiter)))
+    admin_dependencies.append(Depends(rate_limit_dependency(limiter)))
 if API_KEY:
     route_dependencies.append(Depends(api_key_dependency(API_KEY)))
+# admin routes can change what is served, so they stay closed until a key is set
+if ADMIN_API_KEY:
+    admin_dependencies.append(Depends(api_key_dependency(ADMIN_API_KEY)))
+else:
+    admin_dependencies.append(Depends(admin_disabled_dependency()))
+
+profiler = RequestProfiler(
+    PROFILE_DIR,
+    ProfilerSettings(
+        enabled=PROFILE_ENABLED,
+        sample_rate=PROFILE_SAMPLE_RATE,
+        slow_ms=PROFILE_SLOW_MS,
+        max_files=PROFILE_MAX_FILES,
+    ),
+)
+
+drift_monitor = DriftMonitor(
+    lambda: load_reference().get("drift_profile") if DRIFT_MONITOR_ENABLED else None,
+    window_seconds=DRIFT_WINDOW_SECONDS,
+    n_windows=DRIFT_WINDOWS,
+    max_queue=DRIFT_QUEUE_SIZE,
+    version=model_version,
+)
+register_queue_gauge(drift_monitor)
+prediction_log = PredictionLog(model_version, batch_size=PREDICTION_LOG_BATCH, flush_seconds=PREDICTION_LOG_FLUSH_SECONDS)
+audit_log = (
+    AuditLog(
+        SqliteSink() if AUDIT_SINK == "sqlite" else FileSink(AUDIT_DIR, max_bytes=AUDIT_MAX_BYTES),
+        model_version,
+        max_queue=AUDIT_QUEUE_SIZE,
+        batch_size=AUDIT_BATCH_SIZE,
+        flush_seconds=AUDIT_FLUSH_SECONDS,
+    )
+    if AUDIT_ENABLED
+    else None
+)
+if audit_log is not None:
+    register_audit_gauge(audit_log)
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start = time.time()
-    response = await call_next(request)
-    duration_ms = (time.time() - start) * 1000
-    logger.info("%s %s %s %.2fms", request.method, request.url.path, response.status_code, duration_ms)
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    start = time.perf_counter()
+    stages = begin_request()
+    profile = profiler.start()
+    REQUESTS_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        duration = time.perf_counter() - start
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        if profile is not None:
+            profiler.stop(profile)
+    if profile is not None:
+        served_version = next(iter(_model_info()), ("unknown",))[0]
+        # dumping and rotating profiles is file I/O; keep it off the event loop
+        await run_in_threadpool(profiler.save, profile, duration, route, served_version, request_id)
+    record_request(request.method, route, response.status_code, duration, stages)
+    response.headers["Server-Timing"] = server_timing_header(stages, duration)
+    response.headers["X-Request-ID"] = request_id
+    logger.info("%s %s %s %.2fms", request.method, request.url.path, response.status_code, duration * 1000)
     return response
 
 
+def _model_info() -> dict:
+    try:
+        return {(get_metadata().get("model_version") or "unknown",): 1.0}
+    except FileNotFoundError:
+        return {}
+
+
+MODEL_INFO.set_function(_model_info)
+
+
 @app.on_event("startup")
 async def ensure_artifacts():
     init_db()
@@ -83,18 +221,24 @@ async def ensure_artifacts():
             from .config import ARTIFACT_DIR, MODEL_PATH
             if MODEL_PATH.exists():
                 return
-            from .training.train import train
-            from .training.evaluate import evaluate
+            from .training.orchestrate import run_pipeline
 
             logger.info("Auto-training model using %s", AUTO_TRAIN_DATA)
-            train(AUTO_TRAIN_DATA, ARTIFACT_DIR)
-            evaluate(AUTO_TRAIN_DATA, ARTIFACT_DIR, None)
+            run_pipeline(AUTO_TRAIN_DATA, ARTIFACT_DIR)
         except Exception as exc:
             logger.warning("Auto-train failed: %s", exc)
     elif AUTO_TRAIN:
         logger.warning("AUTO_TRAIN set but data path not found: %s", AUTO_TRAIN_DATA)
 
 
+@app.on_event("shutdown")
+async def stop_background_workers():
+    drift_monitor.stop()
+    prediction_log.stop()
+    if audit_log is not None:
+        audit_log.stop()
+
+
 @app.get("/")
 async def health() -> dict:
     return {"status": "ok"}
@@ -122,7 +266,7 @@ async def health_check() -> dict:
 # ── Auth endpoints (no API key required) ──
 
 
-from pydantic import BaseModel as PydanticBase, EmailStr
+from pydantic import BaseModel as PydanticBase, EmailStr, Field
 
 
 class RegisterRequest(PydanticBase):
@@ -189,100 +333,191 @@ async def upload_detail(upload_id: int, request: Request):
 @app.post("/predict", response_model=PredictResponse, dependencies=route_dependencies)
 async def predict_endpoint(payload: PredictRequest):
     try:
-        validate_features(payload.model_dump())
-        return predict(payload.model_dump())
+        with timed_stage("validate"):
+            features = payload.model_dump()
+            validate_features(features)
+        result = predict(features)
+        result["prediction_id"] = new_prediction_id()
+        prediction_log.add(
+            [result["prediction_id"]],
+            [result["probability"]],
+            {attribute: [features[attribute]] for attribute in FEEDBACK_ATTRIBUTES},
+        )
+        drift_monitor.record(features, result["probability"])
+        if audit_log is not None:
+            audit_log.record_prediction(result["prediction_id"], features, result)
+        return result
     except FileNotFoundError as exc:
         raise HTTPException(status_code=503, detail=str(exc))
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
 
-BATCH_MAX_ROWS = 500
-REQUIRED_COLUMNS = [
-    "race", "gender", "age", "admission_type_id", "discharge_disposition_id",
-    "admission_source_id", "time_in_hospital", "num_lab_procedures",
-    "num_procedures", "num_medications", "number_outpatient",
-    "number_emergency", "number_inpatient", "A1Cresult", "metformin",
-    "insulin", "change", "diabetesMed",
-]
+BATCH_MAX_ERRORS = 1000
+
+
+def _encode_rows(rows: pd.DataFrame) -> pd.DataFrame:
+    with timed_stage("encode"):
+        rows = rows.copy()
+        for col in ["admission_type_id", "discharge_disposition_id", "admission_source_id",
+                     "time_in_hospital", "num_lab_procedures", "num_procedures",
+                     "num_medications", "number_outpatient", "number_emergency", "number_inpatient"]:
+            rows[col] = pd.to_numeric(rows[col]).astype(int)
+    return rows
+
+
+def _score_chunk(model, rows: pd.DataFrame, fast: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Probabilities for encoded rows and which of them the full model scored."""
+    with timed_stage("score"):
+        if fast:
+            return tiered_predict_proba(rows, model=model)
+        return model.predict_proba(rows)[:, 1], np.ones(len(rows), dtype=bool)
 
 
 @app.post("/predict-batch", dependencies=route_dependencies)
-async def predict_batch(request: Request, file: UploadFile = File(...)):
-    fname = (file.filename or "").lower()
-    if not (fname.endswith(".csv") or fname.endswith(".xlsx") or fname.endswith(".xls")):
-        raise HTTPException(status_code=422, detail="Please upload a .csv or .xlsx file.")
+async def predict_batch(
+    request: Request,
+    file: UploadFile = File(...),
+    valid_only: bool = False,
+    output: str = "json",
+    fast: bool = False,
+):
+    if not is_supported(file.filename or ""):
+        raise HTTPException(status_code=422, detail="Please upload a .csv, .xlsx, .parquet or .arrow file.")
+    if output not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"output must be one of: {', '.join(OUTPUT_FORMATS)}")
 
-    contents = await file.read()
+    model = load_model()
+    # scored chunks wait in the spool until the whole upload is accepted, so
+    # only one chunk is decoded at a time and a rejected upload logs nothing
+    with ChunkSpool() as spool:
+        n_rows, n_invalid, n_escalated, errors, prob_chunks = _score_upload(
+            file, model, spool, valid_only, fast
+        )
 
-    try:
-        if fname.endswith(".csv"):
-            df = pd.read_csv(io.BytesIO(contents))
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-    except Exception as exc:
-        raise HTTPException(status_code=422, detail=f"Could not parse file: {exc}")
+        if n_rows == 0:
+            raise HTTPException(status_code=422, detail="File contains no data rows.")
+        if n_invalid and not valid_only:
+            return JSONResponse(
+                status_code=422,
+                content={
+                    "detail": f"{n_invalid} of {n_rows} rows failed validation.",
+                    "errors": errors,
+                },
+            )
+        if not prob_chunks:
+            raise HTTPException(status_code=422, detail="File contains no valid data rows.")
+
+        with timed_stage("serialize"):
+            # one float per scored row, kept for the quantiles and histogram
+            probs = np.concatenate(prob_chunks)
+            summary = summarize_probabilities(probs)
+            summary["invalid"] = n_invalid
+            if fast:
+                summary["escalated"] = n_escalated
+        prediction_ids = batch_prediction_ids(len(probs))
+        writer = ColumnarWriter(output, summary) if output != "json" else None
+        fragments = []
+        start = 0
+        for row_numbers, valid, chunk_probs, escalated in spool:
+            ids = prediction_ids[start : start + len(chunk_probs)]
+            start += len(chunk_probs)
+            # fast mode mixes student and full-model scores; the logs keep them apart
+            scored_by = scored_by_labels(escalated) if fast else None
+            prediction_log.add(
+                ids, chunk_probs, {attribute: valid[attribute].to_numpy() for attribute in FEEDBACK_ATTRIBUTES}, scored_by
+            )
+            drift_monitor.record(valid, chunk_probs)
+            if audit_log is not None:
+                audit_log.record_batch(valid, chunk_probs, ids, scored_by)
+            with timed_stage("serialize"):
+                results = batch_results_frame(row_numbers, chunk_probs, ids)
+                # serialize each results chunk once and reuse it for storage and the response
+                fragments.append(results.to_json(orient="records")[1:-1])
+                if writer is not None:
+                    writer.write(results)
+        results_json = f"[{','.join(fragments)}]"
+
+    with timed_stage("db_write"):
+        upload_id = _persist_upload(request, file.filename, summary, results_json)
+
+    if writer is not None:
+        with timed_stage("serialize"):
+            body, media_type = writer.finish()
+        headers = {"X-Upload-Id": str(upload_id)} if upload_id is not None else None
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    with timed_stage("serialize"):
+        body = (
+            f'{{"results": {results_json}, "summary": {json.dumps(summary)}, '
+            f'"upload_id": {json.dumps(upload_id)}, "errors": {json.dumps(errors)}}}'
+        )
+    return Response(content=body, media_type="application/json")
 
-    df.columns = [c.strip() for c in df.columns]
 
-    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
-    if missing:
+def _score_upload(file: UploadFile, model, spool: ChunkSpool, valid_only: bool, fast: bool):
+    """Parse, validate and score an upload chunk by chunk into ``spool``.
+
+    Reads straight from the spooled upload file. In strict mode scoring
+    stops at the first invalid row, and later chunks are only validated.
+    """
+    n_rows = 0
+    n_invalid = 0
+    n_escalated = 0
+    errors: list = []
+    prob_chunks = []
+    chunks = iter_batch_chunks(file.filename or "", file.file, BATCH_CHUNK_ROWS)
+    try:
+        while True:
+            with timed_stage("parse"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            n_rows += len(chunk)
+            if n_rows > BATCH_MAX_ROWS:
+                raise HTTPException(status_code=422, detail=f"Maximum {BATCH_MAX_ROWS} rows per upload.")
+
+            with timed_stage("validate"):
+                rows = chunk.copy()
+                for col in ["race", "gender", "age", "A1Cresult", "metformin", "insulin", "change", "diabetesMed"]:
+                    rows[col] = rows[col].astype("string").str.strip()
+
+                row_numbers = chunk.index.to_numpy() + 1
+                validation = validate_frame(
+                    rows, max_errors=BATCH_MAX_ERRORS - len(errors), row_numbers=row_numbers
+                )
+            n_invalid += validation.n_invalid
+            errors.extend(validation.errors)
+            if n_invalid and not valid_only:
+                continue
+            if validation.valid_mask.any():
+                valid_rows = _encode_rows(rows[validation.valid_mask])
+                probs, escalated = _score_chunk(model, valid_rows, fast)
+                prob_chunks.append(probs)
+                n_escalated += int(escalated.sum())
+                spool.append((row_numbers[validation.valid_mask], valid_rows, probs, escalated))
+    except MissingColumnsError as exc:
         raise HTTPException(
             status_code=422,
-            detail=f"Missing columns: {', '.join(missing)}. Download the template for the correct format.",
+            detail=f"{exc}. Download the template for the correct format.",
         )
+    except BatchParseError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return n_rows, n_invalid, n_escalated, errors, prob_chunks
 
-    if len(df) > BATCH_MAX_ROWS:
-        raise HTTPException(status_code=422, detail=f"Maximum {BATCH_MAX_ROWS} rows per upload.")
-
-    if len(df) == 0:
-        raise HTTPException(status_code=422, detail="File contains no data rows.")
-
-    model = load_model()
-    rows = df[REQUIRED_COLUMNS].copy()
-
-    for col in ["admission_type_id", "discharge_disposition_id", "admission_source_id",
-                 "time_in_hospital", "num_lab_procedures", "num_procedures",
-                 "num_medications", "number_outpatient", "number_emergency", "number_inpatient"]:
-        rows[col] = pd.to_numeric(rows[col], errors="coerce").fillna(0).astype(int)
-
-    for col in ["race", "gender", "age", "A1Cresult", "metformin", "insulin", "change", "diabetesMed"]:
-        rows[col] = rows[col].astype(str).str.strip()
-
-    probs = model.predict_proba(rows)[:, 1]
-
-    results = []
-    for i, prob in enumerate(probs):
-        p = float(prob)
-        tier = risk_tier(p)
-        results.append({
-            "row": i + 1,
-            "probability": round(p, 4),
-            "risk_tier": tier,
-            "risk_pct": f"{p * 100:.1f}%",
-        })
-
-    summary = {
-        "total": len(results),
-        "high": sum(1 for r in results if r["risk_tier"] == "high"),
-        "medium": sum(1 for r in results if r["risk_tier"] == "medium"),
-        "low": sum(1 for r in results if r["risk_tier"] == "low"),
-        "avg_risk": round(float(np.mean(probs)) * 100, 1),
-    }
 
+def _persist_upload(request: Request, filename: str | None, summary: dict, results_json: str) -> int | None:
     # persist if user is logged in
     user = get_optional_user(request)
-    upload_id = None
-    if user is not None:
-        upload_id = save_upload(
-            user_id=int(user["sub"]),
-            filename=file.filename or "upload",
-            row_count=len(results),
-            summary=summary,
-            results=results,
-        )
-
-    return JSONResponse({"results": results, "summary": summary, "upload_id": upload_id})
+    if user is None:
+        return None
+    return save_upload(
+        user_id=int(user["sub"]),
+        filename=filename or "upload",
+        row_count=summary["total"],
+        summary=summary,
+        results=results_json,
+    )
 
 
 @app.get("/model-metadata", response_model=ModelMetadata, dependencies=route_dependencies)
@@ -309,6 +544,39 @@ async def metrics_report():
         raise HTTPException(status_code=503, detail=str(exc))
 
 
+@app.post("/feedback", dependencies=route_dependencies)
+async def feedback(body: FeedbackRequest):
+    if len(body.outcomes) > FEEDBACK_MAX_ROWS:
+        raise HTTPException(status_code=422, detail=f"Maximum {FEEDBACK_MAX_ROWS} outcomes per request.")
+    outcomes = {item.prediction_id: int(item.readmitted) for item in body.outcomes}
+    with timed_stage("db_write"):
+        return await run_in_threadpool(ingest_outcomes, outcomes, prediction_log, FEEDBACK_WINDOW_SECONDS)
+
+
+@app.get("/feedback/performance", dependencies=route_dependencies)
+def feedback_performance(days: float = 30.0):
+    # a plain def runs in the threadpool, keeping the SQLite aggregate off the event loop
+    if days <= 0:
+        raise HTTPException(status_code=422, detail="days must be positive")
+    # whole windows: include the one the span starts in
+    since = (time.time() - days * 86400) // FEEDBACK_WINDOW_SECONDS * FEEDBACK_WINDOW_SECONDS
+    report = performance_report(since, HIGH_RISK_THRESHOLD)
+    report["window"] = {"days": days, "window_seconds": FEEDBACK_WINDOW_SECONDS}
+    return report
+
+
+@app.get("/monitoring/drift", dependencies=route_dependencies)
+def drift_report(window_minutes: float = 60.0):
+    # a plain def runs in the threadpool; report() sketches whatever is still queued
+    max_minutes = DRIFT_WINDOW_SECONDS * DRIFT_WINDOWS / 60
+    if window_minutes <= 0 or window_minutes > max_minutes:
+        raise HTTPException(status_code=422, detail=f"window_minutes must be between 0 and {max_minutes:g}")
+    try:
+        return drift_monitor.report(window_minutes * 60)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
 BASE_SURFACE_PAYLOAD = {
     "race": "Caucasian",
     "gender": "Female",
@@ -386,6 +654,76 @@ async def risk_surface(
         raise HTTPException(status_code=422, detail=f"steps must be between 2 and {RISK_SURFACE_MAX_STEPS}")
 
     model_mtime = MODEL_PATH.stat().st_mtime if MODEL_PATH.exists() else 0.0
-    result = _compute_surface(feature_x, feature_y, steps, model_mtime)
+    hits_before = _compute_surface.cache_info().hits
+    with timed_stage("score"):
+        result = dict(_compute_surface(feature_x, feature_y, steps, model_mtime))
+    hit = _compute_surface.cache_info().hits > hits_before
+    CACHE_REQUESTS.inc("risk_surface", "hit" if hit else "miss")
     result.pop("model_mtime", None)
     return result
+
+
+@app.get("/metrics-runtime", response_class=PlainTextResponse, dependencies=route_dependencies)
+async def metrics_runtime():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+# ── Admin endpoints ──
+
+
+class RecalibrateRequest(PydanticBase):
+    data_path: str
+    method: Literal["sigmoid", "isotonic"] = "sigmoid"
+
+
+@app.post("/admin/recalibrate", dependencies=admin_dependencies)
+def recalibrate_model(body: RecalibrateRequest):
+    # a plain def runs in the threadpool, so scoring the data does not block the event loop
+    data_dir = ADMIN_DATA_DIR.resolve()
+    data_path = (data_dir / body.data_path).resolve()
+    # checked before existence, so callers cannot probe paths outside the data directory
+    if not data_path.is_relative_to(data_dir):
+        raise HTTPException(status_code=422, detail="data_path must be inside ADMIN_DATA_DIR")
+    if not data_path.is_file():
+        raise HTTPException(status_code=422, detail=f"Data file not found: {body.data_path}")
+    from .training.recalibrate import recalibrate
+
+    try:
+        metadata = recalibrate(data_path.as_posix(), MODEL_PATH.parent, body.method)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    clear_model_caches()
+    return {"model_version": metadata["model_version"], **metadata["recalibration"]}
+
+
+class ProfilerUpdate(PydanticBase):
+    enabled: bool | None = None
+    sample_rate: float | None = Field(default=None, ge=0.0, le=1.0)
+    slow_ms: float | None = Field(default=None, ge=0.0)
+    max_files: int | None = Field(default=None, ge=1)
+
+
+@app.get("/admin/profiler", dependencies=admin_dependencies)
+async def profiler_settings():
+    return profiler.settings_dict()
+
+
+@app.put("/admin/profiler", dependencies=admin_dependencies)
+async def update_profiler(body: ProfilerUpdate):
+    profiler.configure(**body.model_dump(exclude_unset=True))
+    return profiler.settings_dict()
+
+
+@app.get("/admin/profiles", dependencies=admin_dependencies)
+def profiles_list():
+    return profiler.list_profiles()
+
+
+@app.get("/admin/profiles/{name}", dependencies=admin_dependencies)
+async def profile_download(name: str):
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
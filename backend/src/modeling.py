@@ -3,15 +3,17 @@ from __future__ import annotations
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import joblib
+import numpy as np
 import pandas as pd
 
 from .config import (
     ARTIFACT_DIR,
     BASE_MODEL_PATH,
     CAUTION_MESSAGE,
+    ESCALATION_MARGIN,
     FAIRNESS_PATH,
     HIGH_RISK_THRESHOLD,
     LOW_RISK_THRESHOLD,
@@ -19,8 +21,12 @@ from .config import (
     METRICS_PATH,
     MODEL_PATH,
     REFERENCE_PATH,
+    STUDENT_MODEL_PATH,
 )
 from .explain import ablation_contributions, shap_local_contributions
+from .instrumentation import REGISTRY, timed_stage
+
+TIERED_ROWS = REGISTRY.counter("dc_tiered_rows_total", "Rows scored in fast mode, by the model that produced the score", ("tier",))
 
 
 @lru_cache(maxsize=1)
@@ -37,6 +43,13 @@ def load_base_model():
     return None
 
 
+@lru_cache(maxsize=1)
+def load_student():
+    if STUDENT_MODEL_PATH.exists():
+        return joblib.load(STUDENT_MODEL_PATH)
+    return None
+
+
 @lru_cache(maxsize=1)
 def load_reference() -> Dict[str, object]:
     if REFERENCE_PATH.exists():
@@ -45,6 +58,37 @@ def load_reference() -> Dict[str, object]:
     return {}
 
 
+@lru_cache(maxsize=1)
+def model_version() -> str:
+    """Version of the served model, read once from its metadata."""
+    try:
+        return get_metadata().get("model_version") or "unknown"
+    except FileNotFoundError:
+        return "unknown"
+
+
+def clear_model_caches() -> None:
+    """Forget the loaded artifacts so the next request reads the ones on disk."""
+    load_model.cache_clear()
+    load_base_model.cache_clear()
+    load_student.cache_clear()
+    load_reference.cache_clear()
+    model_version.cache_clear()
+
+
+def served_student():
+    """The student, if it was distilled from the model being served.
+
+    A student keeps the ``model_version`` of its teacher. After the model is
+    replaced (recalibration, an incremental update) it would score against
+    the old calibration, so it is ignored until it is distilled again.
+    """
+    student = load_student()
+    if student is None or getattr(student, "teacher_version_", None) != model_version():
+        return None
+    return student
+
+
 def load_json(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"Artifact not found at {path}")
@@ -60,20 +104,111 @@ def risk_tier(probability: float) -> str:
     return "high"
 
 
+RISK_TIERS = np.array(["low", "medium", "high"])
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+SUMMARY_HISTOGRAM_BINS = 10
+
+
+def risk_tier_codes(probabilities: np.ndarray) -> np.ndarray:
+    """Vectorized ``risk_tier`` returning 0/1/2 for low/medium/high."""
+    return np.digitize(probabilities, [LOW_RISK_THRESHOLD, HIGH_RISK_THRESHOLD])
+
+
+def risk_tier_array(probabilities: np.ndarray) -> np.ndarray:
+    return RISK_TIERS[risk_tier_codes(probabilities)]
+
+
+def escalation_mask(probabilities: np.ndarray, margin: float = ESCALATION_MARGIN) -> np.ndarray:
+    """Rows whose probability lies within ``margin`` of a risk-tier threshold."""
+    probabilities = np.asarray(probabilities, dtype=float)
+    return (np.abs(probabilities - LOW_RISK_THRESHOLD) < margin) | (np.abs(probabilities - HIGH_RISK_THRESHOLD) < margin)
+
+
+def tiered_predict_proba(X: pd.DataFrame, margin: float = ESCALATION_MARGIN, model=None, student=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Score with the distilled student, rescoring rows near a tier threshold with the full model.
+
+    Returns ``(probabilities, escalated)``. Rows the student puts at least
+    ``margin`` away from both thresholds keep the student's probability.
+    Without a student distilled from the served model every row is escalated.
+    """
+    model = model if model is not None else load_model()
+    student = student if student is not None else served_student()
+    if student is None:
+        escalated = np.ones(len(X), dtype=bool)
+        probabilities = model.predict_proba(X)[:, 1]
+    else:
+        probabilities = student.predict_proba(X)[:, 1]
+        escalated = escalation_mask(probabilities, margin)
+        if escalated.any():
+            probabilities[escalated] = model.predict_proba(X[escalated])[:, 1]
+    n_escalated = int(escalated.sum())
+    TIERED_ROWS.inc("escalated", amount=n_escalated)
+    TIERED_ROWS.inc("student", amount=len(X) - n_escalated)
+    return probabilities, escalated
+
+
+SCORED_BY = np.array(["student", "model"])
+
+
+def scored_by_labels(escalated: np.ndarray) -> np.ndarray:
+    """Per-row ``"model"``/``"student"`` labels for the mask returned by ``tiered_predict_proba``."""
+    return SCORED_BY[np.asarray(escalated, dtype=int)]
+
+
+def summarize_probabilities(probabilities: np.ndarray) -> Dict:
+    probabilities = np.asarray(probabilities, dtype=float)
+    low, medium, high = np.bincount(risk_tier_codes(probabilities), minlength=3)
+    counts, edges = np.histogram(probabilities, bins=SUMMARY_HISTOGRAM_BINS, range=(0.0, 1.0))
+    quantiles = np.quantile(probabilities, SUMMARY_QUANTILES)
+    return {
+        "total": int(len(probabilities)),
+        "high": int(high),
+        "medium": int(medium),
+        "low": int(low),
+        "avg_risk": round(float(np.mean(probabilities)) * 100, 1),
+        "quantiles": {
+            f"p{int(q * 100)}": round(float(value) * 100, 1) for q, value in zip(SUMMARY_QUANTILES, quantiles)
+        },
+        "histogram": {
+            "bin_edges": [round(float(edge), 4) for edge in edges],
+            "counts": counts.tolist(),
+        },
+    }
+
+
+def batch_results_frame(
+    row_numbers: np.ndarray, probabilities: np.ndarray, prediction_ids: np.ndarray | None = None
+) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "row": row_numbers.astype(int),
+            "probability": np.round(probabilities, 4),
+            "risk_tier": risk_tier_array(probabilities),
+            "risk_pct": np.char.mod("%.1f%%", probabilities * 100),
+        }
+    )
+    if prediction_ids is not None:
+        frame["prediction_id"] = prediction_ids
+    return frame
+
+
 def predict(payload: Dict) -> Dict:
     model = load_model()
     base_model = load_base_model()
     reference = load_reference()
 
-    X = pd.DataFrame([payload])
-    probability = float(model.predict_proba(X)[0, 1])
+    with timed_stage("encode"):
+        X = pd.DataFrame([payload])
+    with timed_stage("score"):
+        probability = float(model.predict_proba(X)[0, 1])
 
-    contributions = None
-    if base_model is not None:
-        contributions = shap_local_contributions(base_model, X)
+    with timed_stage("explain"):
+        contributions = None
+        if base_model is not None:
+            contributions = shap_local_contributions(base_model, X)
 
-    if contributions is None:
-        _, contributions = ablation_contributions(model, X, reference)
+        if contributions is None:
+            _, contributions = ablation_contributions(model, X, reference)
 
     sorted_features = sorted(contributions.items(), key=lambda item: abs(item[1]), reverse=True)[:5]
     top_features: List[Dict] = []
@@ -0,0 +1,294 @@
+"""Online input and score drift monitoring for live traffic.
+
+Request handlers only append ``(rows, scores, timestamp)`` to a bounded deque
+(a lock-free append, well under a microsecond). A background thread polls it
+and adds the rows to fixed-size count sketches:
+category counts for categorical features, and counts over fixed bins for
+numeric features and scores. The bins come from the reference profile that
+training writes into ``feature_reference.json``. Sketches are kept per time
+window in a ring of ``n_windows`` windows, so memory does not grow with
+traffic. Reports sum the windows inside the requested span and compare them
+with the reference using PSI and (for ordered features) the KS distance
+between the binned distributions.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import QUEUE_DEPTH, REGISTRY
+
+NUMERIC_MAX_DISTINCT = 20
+NUMERIC_QUANTILES = np.linspace(0.05, 0.95, 19)
+SCORE_BINS = 20
+# proportions are floored at this before taking logs in PSI
+PSI_EPSILON = 1e-4
+# conventional PSI bands: below 0.1 stable, 0.1-0.25 moderate shift, above 0.25 significant
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+DRIFT_ROWS = REGISTRY.counter("dc_drift_rows_total", "Rows added to drift sketches")
+DRIFT_DROPPED = REGISTRY.counter("dc_drift_dropped_total", "Scored batches dropped because the drift queue was full")
+
+
+def _numeric_edges(values: np.ndarray) -> List[float]:
+    distinct = np.unique(values)
+    if len(distinct) <= NUMERIC_MAX_DISTINCT:
+        return distinct.tolist()
+    return np.unique(np.quantile(values, NUMERIC_QUANTILES)).tolist()
+
+
+def _bin_codes(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # bin 0 is below the first edge; bin i holds edges[i - 1] <= x < edges[i]
+    return np.searchsorted(edges, values, side="right")
+
+
+def build_drift_profile(X: pd.DataFrame, scores: np.ndarray, categorical: List[str], numeric: List[str]) -> Dict:
+    """Reference sketches for ``X`` and its model scores, stored in ``feature_reference.json``."""
+    profile: Dict = {"n_rows": int(len(X)), "categorical": {}, "numeric": {}}
+    for col in categorical:
+        counts = X[col].astype(str).value_counts(sort=False)
+        profile["categorical"][col] = {
+            "categories": [str(c) for c in counts.index],
+            "counts": [int(c) for c in counts.to_numpy()] + [0],
+        }
+    for col in numeric:
+        values = pd.to_numeric(X[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+        edges = _numeric_edges(values)
+        counts = np.bincount(_bin_codes(values, np.asarray(edges)), minlength=len(edges) + 1)
+        profile["numeric"][col] = {"edges": edges, "counts": counts.tolist()}
+    score_edges = np.linspace(0.0, 1.0, SCORE_BINS + 1)[1:-1]
+    score_counts = np.bincount(_bin_codes(np.asarray(scores, dtype=float), score_edges), minlength=SCORE_BINS)
+    profile["score"] = {"edges": score_edges.tolist(), "counts": score_counts.tolist()}
+    return profile
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> float:
+    e = np.maximum(expected / max(expected.sum(), 1), PSI_EPSILON)
+    a = np.maximum(actual / max(actual.sum(), 1), PSI_EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Largest gap between the two binned CDFs (the KS statistic evaluated at bin edges)."""
+    e = np.cumsum(expected) / max(expected.sum(), 1)
+    a = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(a - e)))
+
+
+def drift_status(psi: float) -> str:
+    if psi >= PSI_SIGNIFICANT:
+        return "significant"
+    if psi >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
+
+
+class _Layout:
+    """Offsets of every feature's bins inside one flat count vector."""
+
+    def __init__(self, profile: Dict) -> None:
+        self.features: List[Tuple[str, str, object, int]] = []
+        offset = 0
+        for col, spec in profile["categorical"].items():
+            # the extra last bin counts categories never seen in training
+            self.features.append((col, "categorical", pd.Index(spec["categories"]), offset))
+            offset += len(spec["counts"])
+        for col, spec in profile["numeric"].items():
+            self.features.append((col, "numeric", np.asarray(spec["edges"], dtype=float), offset))
+            offset += len(spec["counts"])
+        self.score_edges = np.asarray(profile["score"]["edges"], dtype=float)
+        self.score_offset = offset
+        self.size = offset + len(profile["score"]["counts"])
+
+    def counts(self, X: pd.DataFrame, scores: np.ndarray) -> np.ndarray:
+        codes = []
+        for col, kind, spec, offset in self.features:
+            if kind == "categorical":
+                index = spec.get_indexer(X[col].astype(str))
+                codes.append(np.where(index < 0, len(spec), index) + offset)
+            else:
+                values = pd.to_numeric(X[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+                codes.append(_bin_codes(values, spec) + offset)
+        codes.append(_bin_codes(np.asarray(scores, dtype=float), self.score_edges) + self.score_offset)
+        return np.bincount(np.concatenate(codes), minlength=self.size)
+
+
+class DriftMonitor:
+    def __init__(
+        self,
+        profile_loader: Callable[[], Optional[Dict]],
+        window_seconds: float = 300.0,
+        n_windows: int = 288,
+        max_queue: int = 10_000,
+        clock: Callable[[], float] = time.time,
+        poll_seconds: float = 0.25,
+        version: Optional[Callable[[], str]] = None,
+    ) -> None:
+        self._profile_loader = profile_loader
+        # the reference belongs to one model; a new version reloads it
+        self._version = version
+        self._profile_version: Optional[str] = None
+        self._profile: Optional[Dict] = None
+        self._layout: Optional[_Layout] = None
+        self.window_seconds = window_seconds
+        self.n_windows = n_windows
+        self._clock = clock
+        self.max_queue = max_queue
+        self.poll_seconds = poll_seconds
+        self._queue: deque = deque()
+        # window index (timestamp // window_seconds) -> flat counts
+        self._windows: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def profile(self) -> Optional[Dict]:
+        version = self._version() if self._version is not None else None
+        if self._profile is None or version != self._profile_version:
+            profile = self._profile_loader()
+            with self._lock:
+                if self._profile is not None:
+                    # sketches binned against the old reference cannot be compared with the new one
+                    self._windows.clear()
+                self._profile = profile or None
+                self._layout = _Layout(profile) if profile else None
+                self._profile_version = version
+        return self._profile
+
+    # -- request path --
+
+    def record(self, rows, scores) -> None:
+        """Queue scored rows (a feature dict or a DataFrame) for the background sketcher."""
+        if self.profile() is None:
+            return
+        if self._thread is None:
+            self.start()
+        if len(self._queue) >= self.max_queue:
+            DRIFT_DROPPED.inc()
+            return
+        self._queue.append((rows, scores, self._clock()))
+
+    # -- background --
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self._thread = None
+        self.drain()
+
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _run(self) -> None:
+        # polling keeps the request path free of any wake-up signalling
+        while not self._stop.wait(self.poll_seconds):
+            self.drain()
+
+    def _take_pending(self) -> list:
+        items = []
+        # popleft is atomic, so a report draining alongside the thread never sees an item twice
+        while True:
+            try:
+                items.append(self._queue.popleft())
+            except IndexError:
+                return items
+
+    def drain(self) -> None:
+        """Sketch everything queued so far in the calling thread."""
+        items = self._take_pending()
+        if items:
+            self._process(items)
+
+    def _process(self, items: list) -> None:
+        if self._layout is None:
+            return
+        # single-row records are grouped per window into one frame
+        singles: Dict[int, Tuple[list, list]] = {}
+        frames = []
+        for rows, scores, timestamp in items:
+            window = int(timestamp // self.window_seconds)
+            if isinstance(rows, dict):
+                bucket = singles.setdefault(window, ([], []))
+                bucket[0].append(rows)
+                bucket[1].append(scores)
+            else:
+                frames.append((window, rows, np.asarray(scores, dtype=float)))
+        for window, (records, scores) in singles.items():
+            frames.append((window, pd.DataFrame(records), np.asarray(scores, dtype=float)))
+
+        for window, frame, scores in frames:
+            counts = self._layout.counts(frame, scores)
+            with self._lock:
+                current = self._windows.get(window)
+                if current is None:
+                    self._windows[window] = counts
+                    for old in sorted(self._windows)[: -self.n_windows]:
+                        del self._windows[old]
+                else:
+                    current += counts
+            DRIFT_ROWS.inc(amount=len(frame))
+
+    # -- reporting --
+
+    def report(self, span_seconds: float) -> Dict:
+        profile = self.profile()
+        if profile is None:
+            raise FileNotFoundError("Drift profile not found in the feature reference; retrain to create it")
+        self.drain()
+        now = self._clock()
+        first = int((now - span_seconds) // self.window_seconds) + 1
+        with self._lock:
+            selected = [counts for window, counts in self._windows.items() if window >= first]
+        live = np.sum(selected, axis=0) if selected else np.zeros(self._layout.size)
+        n_rows = int(live[self._layout.score_offset :].sum())
+
+        features = {}
+        for col, kind, _, offset in self._layout.features:
+            spec = profile[kind][col]
+            expected = np.asarray(spec["counts"], dtype=float)
+            features[col] = self._compare(expected, live[offset : offset + len(expected)], n_rows, ordered=kind == "numeric")
+        expected_scores = np.asarray(profile["score"]["counts"], dtype=float)
+        score = self._compare(expected_scores, live[self._layout.score_offset :], n_rows, ordered=True)
+
+        drifted = sorted(col for col, stats in features.items() if stats["status"] == "significant")
+        return {
+            "window": {
+                "span_seconds": span_seconds,
+                "start": first * self.window_seconds,
+                "end": now,
+                "rows": n_rows,
+            },
+            "reference_rows": profile["n_rows"],
+            "features": features,
+            "score": score,
+            "drifted_features": drifted,
+            "max_psi": max((stats["psi"] for stats in features.values() if stats["psi"] is not None), default=None),
+            "dropped_batches": int(DRIFT_DROPPED.value()),
+        }
+
+    @staticmethod
+    def _compare(expected: np.ndarray, actual: np.ndarray, n_rows: int, ordered: bool) -> Dict:
+        if n_rows == 0:
+            return {"psi": None, "ks": None, "status": "no_data"}
+        psi = population_stability_index(expected, actual)
+        return {"psi": psi, "ks": binned_ks(expected, actual) if ordered else None, "status": drift_status(psi)}
+
+
+def register_queue_gauge(monitor: DriftMonitor) -> None:
+    QUEUE_DEPTH.set_function(lambda: {("drift",): float(monitor.queue_depth())})
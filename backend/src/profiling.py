@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import random
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+
+PROFILE_SUFFIX = ".pstats"
+_SAFE_CHARS = re.compile(r"[^A-Za-z0-9.-]+")
+
+
+@dataclass
+class ProfilerSettings:
+    enabled: bool = False
+    # fraction of requests that are profiled at all
+    sample_rate: float = 1.0
+    # when set, only profiles of requests at least this slow are kept
+    slow_ms: Optional[float] = None
+    max_files: int = 50
+
+
+def _slug(value: str) -> str:
+    return _SAFE_CHARS.sub("_", value).strip("_") or "root"
+
+
+class RequestProfiler:
+    """Opt-in cProfile hook for individual requests.
+
+    cProfile hooks the event-loop thread, so only one request is profiled at
+    a time; requests arriving while a profile is running are not sampled.
+    Output is a pstats file plus a JSON sidecar describing the request, and
+    the directory is rotated to keep the newest ``max_files`` profiles.
+    """
+
+    def __init__(self, directory: Path, settings: ProfilerSettings) -> None:
+        self.directory = directory
+        self.settings = settings
+        self._active = Lock()
+
+    def configure(self, **changes) -> ProfilerSettings:
+        for key, value in changes.items():
+            if not hasattr(self.settings, key):
+                raise ValueError(f"Unknown profiler setting: {key}")
+            setattr(self.settings, key, value)
+        return self.settings
+
+    def start(self) -> Optional[cProfile.Profile]:
+        settings = self.settings
+        if not settings.enabled or random.random() >= settings.sample_rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler (e.g. a debugger) already owns the hook
+            self._active.release()
+            return None
+        return profile
+
+    def stop(self, profile: cProfile.Profile) -> None:
+        """Disable ``profile``; must run on the thread that started it."""
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+
+    def save(
+        self,
+        profile: cProfile.Profile,
+        duration: float,
+        route: str,
+        model_version: str,
+        request_id: str,
+    ) -> Optional[Path]:
+        """Write a stopped profile and rotate the directory.
+
+        This does file I/O, so the server calls it from a worker thread
+        rather than the event loop.
+        """
+        duration_ms = duration * 1000
+        slow_ms = self.settings.slow_ms
+        if slow_ms is not None and duration_ms < slow_ms:
+            return None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{int(time.time() * 1000)}_{_slug(route)}_{_slug(model_version)}_{_slug(request_id)}"
+        path = self.directory / f"{stem}{PROFILE_SUFFIX}"
+        profile.dump_stats(str(path))
+        meta = {
+            "name": path.name,
+            "route": route,
+            "model_version": model_version,
+            "request_id": request_id,
+            "duration_ms": round(duration_ms, 3),
+            "created_at": time.time(),
+        }
+        path.with_suffix(".json").write_text(json.dumps(meta))
+        self._rotate()
+        return path
+
+    def _profile_files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.name)
+
+    def _rotate(self) -> None:
+        files = self._profile_files()
+        for path in files[: max(len(files) - self.settings.max_files, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+
+    def list_profiles(self) -> List[Dict]:
+        profiles = []
+        for path in reversed(self._profile_files()):
+            sidecar = path.with_suffix(".json")
+            meta = json.loads(sidecar.read_text()) if sidecar.exists() else {"name": path.name}
+            meta["size_bytes"] = path.stat().st_size
+            profiles.append(meta)
+        return profiles
+
+    def profile_path(self, name: str) -> Optional[Path]:
+        if Path(name).name != name or not name.endswith(PROFILE_SUFFIX):
+            return None
+        path = self.directory / name
+        return path if path.exists() else None
+
+    def settings_dict(self) -> Dict:
+        return asdict(self.settings)
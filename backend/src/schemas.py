@@ -71,6 +71,17 @@ class PredictResponse(BaseModel):
     risk_tier: Literal["low", "medium", "high"]
     top_features: List[FeatureContribution]
     caution: str
+    # quote this id in POST /feedback once the outcome is known
+    prediction_id: str | None = None
+
+
+class FeedbackItem(BaseModel):
+    prediction_id: str = Field(..., min_length=1, max_length=64)
+    readmitted: bool
+
+
+class FeedbackRequest(BaseModel):
+    outcomes: List[FeedbackItem] = Field(..., min_length=1)
 
 class ModelMetadata(BaseModel):
     model_version: str
@@ -80,6 +91,8 @@ class ModelMetadata(BaseModel):
 class FairnessReport(BaseModel):
     generated_at: str
     metrics: dict
+    # per attribute: group TPR/FPR and gaps over a threshold grid (absent in older reports)
+    curves: dict | None = None
 
 class MetricsReport(BaseModel):
     generated_at: str
@@ -0,0 +1,145 @@
+"""Bootstrap confidence intervals for the headline classification metrics.
+
+Rows are sorted by score once. Each chunk of replicates draws a
+``(replicates, n)`` matrix of resample indices and turns it into per-row
+draw counts. The metrics then become weighted sums over the sorted rows:
+- AUROC and AUPRC aggregate the counts over runs of tied scores with
+  ``np.add.reduceat`` and take cumulative sums along the score order
+- Brier and ECE are matrix products with per-row terms
+Each replicate is therefore a row of array operations instead of a sklearn
+call, and chunks run in parallel worker processes.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+from joblib import Parallel, delayed
+
+METRICS = ("auroc", "auprc", "brier", "ece")
+DEFAULT_REPLICATES = 1000
+CHUNK_REPLICATES = 50
+ECE_BINS = 10
+
+
+class _SortedSample:
+    """Score-sorted view of one evaluation sample shared by all replicates."""
+
+    def __init__(self, y_true, y_prob, n_bins: int = ECE_BINS) -> None:
+        y = np.asarray(y_true, dtype=float)
+        p = np.asarray(y_prob, dtype=float)
+        self.order = np.argsort(-p, kind="stable")
+        self.p = p[self.order]
+        self.y = y[self.order]
+        self.n = len(p)
+        # runs of tied scores, in descending score order
+        self.run_starts = np.flatnonzero(np.r_[True, self.p[1:] != self.p[:-1]]) if self.n else np.array([], int)
+        self.squared_error = (self.p - self.y) ** 2
+        bin_ids = np.digitize(self.p, np.linspace(0.0, 1.0, n_bins + 1)) - 1
+        valid = (bin_ids >= 0) & (bin_ids < n_bins)
+        # per-row contribution to each bin's (sum_p - sum_y); p == 1.0 sits in no bin
+        self.bin_residual = np.zeros((self.n, n_bins))
+        self.bin_residual[np.flatnonzero(valid), bin_ids[valid]] = (self.p - self.y)[valid]
+
+
+def _metrics_from_counts(sample: _SortedSample, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Metrics for each row of ``counts`` (draw counts per sorted row)."""
+    # counts and their cumulative sums are integers below 2**24, exact in float32
+    weights = counts.astype(np.float32)
+    pos = weights * sample.y.astype(np.float32)
+    neg = weights - pos
+    if len(sample.run_starts) < sample.n:
+        pos = np.add.reduceat(pos, sample.run_starts, axis=1)
+        neg = np.add.reduceat(neg, sample.run_starts, axis=1)
+    cum_pos = np.cumsum(pos, axis=1)
+    cum_neg = np.cumsum(neg, axis=1)
+    total_pos = cum_pos[:, -1].astype(float)
+    total_neg = cum_neg[:, -1].astype(float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # AUROC: a positive beats every negative in later (lower-score) runs and half of its own run
+        beaten = total_neg[:, None] - cum_neg + 0.5 * neg
+        auroc = np.einsum("ij,ij->i", pos, beaten, dtype=float) / (total_pos * total_neg)
+
+        # AUPRC as sklearn's average precision: recall steps weighted by precision at each distinct threshold
+        predicted = cum_pos + cum_neg
+        precision = np.divide(cum_pos, predicted, out=np.zeros_like(cum_pos), where=predicted > 0)
+        auprc = np.einsum("ij,ij->i", pos, precision, dtype=float) / total_pos
+
+    weights = weights.astype(float)
+    n = weights.sum(axis=1)
+    brier = weights @ sample.squared_error / n
+    ece = np.abs(weights @ sample.bin_residual).sum(axis=1) / n
+    return {
+        "auroc": np.where((total_pos == 0) | (total_neg == 0), np.nan, auroc),
+        "auprc": np.where(total_pos == 0, np.nan, auprc),
+        "brier": brier,
+        "ece": ece,
+    }
+
+
+def _replicate_chunk(sample: _SortedSample, n_replicates: int, seed: int) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, sample.n, size=(n_replicates, sample.n))
+    offsets = (np.arange(n_replicates) * sample.n)[:, None]
+    counts = np.bincount((indices + offsets).ravel(), minlength=n_replicates * sample.n)
+    return _metrics_from_counts(sample, counts.reshape(n_replicates, sample.n))
+
+
+def bootstrap_replicates(
+    y_true,
+    y_prob,
+    n_replicates: int = DEFAULT_REPLICATES,
+    seed: int = 42,
+    n_jobs: int = -1,
+    chunk_replicates: int = CHUNK_REPLICATES,
+) -> Dict[str, np.ndarray]:
+    """Metric values for ``n_replicates`` resamples of the rows (NaN where undefined)."""
+    sample = _SortedSample(y_true, y_prob)
+    sizes = [min(chunk_replicates, n_replicates - start) for start in range(0, n_replicates, chunk_replicates)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_replicate_chunk)(sample, size, int(child.generate_state(1)[0])) for size, child in zip(sizes, seeds)
+    )
+    return {metric: np.concatenate([chunk[metric] for chunk in chunks]) for metric in METRICS}
+
+
+def confidence_intervals(
+    y_true,
+    y_prob,
+    n_replicates: int = DEFAULT_REPLICATES,
+    level: float = 0.95,
+    seed: int = 42,
+    n_jobs: int = -1,
+) -> Dict[str, Dict[str, float | None]]:
+    """Percentile bootstrap interval for each metric in ``METRICS``."""
+    if len(np.asarray(y_prob)) == 0:
+        return {metric: {"low": None, "high": None} for metric in METRICS}
+    replicates = bootstrap_replicates(y_true, y_prob, n_replicates, seed, n_jobs)
+    tail = (1 - level) / 2 * 100
+    intervals: Dict[str, Dict[str, float | None]] = {}
+    for metric, values in replicates.items():
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            intervals[metric] = {"low": None, "high": None}
+            continue
+        low, high = np.percentile(values, [tail, 100 - tail])
+        intervals[metric] = {"low": float(low), "high": float(high)}
+    return intervals
+
+
+def group_confidence_intervals(
+    y_true,
+    y_prob,
+    groups,
+    groups_to_report: List,
+    **kwargs,
+) -> Dict[str, Dict[str, Dict[str, float | None]]]:
+    """Intervals per group, each bootstrapped within that group's rows."""
+    y_true = np.asarray(y_true)
+    y_prob = np.asarray(y_prob)
+    groups = np.asarray(groups)
+    return {
+        str(group): confidence_intervals(y_true[groups == group], y_prob[groups == group], **kwargs)
+        for group in groups_to_report
+    }
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
-from typing import List, Tuple
+from pathlib import Path
+from typing import Iterator, List
 
+import numpy as np
 import pandas as pd
 
+
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    PYARROW_AVAILABLE = False
+
 FEATURE_COLUMNS: List[str] = [
     "race",
     "gender",
@@ -69,26 +80,170 @@ READMISSION_MAPPING = {
 }
 
 
-def load_data(path: str) -> Dataset:
-    df = pd.read_csv(path)
+CACHE_VERSION = "1"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Select the model columns and apply the training-time cleaning rules.
+
+    Categoricals become pandas ``category`` (missing -> "Unknown"), numerics
+    are coerced (unparseable -> 0) and downcast to the narrowest integer
+    type when they hold whole numbers.
+    """
     missing = [col for col in FEATURE_COLUMNS + [TARGET_COLUMN] if col not in df.columns]
     if missing:
         raise ValueError(f"Missing columns in dataset: {missing}")
 
     df = df[FEATURE_COLUMNS + [TARGET_COLUMN]].copy()
-    df[TARGET_COLUMN] = df[TARGET_COLUMN].astype(str).map(READMISSION_MAPPING).fillna(0).astype(int)
+    df[TARGET_COLUMN] = (
+        df[TARGET_COLUMN].astype(str).map(READMISSION_MAPPING).fillna(0).astype(np.int8)
+    )
 
     for col in CATEGORICAL_COLUMNS:
-        df[col] = df[col].fillna("Unknown").astype(str)
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.dtype == object:
+            # already parsed as category: fill in place instead of round-tripping through object
+            if values.isna().any():
+                if "Unknown" not in values.cat.categories:
+                    values = values.cat.add_categories("Unknown")
+                values = values.fillna("Unknown")
+            df[col] = values
+        else:
+            df[col] = values.fillna("Unknown").astype(str).astype("category")
 
     for col in NUMERIC_COLUMNS:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+        values = pd.to_numeric(df[col], errors="coerce").fillna(0)
+        if np.array_equal(values, np.floor(values)):
+            values = pd.to_numeric(values.astype(np.int64), downcast="integer")
+        df[col] = values
+    return df
+
+
+def _check_csv_columns(path: str) -> None:
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [col for col in FEATURE_COLUMNS + [TARGET_COLUMN] if col not in header]
+    if missing:
+        raise ValueError(f"Missing columns in dataset: {missing}")
+
+
+def _csv_dtypes() -> dict:
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS}
+    dtypes[TARGET_COLUMN] = str
+    return dtypes
+
+
+def _is_parquet(path) -> bool:
+    return str(path).endswith((".parquet", ".pq"))
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    if _is_parquet(path):
+        return pd.read_parquet(path)
+    _check_csv_columns(path)
+    return pd.read_csv(path, usecols=FEATURE_COLUMNS + [TARGET_COLUMN], dtype=_csv_dtypes())
+
+
+def load_data(path: str, use_cache: bool = True, cache_dir: Path | None = None) -> Dataset:
+    """Load and clean a dataset, caching the cleaned columns as Parquet.
+
+    The cache is keyed by the SHA-256 of the source file, so edits to the CSV
+    invalidate it; later loads are memory-mapped Parquet reads instead of a
+    CSV parse. Caching is skipped when pyarrow is unavailable or
+    ``DATA_CACHE_DIR`` is set to an empty string. The directory is kept under
+    ``DATA_CACHE_MAX_BYTES`` by ``prune_cache``.
+    """
+    if cache_dir is None:
+        # read at call time: importing this module must not load the config,
+        # so the benchmarks can point it at their own artifacts first
+        from ..config import DATA_CACHE_DIR as cache_dir
+    cache_path = None
+    if use_cache and cache_dir is not None and PYARROW_AVAILABLE:
+        cache_path = Path(cache_dir) / f"{Path(path).stem}-{file_digest(path)[:16]}-v{CACHE_VERSION}.parquet"
+        if cache_path.exists():
+            df = pd.read_parquet(cache_path, memory_map=True)
+            touch_cached(cache_path)
+            return Dataset(X=df[FEATURE_COLUMNS], y=df[TARGET_COLUMN])
+
+    df = clean_frame(_read_source(path))
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        df.to_parquet(tmp_path, index=False)
+        tmp_path.replace(cache_path)
+        prune_cache(cache_path.parent, keep=cache_path)
 
     X = df[FEATURE_COLUMNS]
     y = df[TARGET_COLUMN]
     return Dataset(X=X, y=y)
 
 
+CACHE_SUFFIXES = (".parquet", ".npz")
+
+
+def touch_cached(path: Path) -> None:
+    """Mark a cache file as used, so pruning keeps it over older ones."""
+    try:
+        path.touch()
+    except OSError:
+        pass
+
+
+def prune_cache(cache_dir: Path, max_bytes: int | None = None, keep: Path | None = None) -> None:
+    """Delete the least recently used cache files until ``cache_dir`` fits in ``max_bytes``.
+
+    ``keep`` (the file just written) is never deleted. To clear the cache by
+    hand, delete the directory; it is recreated on the next load.
+    """
+    if max_bytes is None:
+        from ..config import DATA_CACHE_MAX_BYTES as max_bytes
+    entries = []
+    for path in Path(cache_dir).iterdir():
+        if path.suffix not in CACHE_SUFFIXES or path == keep:
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries) + (keep.stat().st_size if keep is not None else 0)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def iter_data_chunks(path: str, chunk_rows: int = 100_000) -> Iterator[Dataset]:
+    """Yield the cleaned dataset ``chunk_rows`` rows at a time without loading the whole file.
+
+    Each chunk goes through ``clean_frame`` on its own, so category sets can
+    differ between chunks.
+    """
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    if _is_parquet(path):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required to stream Parquet files")
+        import pyarrow.parquet as pq
+
+        frames = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns))
+    else:
+        _check_csv_columns(path)
+        frames = pd.read_csv(path, usecols=columns, dtype=_csv_dtypes(), chunksize=chunk_rows)
+    for frame in frames:
+        df = clean_frame(frame)
+        yield Dataset(X=df[FEATURE_COLUMNS], y=df[TARGET_COLUMN])
+
+
 def compute_reference_values(X: pd.DataFrame) -> dict:
     reference = {}
     for col in CATEGORICAL_COLUMNS:
@@ -0,0 +1,193 @@
+"""Distil the calibrated primary model into a compact fast-tier student.
+
+The student is a regressor fitted to the teacher's logits on the training
+split. The default ``linear`` student is a ridge model on the usual
+standardized/one-hot features; ``trees`` is a small HistGradientBoosting
+regressor. Either way it is exposed as a classifier, so
+``modeling.tiered_predict_proba`` can score with it first and escalate to
+the full model only the rows it places within ``ESCALATION_MARGIN`` of a
+risk-tier threshold.
+
+``distillation_report.json`` is computed on the test split. It holds the
+escalated fraction, the risk-tier agreement with the teacher (tiered and
+student-only), metrics and batch scoring time for each tier, and a sweep
+of margins to help choose ``ESCALATION_MARGIN``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+from scipy.special import expit, logit
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+
+from ..config import ARTIFACT_DIR, DISTILL_STUDENT, ESCALATION_MARGIN
+from ..modeling import escalation_mask, risk_tier_codes, tiered_predict_proba
+from .data import CATEGORICAL_COLUMNS, load_data
+from .metrics import classification_metrics
+from .pipeline import make_ordinal_preprocessor, make_preprocessor
+from .split import split_dataset
+
+STUDENT_KINDS = ("linear", "trees")
+MARGIN_SWEEP = (0.0, 0.01, 0.02, 0.05, 0.1)
+# teacher probabilities are clipped before taking logits
+PROBABILITY_EPSILON = 1e-6
+
+
+def build_student_regressor(kind: str = DISTILL_STUDENT) -> Pipeline:
+    if kind == "linear":
+        return Pipeline(steps=[("preprocess", make_preprocessor()), ("model", Ridge(alpha=1.0))])
+    if kind == "trees":
+        return Pipeline(
+            steps=[
+                ("preprocess", make_ordinal_preprocessor()),
+                (
+                    "model",
+                    HistGradientBoostingRegressor(
+                        learning_rate=0.2,
+                        max_iter=40,
+                        max_leaf_nodes=15,
+                        categorical_features=list(range(len(CATEGORICAL_COLUMNS))),
+                        random_state=42,
+                    ),
+                ),
+            ]
+        )
+    raise ValueError(f"Unknown student {kind!r}; choose from {', '.join(STUDENT_KINDS)}")
+
+
+class DistilledStudent(BaseEstimator, ClassifierMixin):
+    """Regressor on teacher logits that scores like a binary classifier."""
+
+    def __init__(self, kind: str = DISTILL_STUDENT) -> None:
+        self.kind = kind
+
+    def fit(self, X, teacher_probs, teacher_version: str | None = None):
+        """Fit to ``teacher_probs``; the server only uses the student while ``teacher_version`` is served."""
+        targets = logit(np.clip(np.asarray(teacher_probs, dtype=float), PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON))
+        self.regressor_ = build_student_regressor(self.kind).fit(X, targets)
+        self.classes_ = np.array([0, 1])
+        self.teacher_version_ = teacher_version
+        return self
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = expit(self.regressor_.predict(X))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def _timed(fn) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def distillation_report(student, teacher, X, y, margin: float = ESCALATION_MARGIN) -> Dict:
+    """Escalation rate, tier agreement, quality and scoring time of the fast tier on ``(X, y)``."""
+    y = np.asarray(y)
+    teacher_probs, teacher_seconds = _timed(lambda: teacher.predict_proba(X)[:, 1])
+    student_probs, student_seconds = _timed(lambda: student.predict_proba(X)[:, 1])
+    (tiered_probs, escalated), tiered_seconds = _timed(
+        lambda: tiered_predict_proba(X, margin, model=teacher, student=student)
+    )
+    teacher_tiers = risk_tier_codes(teacher_probs)
+
+    sweep = []
+    for m in sorted(set(MARGIN_SWEEP) | {margin}):
+        mask = escalation_mask(student_probs, m)
+        probs = np.where(mask, teacher_probs, student_probs)
+        sweep.append(
+            {
+                "margin": m,
+                "escalated_fraction": float(mask.mean()),
+                "tier_agreement": float((risk_tier_codes(probs) == teacher_tiers).mean()),
+            }
+        )
+
+    kept = ~escalated
+    return {
+        "rows": int(len(y)),
+        "margin": margin,
+        "escalated_fraction": float(escalated.mean()),
+        "tier_agreement": float((risk_tier_codes(tiered_probs) == teacher_tiers).mean()),
+        "student_tier_agreement": float((risk_tier_codes(student_probs) == teacher_tiers).mean()),
+        "max_abs_error_kept": float(np.abs(tiered_probs[kept] - teacher_probs[kept]).max()) if kept.any() else 0.0,
+        "mean_abs_error_student": float(np.abs(student_probs - teacher_probs).mean()),
+        "metrics": {
+            "teacher": classification_metrics(y, teacher_probs),
+            "student": classification_metrics(y, student_probs),
+            "tiered": classification_metrics(y, tiered_probs),
+        },
+        "scoring_seconds": {"teacher": teacher_seconds, "student": student_seconds, "tiered": tiered_seconds},
+        "margin_sweep": sweep,
+    }
+
+
+def distill_from_splits(
+    splits,
+    teacher,
+    artifact_dir: Path,
+    kind: str = DISTILL_STUDENT,
+    margin: float = ESCALATION_MARGIN,
+    train_probs: np.ndarray | None = None,
+) -> Tuple[DistilledStudent, Dict]:
+    """Fit the student on the training split and write it with its report.
+
+    ``train_probs`` are the teacher's training-split probabilities, when the
+    caller already has them. The teacher is the model in ``artifact_dir``;
+    its ``model_version`` is stored with the student.
+    """
+    X_train, _, X_test, _, _, y_test = splits
+    if train_probs is None:
+        train_probs = teacher.predict_proba(X_train)[:, 1]
+    metadata_path = artifact_dir / "model_metadata.json"
+    teacher_version = json.loads(metadata_path.read_text()).get("model_version") if metadata_path.exists() else None
+    student, fit_seconds = _timed(lambda: DistilledStudent(kind).fit(X_train, train_probs, teacher_version))
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "student": kind,
+        "teacher_version": teacher_version,
+        "fit_seconds": fit_seconds,
+        **distillation_report(student, teacher, X_test, y_test, margin),
+    }
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(student, artifact_dir / "student_model.joblib")
+    with (artifact_dir / "distillation_report.json").open("w") as handle:
+        json.dump(report, handle, indent=2)
+    return student, report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Distil the trained model into a fast-tier student")
+    parser.add_argument("--data", required=True, help="Path to the training CSV (split as in training)")
+    parser.add_argument("--artifacts", default=str(ARTIFACT_DIR), help="Directory holding model.joblib")
+    parser.add_argument("--student", choices=STUDENT_KINDS, default=DISTILL_STUDENT)
+    parser.add_argument("--margin", type=float, default=ESCALATION_MARGIN, help="Escalation margin used in the report")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    artifact_dir = Path(args.artifacts)
+    teacher = joblib.load(artifact_dir / "model.joblib")
+    splits = split_dataset(load_data(args.data))
+    _, report = distill_from_splits(splits, teacher, artifact_dir, args.student, args.margin)
+    print(
+        f"escalated {report['escalated_fraction']:.1%} of rows, tier agreement {report['tier_agreement']:.2%} "
+        f"(student alone {report['student_tier_agreement']:.2%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
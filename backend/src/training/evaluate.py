@@ -8,14 +8,26 @@ from pathlib import Path
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.inspection import permutation_importance
 
-from ..config import ARTIFACT_DIR
+from ..config import ARTIFACT_DIR, BOOTSTRAP_REPLICATES, IMPORTANCE_MAX_ROWS
+from .bootstrap import confidence_intervals, group_confidence_intervals
 from .data import FEATURE_COLUMNS, load_data
-from .fairness import compute_group_fairness
+from .fairness import GroupConfusion, compute_group_fairness, fairness_curve
+from .importance import global_permutation_importance
 from .metrics import calibration_curve_data, classification_metrics, operating_point_metrics
 from .pipeline import build_baseline_model, fit_primary_with_calibration
 from .split import split_dataset
+from .subgroups import subgroup_report
+
+
+IMPORTANCE_REPEATS = 5
+
+INTERSECTIONAL_SLICES = [
+    ("race", "gender"),
+    ("race", "age"),
+    ("gender", "age"),
+    ("race", "gender", "age"),
+]
 
 
 def compute_group_metrics(y_true: np.ndarray, y_prob: np.ndarray, groups: np.ndarray) -> dict:
@@ -60,10 +72,33 @@ def evaluate(data_path: str, artifact_dir: Path, frontend_public: Path | None =
     else:
         _, primary_model = fit_primary_with_calibration(X_train, y_train, X_val, y_val)
 
-    baseline_model = build_baseline_model()
-    baseline_model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
-
-    primary_probs = primary_model.predict_proba(X_test)[:, 1]
+    evaluate_models((X_train, X_val, X_test, y_train, y_val, y_test), primary_model, artifact_dir, frontend_public)
+
+
+def evaluate_models(
+    splits,
+    primary_model,
+    artifact_dir: Path,
+    frontend_public: Path | None = None,
+    baseline_model=None,
+    primary_probs: np.ndarray | None = None,
+    encoded_test: np.ndarray | None = None,
+    importance_max_rows: int | None = IMPORTANCE_MAX_ROWS,
+) -> None:
+    """Write evaluation, fairness and importance artifacts for an in-memory model.
+
+    ``baseline_model`` is fitted here when not supplied; ``primary_probs`` and
+    ``encoded_test`` are the primary model's test-set probabilities and
+    preprocessed test matrix when the caller already has them.
+    """
+    X_train, X_val, X_test, y_train, y_val, y_test = splits
+
+    if baseline_model is None:
+        baseline_model = build_baseline_model()
+        baseline_model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
+
+    if primary_probs is None:
+        primary_probs = primary_model.predict_proba(X_test)[:, 1]
     baseline_probs = baseline_model.predict_proba(X_test)[:, 1]
 
     top_15_threshold = float(np.quantile(primary_probs, 0.85))
@@ -88,25 +123,58 @@ def evaluate(data_path: str, artifact_dir: Path, frontend_public: Path | None =
         "age": compute_group_metrics(y_test.to_numpy(), primary_probs, age_merged.to_numpy()),
     }
 
-    fairness = {
-        "race": compute_group_fairness(y_test, primary_probs, X_test["race"]),
-        "gender": compute_group_fairness(y_test, primary_probs, X_test["gender"]),
-        "age": compute_group_fairness(y_test, primary_probs, age_merged),
+    intervals = None
+    if BOOTSTRAP_REPLICATES > 0:
+        y_arr = y_test.to_numpy()
+        group_values = {"race": X_test["race"].to_numpy(), "gender": X_test["gender"].to_numpy(), "age": age_merged.to_numpy()}
+        intervals = {
+            "level": 0.95,
+            "n_replicates": BOOTSTRAP_REPLICATES,
+            "primary": confidence_intervals(y_arr, primary_probs, BOOTSTRAP_REPLICATES),
+            "baseline": confidence_intervals(y_arr, baseline_probs, BOOTSTRAP_REPLICATES),
+            # only groups large enough to get point metrics
+            "subgroups": {
+                attribute: group_confidence_intervals(
+                    y_arr,
+                    primary_probs,
+                    group_values[attribute],
+                    [g for g, info in by_group.items() if info["metrics"] is not None],
+                    n_replicates=BOOTSTRAP_REPLICATES,
+                )
+                for attribute, by_group in subgroup_performance.items()
+            },
+        }
+
+    sensitive = pd.DataFrame({"race": X_test["race"], "gender": X_test["gender"], "age": age_merged})
+    intersectional = {
+        " x ".join(attributes): subgroup_report(
+            sensitive,
+            attributes,
+            y_test,
+            primary_probs,
+            {"threshold_0_5": 0.5, "top_15_percent": top_15_threshold},
+        )
+        for attributes in INTERSECTIONAL_SLICES
     }
 
-    perm_result = permutation_importance(
+    fairness = {}
+    fairness_curves = {}
+    for attribute, values in {"race": X_test["race"], "gender": X_test["gender"], "age": age_merged}.items():
+        confusion = GroupConfusion.build(y_test, primary_probs, values)
+        fairness[attribute] = compute_group_fairness(y_test, primary_probs, values, confusion=confusion)
+        fairness_curves[attribute] = fairness_curve(y_test, primary_probs, values, confusion=confusion)
+
+    importance = global_permutation_importance(
         primary_model,
-        X_test,
+        X_test[FEATURE_COLUMNS],
         y_test,
-        n_repeats=5,
+        X_encoded=encoded_test,
+        n_repeats=IMPORTANCE_REPEATS,
+        max_rows=importance_max_rows,
         random_state=42,
         n_jobs=-1,
-        scoring="roc_auc",
     )
-    global_importance = {
-        feature: float(perm_result.importances_mean[idx])
-        for idx, feature in enumerate(FEATURE_COLUMNS)
-    }
+    global_importance = {feature: importance[feature]["mean"] for feature in FEATURE_COLUMNS}
 
     artifact_dir.mkdir(parents=True, exist_ok=True)
 
@@ -116,6 +184,7 @@ def evaluate(data_path: str, artifact_dir: Path, frontend_public: Path | None =
         "operating_points": operating_points,
         "calibration_curve": calibration_curve,
         "subgroup_performance": subgroup_performance,
+        "confidence_intervals": intervals,
     }
     with (artifact_dir / "eval_metrics.json").open("w") as handle:
         json.dump(metrics_payload, handle, indent=2)
@@ -123,6 +192,7 @@ def evaluate(data_path: str, artifact_dir: Path, frontend_public: Path | None =
     fairness_payload = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "metrics": fairness,
+        "curves": fairness_curves,
     }
     with (artifact_dir / "fairness_report.json").open("w") as handle:
         json.dump(fairness_payload, handle, indent=2)
@@ -130,6 +200,24 @@ def evaluate(data_path: str, artifact_dir: Path, frontend_public: Path | None =
     with (artifact_dir / "global_importance.json").open("w") as handle:
         json.dump(global_importance, handle, indent=2)
 
+    intersectional_payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "slices": intersectional,
+    }
+    with (artifact_dir / "intersectional_report.json").open("w") as handle:
+        json.dump(intersectional_payload, handle, indent=2)
+
+    importance_payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "scoring": "roc_auc",
+        "n_repeats": IMPORTANCE_REPEATS,
+        "rows_per_repeat": min(importance_max_rows or len(X_test), len(X_test)),
+        "confidence": 0.95,
+        "features": importance,
+    }
+    with (artifact_dir / "global_importance_ci.json").open("w") as handle:
+        json.dump(importance_payload, handle, indent=2)
+
     if frontend_public is not None:
         frontend_public.parent.mkdir(parents=True, exist_ok=True)
         with frontend_public.open("w") as handle:
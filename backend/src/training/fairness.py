@@ -1,79 +1,165 @@
 from __future__ import annotations
 
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, List
 
 import numpy as np
-from fairlearn.metrics import (
-    MetricFrame,
-    equalized_odds_difference,
-    false_positive_rate,
-    true_positive_rate,
-)
+import pandas as pd
 
 # Groups with fewer than this many *positive* cases are excluded from the
 # headline gap metric (they still appear in per-group breakdowns).
 MIN_POSITIVES_FOR_GAP = 10
 
+CURVE_THRESHOLDS = np.round(np.linspace(0.0, 1.0, 101), 2)
+
+
+@dataclass
+class GroupConfusion:
+    """Per-group positive/negative counts and cumulative predicted-positive counts.
+
+    Scores are sorted once (descending). ``cum_tp[k, g]`` / ``cum_fp[k, g]``
+    count the positives / negatives of group ``g`` among the ``k`` highest
+    scores, so the confusion counts for any threshold are a lookup at the
+    number of scores at or above it.
+    """
+
+    groups: List
+    n: np.ndarray
+    n_positive: np.ndarray
+    sorted_scores: np.ndarray
+    cum_tp: np.ndarray
+    cum_fp: np.ndarray
+
+    @classmethod
+    def build(cls, y_true, y_prob, sensitive_features) -> "GroupConfusion":
+        y = np.asarray(y_true).astype(np.int64)
+        scores = np.asarray(y_prob, dtype=float)
+        codes, uniques = pd.factorize(np.asarray(sensitive_features), sort=True, use_na_sentinel=False)
+        n_groups = len(uniques)
+
+        order = np.argsort(-scores, kind="stable")
+        sorted_codes = codes[order]
+        sorted_y = y[order]
+        cum_tp = np.zeros((len(scores) + 1, n_groups), dtype=np.int32)
+        cum_fp = np.zeros((len(scores) + 1, n_groups), dtype=np.int32)
+        rows = np.arange(1, len(scores) + 1)
+        cum_tp[rows, sorted_codes] = sorted_y
+        cum_fp[rows, sorted_codes] = 1 - sorted_y
+        np.cumsum(cum_tp, axis=0, out=cum_tp)
+        np.cumsum(cum_fp, axis=0, out=cum_fp)
+
+        n = np.bincount(codes, minlength=n_groups)
+        n_positive = np.bincount(codes, weights=y, minlength=n_groups).astype(np.int64)
+        return cls(
+            groups=list(uniques.tolist() if hasattr(uniques, "tolist") else uniques),
+            n=n,
+            n_positive=n_positive,
+            sorted_scores=scores[order],
+            cum_tp=cum_tp,
+            cum_fp=cum_fp,
+        )
+
+    @classmethod
+    def from_histograms(cls, groups: List, edges: np.ndarray, pos: np.ndarray, neg: np.ndarray) -> "GroupConfusion":
+        """Build from per-group label counts over score bins (``pos[g, i]`` for ``edges[i] <= p < edges[i + 1]``).
+
+        Each bin stands in for its scores at its lower edge, so rates are
+        exact at thresholds that are bin edges.
+        """
+        pos = np.asarray(pos, dtype=np.int64)
+        neg = np.asarray(neg, dtype=np.int64)
+        zeros = np.zeros((1, len(groups)), dtype=np.int64)
+        return cls(
+            groups=list(groups),
+            n=(pos + neg).sum(axis=1),
+            n_positive=pos.sum(axis=1),
+            sorted_scores=np.asarray(edges, dtype=float)[::-1],
+            cum_tp=np.vstack([zeros, np.cumsum(pos[:, ::-1].T, axis=0)]),
+            cum_fp=np.vstack([zeros, np.cumsum(neg[:, ::-1].T, axis=0)]),
+        )
+
+    def _counts_at(self, thresholds: np.ndarray):
+        # number of scores >= t, from the ascending view of the descending sort
+        ascending = self.sorted_scores[::-1]
+        k = len(ascending) - np.searchsorted(ascending, thresholds, side="left")
+        return self.cum_tp[k], self.cum_fp[k]
+
+    def rates(self, thresholds) -> Dict[str, np.ndarray]:
+        """TPR and FPR per (threshold, group), plus pooled rates per threshold.
+
+        Empty denominators give 0, matching fairlearn's rate functions.
+        """
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        tp, fp = self._counts_at(thresholds)
+        n_negative = self.n - self.n_positive
+        total_pos = self.n_positive.sum()
+        total_neg = n_negative.sum()
+        return {
+            "tpr": _safe_divide(tp, self.n_positive),
+            "fpr": _safe_divide(fp, n_negative),
+            "overall_tpr": _safe_divide(tp.sum(axis=1), total_pos),
+            "overall_fpr": _safe_divide(fp.sum(axis=1), total_neg),
+        }
+
+    def reliable_mask(self, min_positives: int = MIN_POSITIVES_FOR_GAP) -> np.ndarray:
+        return self.n_positive >= min_positives
+
+
+def _safe_divide(numerator: np.ndarray, denominator) -> np.ndarray:
+    denominator = np.asarray(denominator, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), 0.0)
+    return out
+
+
+def _gaps(rates: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Max-min spread across the masked groups, per threshold (0 with fewer than two)."""
+    if mask.sum() < 2:
+        return np.zeros(rates.shape[0])
+    selected = rates[:, mask]
+    return selected.max(axis=1) - selected.min(axis=1)
+
+
+def default_threshold(y_prob) -> float:
+    threshold = float(np.quantile(y_prob, 0.85))
+    return max(threshold, 0.01)
+
 
 def compute_group_fairness(
     y_true,
     y_prob,
     sensitive_features,
     threshold: float | None = None,
+    confusion: GroupConfusion | None = None,
 ) -> Dict:
     if threshold is None:
-        threshold = float(np.quantile(y_prob, 0.85))
-        threshold = max(threshold, 0.01)
-    y_pred = (y_prob >= threshold).astype(int)
-
-    y_true_arr = np.asarray(y_true)
-    y_pred_arr = np.asarray(y_pred)
-    sf_arr = np.asarray(sensitive_features)
+        threshold = default_threshold(y_prob)
+    if confusion is None:
+        confusion = GroupConfusion.build(y_true, y_prob, sensitive_features)
 
-    # -- full metric frame (all groups) --
-    metric_frame = MetricFrame(
-        metrics={"tpr": true_positive_rate, "fpr": false_positive_rate},
-        y_true=y_true_arr,
-        y_pred=y_pred_arr,
-        sensitive_features=sf_arr,
-    )
-
-    group_metrics = metric_frame.by_group.to_dict()
-    overall = metric_frame.overall.to_dict()
+    rates = confusion.rates([threshold])
+    tpr, fpr = rates["tpr"][0], rates["fpr"][0]
+    group_keys = confusion.groups
+    group_metrics = {
+        "tpr": {g: float(v) for g, v in zip(group_keys, tpr)},
+        "fpr": {g: float(v) for g, v in zip(group_keys, fpr)},
+    }
+    overall = {"tpr": float(rates["overall_tpr"][0]), "fpr": float(rates["overall_fpr"][0])}
 
     # per-group counts so the frontend can show sample size
-    group_counts: Dict[str, Dict] = {}
-    for g in sorted(set(sf_arr.tolist())):
-        mask = sf_arr == g
-        n = int(np.sum(mask))
-        n_pos = int(np.sum(y_true_arr[mask]))
-        group_counts[str(g)] = {"n": n, "n_positive": n_pos}
+    group_counts: Dict[str, Dict] = {
+        str(g): {"n": int(n), "n_positive": int(n_pos)}
+        for g, n, n_pos in zip(group_keys, confusion.n, confusion.n_positive)
+    }
 
     # -- reliable groups only (enough positives) for gap calculation --
-    reliable_groups = [
-        g for g, info in group_counts.items() if info["n_positive"] >= MIN_POSITIVES_FOR_GAP
-    ]
-
-    if len(reliable_groups) >= 2:
-        reliable_mask = np.isin(sf_arr, reliable_groups)
-        eod = float(
-            equalized_odds_difference(
-                y_true_arr[reliable_mask],
-                y_pred_arr[reliable_mask],
-                sensitive_features=sf_arr[reliable_mask],
-            )
-        )
-        reliable_tpr = [group_metrics["tpr"][g] for g in reliable_groups if g in group_metrics.get("tpr", {})]
-        reliable_fpr = [group_metrics["fpr"][g] for g in reliable_groups if g in group_metrics.get("fpr", {})]
-        tpr_diff = float(np.max(reliable_tpr) - np.min(reliable_tpr)) if reliable_tpr else 0.0
-        fpr_diff = float(np.max(reliable_fpr) - np.min(reliable_fpr)) if reliable_fpr else 0.0
-    else:
-        eod = 0.0
-        tpr_diff = 0.0
-        fpr_diff = 0.0
+    reliable = confusion.reliable_mask()
+    reliable_groups = [str(g) for g, ok in zip(group_keys, reliable) if ok]
+    tpr_diff = float(_gaps(rates["tpr"], reliable)[0])
+    fpr_diff = float(_gaps(rates["fpr"], reliable)[0])
 
     return {
-        "equalized_odds_difference": eod,
+        "equalized_odds_difference": max(tpr_diff, fpr_diff),
         "tpr_difference": tpr_diff,
         "fpr_difference": fpr_diff,
         "by_group": group_metrics,
@@ -82,3 +168,30 @@ def compute_group_fairness(
         "overall": overall,
         "threshold_used": float(threshold),
     }
+
+
+def fairness_curve(
+    y_true,
+    y_prob,
+    sensitive_features,
+    thresholds=CURVE_THRESHOLDS,
+    confusion: GroupConfusion | None = None,
+) -> Dict:
+    """TPR/FPR of every group and the reliable-group gaps at every threshold."""
+    if confusion is None:
+        confusion = GroupConfusion.build(y_true, y_prob, sensitive_features)
+    thresholds = np.asarray(thresholds, dtype=float)
+    rates = confusion.rates(thresholds)
+    reliable = confusion.reliable_mask()
+    tpr_gap = _gaps(rates["tpr"], reliable)
+    fpr_gap = _gaps(rates["fpr"], reliable)
+    return {
+        "thresholds": thresholds.tolist(),
+        "groups": [str(g) for g in confusion.groups],
+        "reliable_groups": [str(g) for g, ok in zip(confusion.groups, reliable) if ok],
+        "tpr": {str(g): np.round(rates["tpr"][:, i], 6).tolist() for i, g in enumerate(confusion.groups)},
+        "fpr": {str(g): np.round(rates["fpr"][:, i], 6).tolist() for i, g in enumerate(confusion.groups)},
+        "tpr_difference": np.round(tpr_gap, 6).tolist(),
+        "fpr_difference": np.round(fpr_gap, 6).tolist(),
+        "equalized_odds_difference": np.round(np.maximum(tpr_gap, fpr_gap), 6).tolist(),
+    }
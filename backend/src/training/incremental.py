@@ -0,0 +1,259 @@
+"""Incremental training: grow the previous model on newly arrived data.
+
+A full retrain refits every boosting round on the whole history. Instead,
+this loads ``base_model.joblib``, keeps its fitted preprocessor, and uses
+``warm_start`` to add ``INCREMENTAL_TREES`` rounds fitted on the new data,
+plus an optional file of recent history. The sigmoid calibrator is then
+refitted on the validation split of that data. Only the ``gbm`` backend is
+warm-started: a warm-started ``HistGradientBoostingClassifier`` re-bins its
+input, and the existing trees would then score the wrong bins. A ``hist``
+model goes straight to the full retrain below, or is left serving when no
+history is given.
+
+Guardrail: the updated model's validation AUROC is compared with the
+previous model's on the same rows. If it is lower by more than
+``INCREMENTAL_AUROC_TOLERANCE``, the update is rejected. When ``--history``
+names the full training data, a full retrain on history plus the new
+training rows is tried instead and installed only if it passes the same
+check. Otherwise the previous model keeps serving. Installed versions are
+appended to ``lineage`` in ``model_metadata.json`` and the replaced files
+are archived.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+
+from ..config import ARTIFACT_DIR, INCREMENTAL_AUROC_TOLERANCE, INCREMENTAL_TREES, TRAIN_THREADS
+from .data import Dataset, load_data
+from .pipeline import decision_scores, fit_primary_with_calibration, load_tuned_params
+from .recalibrate import calibrate_scores, install_model
+from .split import split_dataset
+from .train import build_reference, extend_lineage
+
+logger = logging.getLogger(__name__)
+
+
+def n_rounds(estimator) -> int:
+    """Boosting rounds fitted so far."""
+    if isinstance(estimator, HistGradientBoostingClassifier):
+        return int(estimator.n_iter_)
+    return int(estimator.n_estimators_)
+
+
+def warm_start_fit(base_model: Pipeline, X, y, n_new_trees: int = INCREMENTAL_TREES, n_threads: int | None = TRAIN_THREADS) -> Pipeline:
+    """A copy of ``base_model`` with ``n_new_trees`` more boosting rounds fitted on ``(X, y)``.
+
+    The preprocessor is reused as fitted, so the encoded feature space (and
+    the existing trees) stay valid. Categories unseen at the original fit
+    are encoded as they are at prediction time.
+    """
+    if isinstance(base_model.steps[-1][1], HistGradientBoostingClassifier):
+        # a warm-start fit rebuilds the bin mapper from the new rows, so the
+        # existing trees would be evaluated on bins they were not grown on
+        raise ValueError("Incremental updates need the gbm backend; retrain hist models in full")
+    model = copy.deepcopy(base_model)
+    estimator = model.steps[-1][1]
+    Xt = model[:-1].transform(X)
+    estimator.set_params(warm_start=True, n_estimators=n_rounds(estimator) + n_new_trees)
+    with threadpool_limits(limits=n_threads, user_api="openmp"):
+        estimator.fit(Xt, y)
+    estimator.set_params(warm_start=False)
+    return model
+
+
+def load_update_data(data_path: str, recent_path: str | None = None) -> Dataset:
+    dataset = load_data(data_path)
+    if recent_path is None:
+        return dataset
+    recent = load_data(recent_path)
+    return Dataset(
+        X=pd.concat([dataset.X, recent.X], ignore_index=True),
+        y=pd.concat([dataset.y, recent.y], ignore_index=True),
+    )
+
+
+def _validation_auroc(model: Pipeline, Xt_val, y_val) -> Tuple[float, np.ndarray]:
+    scores = decision_scores(model.steps[-1][1], Xt_val)
+    return float(roc_auc_score(y_val, scores)), scores
+
+
+def train_incremental(
+    data_path: str,
+    artifact_dir: Path = ARTIFACT_DIR,
+    recent_path: str | None = None,
+    n_new_trees: int = INCREMENTAL_TREES,
+    auroc_tolerance: float = INCREMENTAL_AUROC_TOLERANCE,
+    history_path: str | None = None,
+) -> Dict:
+    """Update the model in ``artifact_dir`` with ``data_path`` (and ``recent_path``); returns a summary.
+
+    ``history_path`` is the data the served model was trained on. It is only
+    read for a full retrain: when the update fails the guardrail, or when the
+    served model is a ``hist`` model, which cannot be warm-started.
+    """
+    artifact_dir = Path(artifact_dir)
+    base_model_path = artifact_dir / "base_model.joblib"
+    metadata_path = artifact_dir / "model_metadata.json"
+    if not base_model_path.exists():
+        raise FileNotFoundError(f"Base model artifact not found at {base_model_path}; run a full train first")
+    previous = joblib.load(base_model_path)
+    previous_metadata = json.loads(metadata_path.read_text()) if metadata_path.exists() else {}
+    previous_version = previous_metadata.get("model_version")
+    backend = previous_metadata.get("backend", "gbm")
+
+    splits = split_dataset(load_update_data(data_path, recent_path))
+    X_train, X_val, _, y_train, y_val, _ = splits
+    Xt_val = previous[:-1].transform(X_val)
+    previous_auroc, _ = _validation_auroc(previous, Xt_val, y_val)
+    min_auroc = previous_auroc - auroc_tolerance
+    summary = {
+        "previous_version": previous_version,
+        "train_rows": int(len(X_train)),
+        "val_rows": int(len(X_val)),
+        "previous_val_auroc": previous_auroc,
+        "auroc_tolerance": auroc_tolerance,
+    }
+    now = datetime.now(timezone.utc)
+
+    if isinstance(previous.steps[-1][1], HistGradientBoostingClassifier):
+        if history_path is None:
+            logger.warning("%s is a hist model and cannot be warm-started; pass --history to retrain it", previous_version)
+            return {"model_version": previous_version, "mode": "rejected", "reason": "hist_needs_history", **summary}
+        return _full_fallback(artifact_dir, previous_metadata, history_path, splits, "hist", min_auroc, summary, now)
+
+    start = time.perf_counter()
+    candidate = warm_start_fit(previous, X_train, y_train, n_new_trees)
+    candidate_auroc, candidate_scores = _validation_auroc(candidate, Xt_val, y_val)
+    calibrated = calibrate_scores(candidate, candidate_scores, y_val.to_numpy(), "sigmoid")
+    summary.update(incremental_val_auroc=candidate_auroc, incremental_seconds=time.perf_counter() - start)
+    if candidate_auroc < min_auroc:
+        logger.warning(
+            "Incremental update lost %.4f validation AUROC (tolerance %.4f)",
+            previous_auroc - candidate_auroc,
+            auroc_tolerance,
+        )
+        if history_path is None:
+            logger.warning("No --history given for a full retrain; keeping %s", previous_version)
+            return {"model_version": previous_version, "mode": "rejected", "reason": "guardrail", **summary}
+        return _full_fallback(artifact_dir, previous_metadata, history_path, splits, backend, min_auroc, summary, now)
+
+    version = f"{backend}-incremental-{now.strftime('%Y%m%d%H%M%S')}"
+    summary.update(mode="incremental", rounds=n_rounds(candidate.steps[-1][1]), added_rounds=n_new_trees)
+    metadata = {
+        **previous_metadata,
+        "model_version": version,
+        "training_date": now.strftime("%Y-%m-%d"),
+        "lineage": extend_lineage(
+            previous_metadata,
+            {
+                "model_version": version,
+                "mode": "incremental",
+                "date": now.strftime("%Y-%m-%d"),
+                "train_rows": summary["train_rows"],
+                "added_rounds": n_new_trees,
+            },
+        ),
+        "incremental": summary,
+    }
+    metadata.pop("recalibration", None)
+    install_model(artifact_dir, metadata, previous_version, calibrated, base_model=candidate)
+    return {"model_version": version, **summary}
+
+
+def _full_fallback(
+    artifact_dir: Path,
+    previous_metadata: Dict,
+    history_path: str,
+    splits,
+    backend: str,
+    min_auroc: float,
+    summary: Dict,
+    now: datetime,
+) -> Dict:
+    """Retrain on history plus the new training rows; install it only if it clears ``min_auroc``."""
+    X_train, X_val, _, y_train, y_val, _ = splits
+    history = load_data(history_path)
+    start = time.perf_counter()
+    # the new validation rows stay held out: they calibrate and judge the retrain
+    full_base, full_calibrated = fit_primary_with_calibration(
+        pd.concat([history.X, X_train], ignore_index=True),
+        pd.concat([history.y, y_train], ignore_index=True),
+        X_val,
+        y_val,
+        backend,
+        params=load_tuned_params(artifact_dir, backend),
+    )
+    full_auroc, _ = _validation_auroc(full_base, full_base[:-1].transform(X_val), y_val)
+    summary.update(
+        full_retrain_seconds=time.perf_counter() - start,
+        full_retrain_val_auroc=full_auroc,
+        history_rows=int(len(history.y)),
+    )
+    previous_version = previous_metadata.get("model_version")
+    if full_auroc < min_auroc:
+        logger.warning("Full retrain also failed the guardrail (AUROC %.4f); keeping %s", full_auroc, previous_version)
+        return {"model_version": previous_version, "mode": "rejected", "reason": "guardrail", **summary}
+
+    version = f"{backend}-calibrated-{now.strftime('%Y%m%d%H%M%S')}"
+    train_rows = int(len(history.y) + len(X_train))
+    summary.update(mode="full_fallback", rounds=n_rounds(full_base.steps[-1][1]))
+    metadata = {
+        **previous_metadata,
+        "model_version": version,
+        "training_date": now.strftime("%Y-%m-%d"),
+        "lineage": extend_lineage(
+            previous_metadata,
+            {"model_version": version, "mode": "full_fallback", "date": now.strftime("%Y-%m-%d"), "train_rows": train_rows},
+        ),
+        "incremental": summary,
+    }
+    metadata.pop("recalibration", None)
+    reference = build_reference(pd.concat([history.X, X_train], ignore_index=True), full_calibrated)
+    install_model(artifact_dir, metadata, previous_version, full_calibrated, base_model=full_base, reference=reference)
+    return {"model_version": version, **summary}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Add boosting rounds to the trained model using new data")
+    parser.add_argument("--data", required=True, help="Newly arrived labeled CSV or Parquet file")
+    parser.add_argument("--recent", default=None, help="Optional recent history to train on alongside the new data")
+    parser.add_argument(
+        "--history",
+        default=None,
+        help="Full training data, used for a full retrain if the update fails the guardrail",
+    )
+    parser.add_argument("--artifacts", default=str(ARTIFACT_DIR), help="Directory holding base_model.joblib")
+    parser.add_argument("--trees", type=int, default=INCREMENTAL_TREES, help="Boosting rounds to add")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=INCREMENTAL_AUROC_TOLERANCE,
+        help="Allowed validation AUROC drop before falling back to a full retrain",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    summary = train_incremental(args.data, Path(args.artifacts), args.recent, args.trees, args.tolerance, args.history)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import numpy as np
 from sklearn.metrics import (
@@ -14,18 +14,28 @@ from sklearn.metrics import (
 )
 
 
-def expected_calibration_error(y_true, y_prob, n_bins: int = 10) -> float:
+def _bin_sums(y_true, y_prob, n_bins: int):
+    """Per-bin count, score sum and label sum over equal-width bins on [0, 1).
+
+    Scores outside the bins (p == 1.0 falls past the last edge) are left out
+    of every bin but still count towards the total in ECE's weights.
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_prob = np.asarray(y_prob, dtype=float)
     bins = np.linspace(0.0, 1.0, n_bins + 1)
     bin_ids = np.digitize(y_prob, bins) - 1
-    ece = 0.0
-    for bin_id in range(n_bins):
-        mask = bin_ids == bin_id
-        if not np.any(mask):
-            continue
-        bin_prob = y_prob[mask]
-        bin_true = y_true[mask]
-        ece += (len(bin_prob) / len(y_prob)) * abs(bin_prob.mean() - bin_true.mean())
-    return float(ece)
+    valid = (bin_ids >= 0) & (bin_ids < n_bins)
+    ids = bin_ids[valid]
+    counts = np.bincount(ids, minlength=n_bins)
+    sum_prob = np.bincount(ids, weights=y_prob[valid], minlength=n_bins)
+    sum_true = np.bincount(ids, weights=y_true[valid], minlength=n_bins)
+    return bins, counts, sum_prob, sum_true
+
+
+def expected_calibration_error(y_true, y_prob, n_bins: int = 10) -> float:
+    _, _, sum_prob, sum_true = _bin_sums(y_true, y_prob, n_bins)
+    # (count_b / n) * |mean_prob_b - mean_true_b| == |sum_prob_b - sum_true_b| / n
+    return float(np.abs(sum_prob - sum_true).sum() / len(y_prob))
 
 
 def classification_metrics(y_true, y_prob) -> Dict[str, float]:
@@ -54,20 +64,133 @@ def operating_point_metrics(y_true, y_prob, threshold: float) -> Dict[str, float
 
 
 def calibration_curve_data(y_true, y_prob, n_bins: int = 10) -> List[Dict[str, float]]:
+    bins, counts, sum_prob, sum_true = _bin_sums(y_true, y_prob, n_bins)
+    return [
+        {
+            "bin_start": float(bins[bin_id]),
+            "bin_end": float(bins[bin_id + 1]),
+            "mean_pred": float(sum_prob[bin_id] / counts[bin_id]),
+            "mean_true": float(sum_true[bin_id] / counts[bin_id]),
+            "count": int(counts[bin_id]),
+        }
+        for bin_id in np.flatnonzero(counts)
+    ]
+
+
+def score_grid(resolution: int = 10_000, exact_thresholds=()) -> np.ndarray:
+    """Bin edges on [0, 1] for score histograms.
+
+    ``resolution`` equal-width bins, plus the calibration bin edges and any
+    ``exact_thresholds`` as extra edges, so counts at those thresholds and the
+    10-bin calibration sums come out exactly.
+    """
+    edges = np.concatenate([np.linspace(0.0, 1.0, resolution + 1), np.linspace(0.0, 1.0, 11), np.asarray(exact_thresholds, dtype=float)])
+    return np.unique(edges)
+
+
+def histogram_bin_ids(edges: np.ndarray, y_prob) -> np.ndarray:
+    """Bin of each score: ``edges[i] <= p < edges[i + 1]``; the last bin holds p >= 1.0."""
+    return np.searchsorted(edges, np.asarray(y_prob, dtype=float), side="right") - 1
+
+
+def _histogram_auroc(pos: np.ndarray, neg: np.ndarray) -> Tuple[float, float]:
+    """AUROC with scores in the same bin counted as ties, and the largest error that can cause."""
+    total_pos, total_neg = pos.sum(), neg.sum()
+    if total_pos == 0 or total_neg == 0:
+        return float("nan"), float("nan")
+    neg_below = np.cumsum(neg) - neg
+    auroc = float((pos * (neg_below + 0.5 * neg)).sum() / (total_pos * total_neg))
+    return auroc, float(0.5 * (pos * neg).sum() / (total_pos * total_neg))
+
+
+def _histogram_average_precision(pos: np.ndarray, neg: np.ndarray) -> float:
+    total_pos = pos.sum()
+    if total_pos == 0:
+        return float("nan")
+    # thresholds from the top bin down, as sklearn steps through distinct scores
+    cum_pos = np.cumsum(pos[::-1])
+    predicted = cum_pos + np.cumsum(neg[::-1])
+    precision = np.divide(cum_pos, predicted, out=np.zeros(len(pos)), where=predicted > 0)
+    return float((pos[::-1] * precision).sum() / total_pos)
+
+
+def _histogram_calibration_sums(edges: np.ndarray, pos: np.ndarray, neg: np.ndarray, sum_prob: np.ndarray, n_bins: int):
+    # every calibration edge is a grid edge, so each grid bin sits inside one calibration bin
     bins = np.linspace(0.0, 1.0, n_bins + 1)
-    bin_ids = np.digitize(y_prob, bins) - 1
-    curve = []
-    for bin_id in range(n_bins):
-        mask = bin_ids == bin_id
-        if not np.any(mask):
-            continue
-        curve.append(
-            {
-                "bin_start": float(bins[bin_id]),
-                "bin_end": float(bins[bin_id + 1]),
-                "mean_pred": float(np.mean(y_prob[mask])),
-                "mean_true": float(np.mean(y_true[mask])),
-                "count": int(np.sum(mask)),
-            }
-        )
-    return curve
+    coarse = np.digitize(edges, bins) - 1
+    valid = (coarse >= 0) & (coarse < n_bins)
+    counts = np.bincount(coarse[valid], weights=(pos + neg)[valid], minlength=n_bins)
+    sums_prob = np.bincount(coarse[valid], weights=sum_prob[valid], minlength=n_bins)
+    sums_true = np.bincount(coarse[valid], weights=pos[valid], minlength=n_bins)
+    return bins, counts, sums_prob, sums_true
+
+
+def histogram_metrics(
+    edges: np.ndarray,
+    pos: np.ndarray,
+    neg: np.ndarray,
+    sum_prob: np.ndarray,
+    sum_sq_error: np.ndarray,
+    n_bins: int = 10,
+) -> Dict[str, float]:
+    """``classification_metrics`` from per-bin sums over ``edges``.
+
+    ``pos``/``neg`` count labels per bin; ``sum_prob`` and ``sum_sq_error``
+    are the per-bin sums of p and (p - y)**2. Brier and ECE are exact. AUROC
+    and AUPRC treat scores sharing a bin as tied, which is exact whenever no
+    bin holds two distinct scores; ``auroc_error_bound`` bounds the AUROC
+    error otherwise.
+    """
+    n = pos.sum() + neg.sum()
+    auroc, bound = _histogram_auroc(pos, neg)
+    _, _, sums_prob, sums_true = _histogram_calibration_sums(edges, pos, neg, sum_prob, n_bins)
+    return {
+        "auroc": auroc,
+        "auprc": _histogram_average_precision(pos, neg),
+        "brier": float(sum_sq_error.sum() / n) if n else float("nan"),
+        "ece": float(np.abs(sums_prob - sums_true).sum() / n) if n else float("nan"),
+        "auroc_error_bound": bound,
+    }
+
+
+def histogram_calibration_curve(
+    edges: np.ndarray, pos: np.ndarray, neg: np.ndarray, sum_prob: np.ndarray, n_bins: int = 10
+) -> List[Dict[str, float]]:
+    bins, counts, sums_prob, sums_true = _histogram_calibration_sums(edges, pos, neg, sum_prob, n_bins)
+    return [
+        {
+            "bin_start": float(bins[bin_id]),
+            "bin_end": float(bins[bin_id + 1]),
+            "mean_pred": float(sums_prob[bin_id] / counts[bin_id]),
+            "mean_true": float(sums_true[bin_id] / counts[bin_id]),
+            "count": int(counts[bin_id]),
+        }
+        for bin_id in np.flatnonzero(counts)
+    ]
+
+
+def histogram_operating_point(edges: np.ndarray, pos: np.ndarray, neg: np.ndarray, threshold: float) -> Dict[str, float]:
+    """``operating_point_metrics`` for predictions p >= ``threshold``, a grid edge."""
+    first = int(np.searchsorted(edges, threshold, side="left"))
+    tp, fp = int(pos[first:].sum()), int(neg[first:].sum())
+    fn, tn = int(pos.sum()) - tp, int(neg.sum()) - fp
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "threshold": float(threshold),
+        "positive_rate": float((tp + fp) / (tp + fp + tn + fn)),
+        "tn": tn,
+        "fp": fp,
+        "fn": fn,
+        "tp": tp,
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(2 * precision * recall / (precision + recall)) if precision + recall else 0.0,
+    }
+
+
+def histogram_quantile(edges: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Lower edge of the bin holding the ``q`` quantile of the binned scores."""
+    cumulative = np.cumsum(counts)
+    target = q * (cumulative[-1] - 1)
+    return float(edges[min(int(np.searchsorted(cumulative, target, side="right")), len(edges) - 1)])
@@ -0,0 +1,271 @@
+"""Single-pass train + evaluate pipeline.
+
+Loads and splits the data once, keeps the fitted models in memory between
+stages and records a manifest of stage input hashes so a rerun with the same
+data, configuration and code skips the work entirely::
+
+    python -m backend.src.training.orchestrate --data data/sample_synthetic.csv \
+        --artifacts backend/artifacts --frontend-public frontend/public/metrics.json
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ..config import (
+    ARTIFACT_DIR,
+    BOOTSTRAP_REPLICATES,
+    DISTILL_STUDENT,
+    ESCALATION_MARGIN,
+    IMPORTANCE_MAX_ROWS,
+    MODEL_BACKEND,
+)
+from .data import file_digest, load_data
+from .distill import distill_from_splits
+from .evaluate import evaluate_models
+from .pipeline import (
+    BACKENDS,
+    build_baseline_model,
+    build_primary_model,
+    load_tuned_params,
+    positive_proba_from_encoded,
+)
+from .split import split_dataset
+from .train import train_from_splits
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "pipeline_manifest.json"
+TRAINING_DIR = Path(__file__).resolve().parent
+
+# Source files each stage depends on; editing one invalidates that stage.
+STAGE_SOURCES: Dict[str, List[str]] = {
+    "train": ["data.py", "split.py", "pipeline.py", "train.py", "../monitoring.py"],
+    "evaluate": ["evaluate.py", "metrics.py", "fairness.py", "importance.py", "subgroups.py", "bootstrap.py", "orchestrate.py"],
+    "distill": ["distill.py", "../modeling.py"],
+}
+STAGE_OUTPUTS: Dict[str, List[str]] = {
+    "train": [
+        "model.joblib",
+        "base_model.joblib",
+        "feature_reference.json",
+        "background_sample.csv",
+        "model_metadata.json",
+    ],
+    "evaluate": [
+        "eval_metrics.json",
+        "fairness_report.json",
+        "global_importance.json",
+        "global_importance_ci.json",
+        "intersectional_report.json",
+    ],
+    "distill": ["student_model.joblib", "distillation_report.json"],
+}
+STAGES = list(STAGE_SOURCES)
+# the stage whose outputs each stage consumes; its key chains on that stage's key
+STAGE_PARENTS: Dict[str, str | None] = {"train": None, "evaluate": "train", "distill": "train"}
+# stages that describe the served model.joblib; incremental updates and
+# recalibration replace it without touching the train stage's inputs
+MODEL_STAGES = ("evaluate", "distill")
+
+
+class EncodedSplits:
+    """Preprocessed split matrices from the primary model's fitted transformer.
+
+    Each split is encoded at most once and shared by every stage that scores it.
+    """
+
+    def __init__(self, base_model, splits) -> None:
+        self.preprocess = base_model[:-1]
+        X_train, X_val, X_test, *_ = splits
+        self._frames = {"train": X_train, "val": X_val, "test": X_test}
+        self._encoded: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str) -> np.ndarray:
+        if name not in self._encoded:
+            self._encoded[name] = self.preprocess.transform(self._frames[name])
+        return self._encoded[name]
+
+
+def _hash_text(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_version(stage: str) -> str:
+    digest = hashlib.sha256()
+    for name in STAGE_SOURCES[stage]:
+        digest.update((TRAINING_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+
+def pipeline_config(backend: str = MODEL_BACKEND, params: Dict | None = None) -> Dict[str, Dict]:
+    """Per-stage settings that change the artifacts without changing data or code."""
+    signature = split_dataset.__defaults__
+    return {
+        "train": {
+            "split": dict(zip(("test_size", "val_size", "seed"), signature)),
+            "backend": backend,
+            "tuned_params": params,
+            "primary_model": repr(build_primary_model(backend, params)),
+        },
+        "evaluate": {
+            "baseline_model": repr(build_baseline_model()),
+            "importance_max_rows": IMPORTANCE_MAX_ROWS,
+            "bootstrap_replicates": BOOTSTRAP_REPLICATES,
+        },
+        "distill": {"student": DISTILL_STUDENT, "margin": ESCALATION_MARGIN},
+    }
+
+
+def stage_keys(data_path: str, backend: str = MODEL_BACKEND, params: Dict | None = None) -> Dict[str, str]:
+    """Content hash of each stage's inputs; each stage also depends on its parent stage's key."""
+    data = file_digest(Path(data_path))
+    config = pipeline_config(backend, params)
+    keys: Dict[str, str] = {}
+    for stage in STAGES:
+        parent = STAGE_PARENTS[stage]
+        stage_config = json.dumps(config[stage], sort_keys=True)
+        keys[stage] = _hash_text(keys[parent] if parent else "", data, stage_config, code_version(stage))
+    return keys
+
+
+def load_manifest(artifact_dir: Path) -> Dict:
+    path = artifact_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"stages": {}}
+    with path.open() as handle:
+        return json.load(handle)
+
+
+def _model_digest(artifact_dir: Path) -> str | None:
+    path = artifact_dir / "model.joblib"
+    return file_digest(path) if path.exists() else None
+
+
+def _is_current(manifest: Dict, artifact_dir: Path, stage: str, key: str, model_digest: str | None = None) -> bool:
+    recorded = manifest.get("stages", {}).get(stage, {})
+    if stage in MODEL_STAGES and recorded.get("model_digest") != model_digest:
+        return False
+    return recorded.get("key") == key and all((artifact_dir / name).exists() for name in STAGE_OUTPUTS[stage])
+
+
+def run_pipeline(
+    data_path: str,
+    artifact_dir: Path,
+    frontend_public: Path | None = None,
+    force: bool = False,
+    backend: str = MODEL_BACKEND,
+) -> Dict:
+    """Run the stages whose inputs changed; returns the updated manifest."""
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    # a new tuned_params.json from training.tune invalidates the train stage
+    keys = stage_keys(data_path, backend, load_tuned_params(artifact_dir, backend))
+    manifest = load_manifest(artifact_dir)
+    model_digest = _model_digest(artifact_dir)
+    pending = [s for s in STAGES if force or not _is_current(manifest, artifact_dir, s, keys[s], model_digest)]
+
+    if not pending:
+        logger.info("All pipeline stages are up to date in %s", artifact_dir)
+        if frontend_public is not None:
+            frontend_public.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(artifact_dir / "eval_metrics.json", frontend_public)
+        return manifest
+
+    splits = split_dataset(load_data(data_path))
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    if "train" in pending:
+        base_model, primary_model = train_from_splits(splits, artifact_dir, backend)
+        timings["train"] = time.perf_counter() - start
+    else:
+        logger.info("Skipping train stage; reusing models in %s", artifact_dir)
+        base_model = joblib.load(artifact_dir / "base_model.joblib")
+        primary_model = joblib.load(artifact_dir / "model.joblib")
+
+    # evaluate always follows a retrain: its key chains on the train key
+    encoded = EncodedSplits(base_model, splits)
+    if "evaluate" in pending:
+        start = time.perf_counter()
+        primary_probs = positive_proba_from_encoded(primary_model, encoded.get("test"))
+        X_train, X_val, _, y_train, y_val, _ = splits
+        baseline_model = build_baseline_model()
+        baseline_model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
+        evaluate_models(
+            splits,
+            primary_model,
+            artifact_dir,
+            frontend_public,
+            baseline_model=baseline_model,
+            primary_probs=primary_probs,
+            encoded_test=encoded.get("test"),
+        )
+        timings["evaluate"] = time.perf_counter() - start
+    elif frontend_public is not None:
+        frontend_public.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(artifact_dir / "eval_metrics.json", frontend_public)
+
+    if "distill" in pending:
+        start = time.perf_counter()
+        train_probs = positive_proba_from_encoded(primary_model, encoded.get("train"))
+        distill_from_splits(splits, primary_model, artifact_dir, train_probs=train_probs)
+        timings["distill"] = time.perf_counter() - start
+
+    now = datetime.now(timezone.utc).isoformat()
+    stages = manifest.setdefault("stages", {})
+    model_digest = _model_digest(artifact_dir)
+    for stage in STAGES:
+        if stage in timings:
+            stages[stage] = {"key": keys[stage], "completed_at": now, "duration_s": round(timings[stage], 3)}
+            if stage in MODEL_STAGES:
+                stages[stage]["model_digest"] = model_digest
+    manifest["data_path"] = str(data_path)
+    with (artifact_dir / MANIFEST_NAME).open("w") as handle:
+        json.dump(manifest, handle, indent=2)
+    return manifest
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train and evaluate Discharge Compass in one pass")
+    parser.add_argument("--data", required=True, help="Path to CSV dataset")
+    parser.add_argument(
+        "--artifacts",
+        default=str(ARTIFACT_DIR),
+        help="Directory to write artifacts",
+    )
+    parser.add_argument(
+        "--frontend-public",
+        default=None,
+        help="Optional path to write metrics JSON for frontend",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default=MODEL_BACKEND, help="Primary model implementation")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage even if its inputs are unchanged")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    frontend_public = Path(args.frontend_public) if args.frontend_public else None
+    manifest = run_pipeline(args.data, Path(args.artifacts), frontend_public, args.force, args.backend)
+    for stage, record in manifest.get("stages", {}).items():
+        print(f"{stage}: {record.get('duration_s')}s (completed {record.get('completed_at')})")
+
+
+if __name__ == "__main__":
+    main()
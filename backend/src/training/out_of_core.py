@@ -0,0 +1,221 @@
+"""Out-of-core training of the logistic baseline.
+
+``build_baseline_model`` fits liblinear on the whole dense one-hot matrix, so
+the data must fit in memory. This trains the same kind of model from a CSV
+or Parquet file of any size, reading it in chunks:
+
+1. One pass builds a sketch: category counts for categoricals, and count,
+   mean and sum of squared deviations for numerics, plus the class balance.
+   ``SketchPreprocessor`` standardizes and one-hot encodes from it, with
+   sparse output.
+2. ``--epochs`` passes train an averaged ``SGDClassifier(loss="log_loss")``
+   with ``partial_fit``, one shuffled chunk at a time. Class weights come
+   from the sketch, like ``class_weight="balanced"``.
+3. A last pass scores the held-out rows (every ``HOLDOUT_EVERY``-th row) into
+   a fixed-size score histogram.
+
+Memory is bounded by one chunk plus the sketch. The fitted pipeline is saved
+as ``baseline_model.joblib``; ``training.streaming --baseline-model`` scores
+it alongside the primary model.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from ..config import ARTIFACT_DIR
+from .data import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, iter_data_chunks
+from .metrics import histogram_metrics, score_grid
+from .streaming import STREAM_RESOLUTION, ScoreHistogram
+
+OOC_CHUNK_ROWS = 200_000
+OOC_EPOCHS = 2
+# every HOLDOUT_EVERY-th row of the file is held out for evaluation
+HOLDOUT_EVERY = 10
+SGD_ALPHA = 1e-4
+
+
+class SketchPreprocessor(BaseEstimator, TransformerMixin):
+    """Standardize numerics and one-hot encode categoricals from streamed statistics.
+
+    ``partial_fit`` only updates counts and moments, so fitting never holds
+    more than one chunk. Each chunk's mean and sum of squared deviations are
+    merged with Chan's parallel update, which stays accurate when the mean
+    is large next to the spread. ``transform`` returns a CSR matrix: numerics first,
+    then one column per category seen during fitting. Unseen categories
+    encode as all zeros, like ``OneHotEncoder(handle_unknown="ignore")``.
+    Missing numerics become the mean.
+    """
+
+    def __init__(self, numeric_columns: List[str] = NUMERIC_COLUMNS, categorical_columns: List[str] = CATEGORICAL_COLUMNS) -> None:
+        self.numeric_columns = numeric_columns
+        self.categorical_columns = categorical_columns
+
+    def fit(self, X, y=None):
+        for attr in ("n_seen_", "mean_", "m2_", "category_counts_"):
+            if hasattr(self, attr):
+                delattr(self, attr)
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        values = X[self.numeric_columns].to_numpy(dtype=float)
+        if not hasattr(self, "n_seen_"):
+            self.n_seen_ = np.zeros(len(self.numeric_columns))
+            self.mean_ = np.zeros(len(self.numeric_columns))
+            self.m2_ = np.zeros(len(self.numeric_columns))
+            self.category_counts_: Dict[str, Dict[str, int]] = {col: {} for col in self.categorical_columns}
+        present = ~np.isnan(values)
+        chunk_n = present.sum(axis=0).astype(float)
+        chunk_sum = np.where(present, values, 0.0).sum(axis=0)
+        chunk_mean = np.divide(chunk_sum, chunk_n, out=np.zeros_like(chunk_n), where=chunk_n > 0)
+        chunk_m2 = np.where(present, (values - chunk_mean) ** 2, 0.0).sum(axis=0)
+        total = self.n_seen_ + chunk_n
+        weight = np.divide(chunk_n, total, out=np.zeros_like(total), where=total > 0)
+        delta = chunk_mean - self.mean_
+        self.mean_ = self.mean_ + delta * weight
+        self.m2_ = self.m2_ + chunk_m2 + delta**2 * self.n_seen_ * weight
+        self.n_seen_ = total
+        for col in self.categorical_columns:
+            counts = self.category_counts_[col]
+            for category, count in X[col].astype(str).value_counts(sort=False).items():
+                counts[category] = counts.get(category, 0) + int(count)
+        self._finalize()
+        return self
+
+    def _finalize(self) -> None:
+        variance = self.m2_ / np.maximum(self.n_seen_, 1)
+        self.scale_ = np.where(variance > 0, np.sqrt(variance), 1.0)
+        self.categories_ = [sorted(self.category_counts_[col]) for col in self.categorical_columns]
+        self._indexes = [pd.Index(categories) for categories in self.categories_]
+        offsets = np.cumsum([len(self.numeric_columns)] + [len(c) for c in self.categories_])
+        self._offsets = offsets[:-1]
+        self.n_features_out_ = int(offsets[-1])
+
+    def transform(self, X) -> sparse.csr_matrix:
+        n_rows = len(X)
+        n_numeric = len(self.numeric_columns)
+        numeric = (X[self.numeric_columns].to_numpy(dtype=float) - self.mean_) / self.scale_
+        numeric[np.isnan(numeric)] = 0.0
+        codes = np.column_stack(
+            [index.get_indexer(X[col].astype(str)) for col, index in zip(self.categorical_columns, self._indexes)]
+        )
+        known = codes >= 0
+        rows = np.concatenate([np.repeat(np.arange(n_rows), n_numeric), np.nonzero(known)[0]])
+        cols = np.concatenate([np.tile(np.arange(n_numeric), n_rows), (codes + self._offsets)[known]])
+        data = np.concatenate([numeric.ravel(), np.ones(int(known.sum()))])
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, self.n_features_out_))
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        names = list(self.numeric_columns)
+        for col, categories in zip(self.categorical_columns, self.categories_):
+            names.extend(f"{col}_{category}" for category in categories)
+        return np.asarray(names, dtype=object)
+
+
+def _holdout_mask(start: int, n_rows: int) -> np.ndarray:
+    return (np.arange(start, start + n_rows) % HOLDOUT_EVERY) == 0
+
+
+def train_out_of_core(
+    data_path: str,
+    chunk_rows: int = OOC_CHUNK_ROWS,
+    epochs: int = OOC_EPOCHS,
+    alpha: float = SGD_ALPHA,
+    seed: int = 42,
+) -> Tuple[Pipeline, Dict]:
+    """Fit the streamed logistic baseline on ``data_path``; returns (pipeline, report)."""
+    start_time = time.perf_counter()
+    preprocessor = SketchPreprocessor()
+    class_counts = np.zeros(2)
+    n_rows = 0
+    for chunk in iter_data_chunks(data_path, chunk_rows):
+        train = ~_holdout_mask(n_rows, len(chunk.y))
+        n_rows += len(chunk.y)
+        if not train.any():
+            continue
+        preprocessor.partial_fit(chunk.X[train])
+        class_counts += np.bincount(chunk.y.to_numpy()[train], minlength=2)
+    if n_rows == 0:
+        raise ValueError("Dataset contains no rows.")
+    if (class_counts == 0).any():
+        raise ValueError("Training rows must contain both readmitted and not-readmitted rows.")
+    sketch_seconds = time.perf_counter() - start_time
+
+    # the weights class_weight="balanced" would compute, which partial_fit cannot
+    class_weight = {label: float(class_counts.sum() / (2 * count)) for label, count in enumerate(class_counts)}
+    model = SGDClassifier(loss="log_loss", alpha=alpha, average=True, class_weight=class_weight, random_state=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        offset = 0
+        for chunk in iter_data_chunks(data_path, chunk_rows):
+            train = ~_holdout_mask(offset, len(chunk.y))
+            offset += len(chunk.y)
+            if not train.any():
+                continue
+            order = rng.permutation(int(train.sum()))
+            Xt = preprocessor.transform(chunk.X[train])[order]
+            model.partial_fit(Xt, chunk.y.to_numpy()[train][order], classes=np.array([0, 1]))
+
+    pipeline = Pipeline(steps=[("preprocess", preprocessor), ("model", model)])
+    edges = score_grid(STREAM_RESOLUTION)
+    holdout = ScoreHistogram(edges)
+    offset = 0
+    for chunk in iter_data_chunks(data_path, chunk_rows):
+        mask = _holdout_mask(offset, len(chunk.y))
+        offset += len(chunk.y)
+        if mask.any():
+            holdout.update(chunk.y.to_numpy()[mask], pipeline.predict_proba(chunk.X[mask])[:, 1])
+
+    totals = holdout.totals()
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "data": str(data_path),
+        "rows": n_rows,
+        "train_rows": int(class_counts.sum()),
+        "holdout_rows": int(totals[0].sum() + totals[1].sum()),
+        "n_features": preprocessor.n_features_out_,
+        "epochs": epochs,
+        "chunk_rows": chunk_rows,
+        "alpha": alpha,
+        "sketch_seconds": sketch_seconds,
+        "total_seconds": time.perf_counter() - start_time,
+        "holdout_metrics": {k: (None if np.isnan(v) else float(v)) for k, v in histogram_metrics(edges, *totals).items()},
+    }
+    return pipeline, report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the logistic baseline out of core from chunked CSV/Parquet")
+    parser.add_argument("--data", required=True, help="Path to CSV or Parquet dataset")
+    parser.add_argument("--artifacts", default=str(ARTIFACT_DIR), help="Directory to write baseline_model.joblib")
+    parser.add_argument("--chunk-rows", type=int, default=OOC_CHUNK_ROWS)
+    parser.add_argument("--epochs", type=int, default=OOC_EPOCHS, help="Passes of partial_fit over the file")
+    parser.add_argument("--alpha", type=float, default=SGD_ALPHA, help="L2 regularization strength")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    artifact_dir = Path(args.artifacts)
+    pipeline, report = train_out_of_core(args.data, args.chunk_rows, args.epochs, args.alpha)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(pipeline, artifact_dir / "baseline_model.joblib")
+    with (artifact_dir / "out_of_core_baseline.json").open("w") as handle:
+        json.dump(report, handle, indent=2)
+    print(json.dumps(report["holdout_metrics"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
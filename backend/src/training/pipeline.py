@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from typing import Tuple
+import json
+from pathlib import Path
+from typing import Dict, Tuple
 
+import numpy as np
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.compose import ColumnTransformer
 from sklearn.frozen import FrozenEstimator
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.metrics import log_loss
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+from threadpoolctl import threadpool_limits
 
+from ..config import MODEL_BACKEND, TRAIN_THREADS
 from .data import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
 
+BACKENDS = ("gbm", "hist")
+HIST_MAX_ITER = 1000
+HIST_EARLY_STOPPING_ROUNDS = 20
+# boosting-round parameter of each backend; the resource successive halving allocates
+BUDGET_PARAMS = {"gbm": "n_estimators", "hist": "max_iter"}
+TUNED_PARAMS_NAME = "tuned_params.json"
+
 
 def make_preprocessor() -> ColumnTransformer:
     numeric_transformer = Pipeline(
@@ -53,7 +66,7 @@ def build_baseline_model() -> Pipeline:
     )
 
 
-def build_primary_model() -> Pipeline:
+def build_gbm_model() -> Pipeline:
     return Pipeline(
         steps=[
             ("preprocess", make_preprocessor()),
@@ -73,15 +86,152 @@ def build_primary_model() -> Pipeline:
     )
 
 
+def make_ordinal_preprocessor() -> ColumnTransformer:
+    """Categoricals as ordinal codes (first), numerics passed through for native handling.
+
+    Unseen categories become NaN, which HistGradientBoosting routes as missing.
+    """
+    categorical_transformer = OrdinalEncoder(
+        handle_unknown="use_encoded_value",
+        unknown_value=np.nan,
+        encoded_missing_value=np.nan,
+    )
+    return ColumnTransformer(
+        transformers=[
+            ("cat", categorical_transformer, CATEGORICAL_COLUMNS),
+            ("num", "passthrough", NUMERIC_COLUMNS),
+        ]
+    )
+
+
+def build_hist_model() -> Pipeline:
+    return Pipeline(
+        steps=[
+            ("preprocess", make_ordinal_preprocessor()),
+            (
+                "model",
+                HistGradientBoostingClassifier(
+                    learning_rate=0.05,
+                    max_iter=HIST_MAX_ITER,
+                    max_leaf_nodes=31,
+                    min_samples_leaf=20,
+                    l2_regularization=1.0,
+                    max_bins=255,
+                    categorical_features=list(range(len(CATEGORICAL_COLUMNS))),
+                    early_stopping=False,
+                    random_state=42,
+                ),
+            ),
+        ]
+    )
+
+
+def build_primary_model(backend: str = MODEL_BACKEND, params: Dict | None = None) -> Pipeline:
+    """Primary model pipeline; ``params`` override the estimator's defaults (e.g. tuned values)."""
+    if backend == "hist":
+        model = build_hist_model()
+    elif backend == "gbm":
+        model = build_gbm_model()
+    else:
+        raise ValueError(f"Unknown model backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    if params:
+        model.steps[-1][1].set_params(**params)
+    return model
+
+
+def load_tuned_params(artifact_dir: Path, backend: str) -> Dict | None:
+    """Winning hyperparameters written by ``training.tune`` for ``backend``, if any."""
+    path = artifact_dir / TUNED_PARAMS_NAME
+    if not path.exists():
+        return None
+    with path.open() as handle:
+        tuned = json.load(handle)
+    if tuned.get("backend") != backend:
+        return None
+    return tuned.get("params")
+
+
+def _fit_hist_early_stopped(base_model: Pipeline, X_train, y_train, X_val, y_val) -> None:
+    """Fit the hist pipeline in place, stopping on validation log loss.
+
+    The preprocessor is fitted on the training split only, and the ensemble
+    grows with warm starts, HIST_EARLY_STOPPING_ROUNDS iterations at a time,
+    until a round brings no validation improvement. Like the built-in early
+    stopping, the trees of the final round are kept. The same loop runs on
+    every supported scikit-learn, so a given split always yields the same
+    model.
+    """
+    preprocess = base_model[:-1]
+    estimator = base_model.steps[-1][1]
+    Xt_train = preprocess.fit_transform(X_train)
+    Xt_val = preprocess.transform(X_val)
+
+    max_iter = estimator.max_iter
+    estimator.set_params(warm_start=True)
+    best_loss = np.inf
+    for n_iter in range(HIST_EARLY_STOPPING_ROUNDS, max_iter + HIST_EARLY_STOPPING_ROUNDS, HIST_EARLY_STOPPING_ROUNDS):
+        estimator.set_params(max_iter=min(n_iter, max_iter))
+        estimator.fit(Xt_train, y_train)
+        loss = log_loss(y_val, estimator.predict_proba(Xt_val)[:, 1])
+        if loss > best_loss - estimator.tol:
+            break
+        best_loss = loss
+    estimator.set_params(warm_start=False, max_iter=max_iter)
+
+
 def fit_primary_with_calibration(
     X_train,
     y_train,
     X_val,
     y_val,
+    backend: str = MODEL_BACKEND,
+    n_threads: int | None = TRAIN_THREADS,
+    params: Dict | None = None,
 ) -> Tuple[Pipeline, CalibratedClassifierCV]:
-    base_model = build_primary_model()
-    base_model.fit(X_train, y_train)
+    base_model = build_primary_model(backend, params)
+    # hist fits are OpenMP-parallel; None leaves every core available
+    with threadpool_limits(limits=n_threads, user_api="openmp"):
+        if backend == "hist":
+            _fit_hist_early_stopped(base_model, X_train, y_train, X_val, y_val)
+        else:
+            base_model.fit(X_train, y_train)
 
     calibrator = CalibratedClassifierCV(FrozenEstimator(base_model), method="sigmoid")
     calibrator.fit(X_val, y_val)
     return base_model, calibrator
+
+
+def decision_scores(estimator, X_encoded) -> np.ndarray:
+    """Raw scores the sigmoid/isotonic calibrators were fitted on."""
+    if hasattr(estimator, "decision_function"):
+        return np.asarray(estimator.decision_function(X_encoded)).ravel()
+    return estimator.predict_proba(X_encoded)[:, 1]
+
+
+def unwrap_pipeline(model) -> Pipeline:
+    """The fitted preprocessing + estimator pipeline inside a (calibrated) model."""
+    if isinstance(model, CalibratedClassifierCV):
+        return model.estimator.estimator if isinstance(model.estimator, FrozenEstimator) else model.estimator
+    return model
+
+
+def positive_proba_from_encoded(model, X_encoded) -> np.ndarray:
+    """Positive-class probabilities of ``model`` for already-preprocessed rows.
+
+    ``model`` is either the calibrated primary model (a CalibratedClassifierCV
+    around a frozen pipeline) or a plain fitted pipeline. Only the final
+    estimator and the calibrators run, so callers holding a cached encoded
+    matrix skip the ColumnTransformer; this matches ``predict_proba`` exactly
+    for binary targets.
+    """
+    if isinstance(model, CalibratedClassifierCV):
+        return calibrated_proba_from_scores(model, decision_scores(unwrap_pipeline(model).steps[-1][1], X_encoded))
+    return model.steps[-1][1].predict_proba(X_encoded)[:, 1]
+
+
+def calibrated_proba_from_scores(model: CalibratedClassifierCV, scores: np.ndarray) -> np.ndarray:
+    """Apply only the calibrators of ``model`` to raw ``decision_scores``."""
+    probs = np.zeros(len(scores))
+    for calibrated in model.calibrated_classifiers_:
+        probs += calibrated.calibrators[0].predict(scores)
+    return probs / len(model.calibrated_classifiers_)
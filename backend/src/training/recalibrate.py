@@ -0,0 +1,232 @@
+"""Refit only the calibrator of the served model on fresh labeled data.
+
+Drift often moves calibration without hurting ranking. This keeps the
+fitted ``base_model.joblib`` and fits a new sigmoid or isotonic map from its
+raw scores to the observed outcomes. The base model scores the data once,
+and the scores are cached next to the cleaned data, keyed by both file
+digests. Refitting on the same file, for example to try the other method,
+skips the model entirely.
+
+Outputs: a new ``model.joblib``, whose previous version is archived under
+``archive/``, and ``model_metadata.json`` with a fresh ``model_version``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+from sklearn.model_selection import train_test_split
+
+from ..config import ARTIFACT_DIR
+from .data import file_digest, load_data, prune_cache, touch_cached
+from .metrics import classification_metrics
+from .pipeline import calibrated_proba_from_scores, decision_scores
+from .train import extend_lineage
+
+METHODS = ("sigmoid", "isotonic")
+# share of the new data held out to compare the old and new calibration
+HOLDOUT_FRACTION = 0.2
+
+
+def base_scores(base_model, base_model_path: Path, data_path: str, cache_dir: Path | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Raw base-model scores and labels for ``data_path``, cached per (model, data) pair.
+
+    ``cache_dir`` defaults to ``DATA_CACHE_DIR``, read at call time.
+    """
+    if cache_dir is None:
+        from ..config import DATA_CACHE_DIR as cache_dir
+    cache_path = None
+    if cache_dir is not None:
+        key = f"{file_digest(base_model_path)[:16]}-{file_digest(data_path)[:16]}"
+        cache_path = Path(cache_dir) / f"scores-{Path(data_path).stem}-{key}.npz"
+        if cache_path.exists():
+            cached = np.load(cache_path)
+            touch_cached(cache_path)
+            return cached["scores"], cached["y"]
+
+    dataset = load_data(data_path, use_cache=cache_dir is not None, cache_dir=cache_dir)
+    scores = decision_scores(base_model.steps[-1][1], base_model[:-1].transform(dataset.X))
+    y = dataset.y.to_numpy(dtype=np.int8)
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, scores=scores, y=y)
+        tmp_path.replace(cache_path)
+        prune_cache(cache_path.parent, keep=cache_path)
+    return scores, y
+
+
+class _ScoreInput(ClassifierMixin, BaseEstimator):
+    """Stand-in classifier whose decision function is its single input column."""
+
+    def fit(self, X, y):
+        self.classes_ = np.unique(y)
+        return self
+
+    def decision_function(self, X):
+        return np.asarray(X)[:, 0]
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def calibrate_scores(base_model, scores: np.ndarray, y: np.ndarray, method: str = "sigmoid") -> CalibratedClassifierCV:
+    """A fitted ``CalibratedClassifierCV`` around the frozen ``base_model``.
+
+    Equivalent to ``CalibratedClassifierCV(FrozenEstimator(base_model),
+    method).fit(X, y)`` but built from precomputed scores, so the base model
+    is not run again: the calibrator is fitted on a stand-in that passes the
+    scores through, which is then swapped for the base model.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    X_scores = scores.reshape(-1, 1)
+    calibrated = CalibratedClassifierCV(FrozenEstimator(_ScoreInput().fit(X_scores, y)), method=method)
+    calibrated.fit(X_scores, y)
+    frozen = FrozenEstimator(base_model)
+    calibrated.set_params(estimator=frozen)
+    for classifier in calibrated.calibrated_classifiers_:
+        classifier.estimator = frozen
+    if hasattr(base_model, "n_features_in_"):
+        calibrated.n_features_in_ = base_model.n_features_in_
+    if hasattr(base_model, "feature_names_in_"):
+        calibrated.feature_names_in_ = base_model.feature_names_in_
+    return calibrated
+
+
+def _calibration_summary(y: np.ndarray, probs: np.ndarray) -> Dict[str, float]:
+    return {**classification_metrics(y, probs), "mean_prediction": float(probs.mean())}
+
+
+def recalibrate(
+    data_path: str,
+    artifact_dir: Path = ARTIFACT_DIR,
+    method: str = "sigmoid",
+    cache_dir: Path | None = None,
+) -> Dict:
+    """Refit the calibrator on ``data_path`` and replace the served model; returns the new metadata."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    artifact_dir = Path(artifact_dir)
+    base_model_path = artifact_dir / "base_model.joblib"
+    model_path = artifact_dir / "model.joblib"
+    metadata_path = artifact_dir / "model_metadata.json"
+    if not base_model_path.exists():
+        raise FileNotFoundError(f"Base model artifact not found at {base_model_path}")
+    base_model = joblib.load(base_model_path)
+    scores, y = base_scores(base_model, base_model_path, data_path, cache_dir)
+    if len(np.unique(y)) < 2:
+        raise ValueError("Recalibration data must contain both readmitted and not-readmitted rows.")
+
+    previous = joblib.load(model_path) if model_path.exists() else None
+    previous_metadata = json.loads(metadata_path.read_text()) if metadata_path.exists() else {}
+
+    # compare old and new calibration on rows the new calibrator has not seen
+    fit_idx, holdout_idx = train_test_split(
+        np.arange(len(y)), test_size=HOLDOUT_FRACTION, stratify=y, random_state=42
+    )
+    candidate = calibrate_scores(base_model, scores[fit_idx], y[fit_idx], method)
+    holdout = {
+        "rows": int(len(holdout_idx)),
+        "recalibrated": _calibration_summary(y[holdout_idx], calibrated_proba_from_scores(candidate, scores[holdout_idx])),
+    }
+    if isinstance(previous, CalibratedClassifierCV):
+        holdout["previous"] = _calibration_summary(y[holdout_idx], calibrated_proba_from_scores(previous, scores[holdout_idx]))
+
+    # the served calibrator uses every row
+    calibrated = calibrate_scores(base_model, scores, y, method)
+
+    now = datetime.now(timezone.utc)
+    backend = previous_metadata.get("backend", "gbm")
+    version = f"{backend}-recalibrated-{now.strftime('%Y%m%d%H%M%S')}"
+    metadata = {
+        **previous_metadata,
+        "model_version": version,
+        "lineage": extend_lineage(
+            previous_metadata,
+            {"model_version": version, "mode": "recalibrate", "date": now.strftime("%Y-%m-%d"), "method": method, "rows": int(len(y))},
+        ),
+        "recalibration": {
+            "date": now.strftime("%Y-%m-%d"),
+            "method": method,
+            "data": str(data_path),
+            "rows": int(len(y)),
+            "positive_rate": float(y.mean()),
+            "previous_version": previous_metadata.get("model_version"),
+            "holdout": holdout,
+        },
+    }
+
+    # the summary of an earlier incremental update describes a different model
+    metadata.pop("incremental", None)
+    install_model(artifact_dir, metadata, previous_metadata.get("model_version"), calibrated)
+    return metadata
+
+
+def install_model(
+    artifact_dir: Path,
+    metadata: Dict,
+    previous_version: str | None,
+    model,
+    base_model=None,
+    reference: Dict | None = None,
+) -> None:
+    """Archive the current model files under ``archive/`` and swap in the new ones.
+
+    Each file is replaced with a single rename, so a server loading it in
+    between sees either the old or the new version. ``reference`` replaces
+    ``feature_reference.json`` and ``metadata`` replaces
+    ``model_metadata.json`` the same way.
+    """
+    archive_dir = artifact_dir / "archive"
+    suffix = previous_version or "unknown"
+    artifacts = {"model": model, "base_model": base_model}
+    for name, obj in artifacts.items():
+        if obj is None:
+            continue
+        path = artifact_dir / f"{name}.joblib"
+        if path.exists():
+            archive_dir.mkdir(exist_ok=True)
+            shutil.copy2(path, archive_dir / f"{name}-{suffix}.joblib")
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump(obj, tmp_path)
+        tmp_path.replace(path)
+    if reference is not None:
+        path = artifact_dir / "feature_reference.json"
+        if path.exists():
+            archive_dir.mkdir(exist_ok=True)
+            shutil.copy2(path, archive_dir / f"feature_reference-{suffix}.json")
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(reference, indent=2))
+        tmp_path.replace(path)
+    path = artifact_dir / "model_metadata.json"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(metadata, indent=2))
+    tmp_path.replace(path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refit the calibrator of the trained model on new labeled data")
+    parser.add_argument("--data", required=True, help="Path to a labeled CSV or Parquet file")
+    parser.add_argument("--artifacts", default=str(ARTIFACT_DIR), help="Directory holding base_model.joblib")
+    parser.add_argument("--method", choices=METHODS, default="sigmoid", help="Calibration map to fit")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    metadata = recalibrate(args.data, Path(args.artifacts), args.method)
+    print(json.dumps({"model_version": metadata["model_version"], **metadata["recalibration"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
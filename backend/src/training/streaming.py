@@ -0,0 +1,215 @@
+"""Constant-memory evaluation over datasets larger than RAM.
+
+The dataset is read and scored chunk by chunk. Each chunk only updates
+fixed-size score histograms: label counts plus sums of p and (p - y)**2 per
+score bin, per sensitive group. Every metric is computed from those at the
+end, so memory depends on the bin grid and the number of groups, not on the
+number of rows:
+- Brier, ECE and the calibration curve are exact
+- TPR/FPR and fairness gaps are exact at grid edges (0.5 and every
+  fairness-curve threshold are edges)
+- AUROC and AUPRC count scores sharing a bin as ties, which is exact unless
+  a bin holds two distinct scores; the AUROC error bound is reported
+- the top-15% threshold is the lower edge of the bin holding the 85th
+  percentile
+
+Permutation importance, intersectional cells and bootstrap intervals need the
+rows themselves and stay in ``evaluate``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Hashable
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ..config import ARTIFACT_DIR
+from .data import FEATURE_COLUMNS, iter_data_chunks
+from .evaluate import AGE_BIN_MERGE
+from .fairness import CURVE_THRESHOLDS, GroupConfusion, compute_group_fairness, fairness_curve
+from .metrics import (
+    histogram_bin_ids,
+    histogram_calibration_curve,
+    histogram_metrics,
+    histogram_operating_point,
+    histogram_quantile,
+    score_grid,
+)
+
+STREAM_CHUNK_ROWS = 200_000
+STREAM_RESOLUTION = 10_000
+STREAM_ATTRIBUTES = ("race", "gender", "age")
+# same support rule as evaluate.compute_group_metrics
+MIN_GROUP_COUNT = 5
+
+
+class ScoreHistogram:
+    """Per-group label counts and score sums over a fixed bin grid."""
+
+    def __init__(self, edges: np.ndarray) -> None:
+        self.edges = edges
+        self.groups: Dict[Hashable, int] = {}
+        # rows: groups; columns: bins; planes: pos, neg, sum of p, sum of (p - y)**2
+        self.sums = np.zeros((4, 0, len(edges)))
+
+    def update(self, y_true, y_prob, groups=None, bin_ids: np.ndarray | None = None) -> None:
+        y = np.asarray(y_true, dtype=float)
+        p = np.asarray(y_prob, dtype=float)
+        if bin_ids is None:
+            bin_ids = histogram_bin_ids(self.edges, p)
+        if groups is None:
+            codes = np.zeros(len(p), dtype=np.int64)
+            labels = [None]
+        else:
+            codes, labels = _factorize(groups)
+        index = np.array([self._group_index(label) for label in labels], dtype=np.int64)
+        n_bins = len(self.edges)
+        flat = index[codes] * n_bins + bin_ids
+        size = self.sums.shape[1] * n_bins
+        for plane, weights in enumerate((y, 1.0 - y, p, (p - y) ** 2)):
+            self.sums[plane] += np.bincount(flat, weights=weights, minlength=size).reshape(-1, n_bins)
+
+    def _group_index(self, label) -> int:
+        if label not in self.groups:
+            self.groups[label] = len(self.groups)
+            self.sums = np.concatenate([self.sums, np.zeros((4, 1, len(self.edges)))], axis=1)
+        return self.groups[label]
+
+    def totals(self) -> np.ndarray:
+        """(pos, neg, sum_prob, sum_sq_error) summed over groups."""
+        return self.sums.sum(axis=1)
+
+    def group(self, label) -> np.ndarray:
+        return self.sums[:, self.groups[label]]
+
+    def sorted_groups(self):
+        return sorted(self.groups, key=str)
+
+
+def _factorize(values):
+    codes, labels = pd.factorize(np.asarray(values), use_na_sentinel=False)
+    return codes, labels.tolist()
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else value
+
+
+def _metrics(edges: np.ndarray, sums: np.ndarray) -> Dict[str, float | None]:
+    return {name: _optional(value) for name, value in histogram_metrics(edges, *sums).items()}
+
+
+def stream_evaluate(
+    data_path: str,
+    primary_model,
+    baseline_model=None,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    resolution: int = STREAM_RESOLUTION,
+) -> Dict:
+    """Evaluate fitted models over every row of ``data_path``, one chunk in memory at a time."""
+    edges = score_grid(resolution, exact_thresholds=np.r_[CURVE_THRESHOLDS, 0.5])
+    primary = {attribute: ScoreHistogram(edges) for attribute in STREAM_ATTRIBUTES}
+    baseline = ScoreHistogram(edges) if baseline_model is not None else None
+
+    n_rows = 0
+    for chunk in iter_data_chunks(data_path, chunk_rows):
+        X = chunk.X[FEATURE_COLUMNS]
+        y = chunk.y.to_numpy()
+        probs = primary_model.predict_proba(X)[:, 1]
+        bin_ids = histogram_bin_ids(edges, probs)
+        groups = {
+            "race": X["race"].astype(str),
+            "gender": X["gender"].astype(str),
+            "age": X["age"].astype(str).replace(AGE_BIN_MERGE),
+        }
+        for attribute, histogram in primary.items():
+            histogram.update(y, probs, groups[attribute].to_numpy(), bin_ids=bin_ids)
+        if baseline is not None:
+            baseline.update(y, baseline_model.predict_proba(X)[:, 1])
+        n_rows += len(y)
+
+    if n_rows == 0:
+        raise ValueError(f"No rows in {data_path}")
+
+    totals = primary["race"].totals()
+    pos, neg, sum_prob = totals[0], totals[1], totals[2]
+    top_15_threshold = histogram_quantile(edges, pos + neg, 0.85)
+    # fairness.default_threshold, with the 0.01 floor (a grid edge)
+    fairness_threshold = max(top_15_threshold, 0.01)
+
+    metrics = {"primary": _metrics(edges, totals)}
+    if baseline is not None:
+        metrics["baseline"] = _metrics(edges, baseline.totals())
+
+    subgroup_performance = {}
+    fairness = {}
+    fairness_curves = {}
+    for attribute, histogram in primary.items():
+        labels = histogram.sorted_groups()
+        by_group = {}
+        for label in labels:
+            sums = histogram.group(label)
+            count = int(sums[0].sum() + sums[1].sum())
+            n_positive = int(sums[0].sum())
+            by_group[label] = {
+                "count": count,
+                "positive_rate": n_positive / count if count else 0.0,
+                "metrics": _metrics(edges, sums) if count >= MIN_GROUP_COUNT and 0 < n_positive < count else None,
+            }
+        subgroup_performance[attribute] = by_group
+
+        indices = [histogram.groups[label] for label in labels]
+        confusion = GroupConfusion.from_histograms(labels, edges, histogram.sums[0, indices], histogram.sums[1, indices])
+        fairness[attribute] = compute_group_fairness(None, None, None, threshold=fairness_threshold, confusion=confusion)
+        fairness_curves[attribute] = fairness_curve(None, None, None, thresholds=CURVE_THRESHOLDS, confusion=confusion)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "rows": n_rows,
+        "resolution": resolution,
+        "metrics": metrics,
+        "operating_points": {
+            "threshold_0_5": histogram_operating_point(edges, pos, neg, 0.5),
+            "top_15_percent": histogram_operating_point(edges, pos, neg, top_15_threshold),
+        },
+        "calibration_curve": histogram_calibration_curve(edges, pos, neg, sum_prob),
+        "subgroup_performance": subgroup_performance,
+        "fairness": {"metrics": fairness, "curves": fairness_curves},
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate Discharge Compass models over a dataset larger than memory")
+    parser.add_argument("--data", required=True, help="Path to CSV or Parquet dataset")
+    parser.add_argument("--artifacts", default=str(ARTIFACT_DIR), help="Directory with model.joblib")
+    parser.add_argument("--baseline-model", default=None, help="Optional fitted baseline model to score alongside")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS)
+    parser.add_argument("--resolution", type=int, default=STREAM_RESOLUTION, help="Score histogram bins on [0, 1]")
+    parser.add_argument("--output", default=None, help="Report path (default: <artifacts>/stream_eval_metrics.json)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    artifact_dir = Path(args.artifacts)
+    baseline_model = joblib.load(args.baseline_model) if args.baseline_model else None
+    report = stream_evaluate(
+        args.data,
+        joblib.load(artifact_dir / "model.joblib"),
+        baseline_model=baseline_model,
+        chunk_rows=args.chunk_rows,
+        resolution=args.resolution,
+    )
+    output = Path(args.output) if args.output else artifact_dir / "stream_eval_metrics.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as handle:
+        json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Intersectional subgroup metrics in one vectorized pass.
+
+Attributes are combined into a single cell code, and rows are sorted once by
+(cell, score), which gives every cell a contiguous segment of sorted scores.
+Counts, positive rates, ECE, Mann-Whitney AUROC (average ranks within the
+segment, ties shared) and TPR/FPR at any threshold are then computed with
+bincounts and searchsorted over those segments. No Python-level loop runs
+over cells, so hundreds of cells over millions of rows stay cheap.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Minimum-support rules: cells smaller than this report counts only, and
+# AUROC additionally needs this many cases of each class.
+MIN_CELL_COUNT = 30
+MIN_CELL_CLASS_COUNT = 5
+ECE_BINS = 10
+
+
+@dataclass
+class SubgroupEngine:
+    attributes: List[str]
+    labels: List[Tuple]
+    codes: np.ndarray
+    order: np.ndarray
+    sorted_codes: np.ndarray
+    sorted_keys: np.ndarray
+    sorted_y: np.ndarray
+    seg_start: np.ndarray
+    seg_end: np.ndarray
+    unique_scores: np.ndarray
+    y: np.ndarray
+    scores: np.ndarray
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, attributes: Sequence[str], y_true, y_prob) -> "SubgroupEngine":
+        y = np.asarray(y_true).astype(np.int64)
+        scores = np.asarray(y_prob, dtype=float)
+
+        # mixed-radix code over the attributes, then compacted to observed cells
+        combined = np.zeros(len(frame), dtype=np.int64)
+        levels = []
+        for attribute in attributes:
+            codes, uniques = pd.factorize(frame[attribute].to_numpy(), sort=True, use_na_sentinel=False)
+            combined = combined * len(uniques) + codes
+            levels.append(np.asarray(uniques, dtype=object))
+        observed, codes = np.unique(combined, return_inverse=True)
+        labels = []
+        for value in observed.tolist():
+            parts = []
+            for uniques in reversed(levels):
+                value, idx = divmod(value, len(uniques))
+                parts.append(uniques[idx])
+            labels.append(tuple(reversed(parts)))
+
+        # integer sort key (cell, dense score rank) keeps ties exact
+        unique_scores, score_rank = np.unique(scores, return_inverse=True)
+        radix = len(unique_scores) + 1
+        keys = codes.astype(np.int64) * radix + score_rank
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        cells = np.arange(len(observed), dtype=np.int64)
+        return cls(
+            attributes=list(attributes),
+            labels=labels,
+            codes=codes,
+            order=order,
+            sorted_codes=codes[order],
+            sorted_keys=sorted_keys,
+            sorted_y=y[order],
+            seg_start=np.searchsorted(sorted_keys, cells * radix, side="left"),
+            seg_end=np.searchsorted(sorted_keys, (cells + 1) * radix, side="left"),
+            unique_scores=unique_scores,
+            y=y,
+            scores=scores,
+        )
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.labels)
+
+    def counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        n = self.seg_end - self.seg_start
+        n_positive = np.bincount(self.codes, weights=self.y, minlength=self.n_cells).astype(np.int64)
+        return n, n_positive
+
+    def auroc(self) -> np.ndarray:
+        """Mann-Whitney AUROC per cell; NaN where a class is absent."""
+        n, n_positive = self.counts()
+        n_negative = n - n_positive
+        total = len(self.sorted_keys)
+        if total == 0:
+            return np.full(self.n_cells, np.nan)
+        # runs of equal (cell, score) share the average of their ranks
+        starts = np.flatnonzero(np.r_[True, self.sorted_keys[1:] != self.sorted_keys[:-1]])
+        ends = np.r_[starts[1:], total] - 1
+        run_cells = self.sorted_codes[starts]
+        run_rank = (starts + ends) / 2.0 - self.seg_start[run_cells] + 1
+        run_id = np.repeat(np.arange(len(starts)), ends - starts + 1)
+        ranks = run_rank[run_id]
+        positive_rank_sum = np.bincount(self.sorted_codes, weights=ranks * self.sorted_y, minlength=self.n_cells)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            auc = (positive_rank_sum - n_positive * (n_positive + 1) / 2.0) / (n_positive * n_negative)
+        return np.where((n_positive > 0) & (n_negative > 0), auc, np.nan)
+
+    def ece(self, n_bins: int = ECE_BINS) -> np.ndarray:
+        """Expected calibration error per cell, binned like ``metrics.expected_calibration_error``."""
+        n, _ = self.counts()
+        bins = np.linspace(0.0, 1.0, n_bins + 1)
+        bin_ids = np.digitize(self.scores, bins) - 1
+        valid = (bin_ids >= 0) & (bin_ids < n_bins)
+        flat = self.codes[valid] * n_bins + bin_ids[valid]
+        size = self.n_cells * n_bins
+        sum_p = np.bincount(flat, weights=self.scores[valid], minlength=size)
+        sum_y = np.bincount(flat, weights=self.y[valid], minlength=size)
+        # (count_b / n) * |mean_p_b - mean_y_b| == |sum_p_b - sum_y_b| / n
+        gaps = np.abs(sum_p - sum_y).reshape(self.n_cells, n_bins).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(n > 0, gaps / np.maximum(n, 1), np.nan)
+
+    def rates(self, thresholds) -> Dict[str, np.ndarray]:
+        """TPR and FPR per (cell, threshold) for predictions ``score >= threshold``."""
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        radix = len(self.unique_scores) + 1
+        threshold_rank = np.searchsorted(self.unique_scores, thresholds, side="left")
+        cells = np.arange(self.n_cells, dtype=np.int64)
+        queries = cells[:, None] * radix + threshold_rank[None, :]
+        first_positive = np.searchsorted(self.sorted_keys, queries.ravel(), side="left").reshape(queries.shape)
+        cum_y = np.r_[0, np.cumsum(self.sorted_y)]
+        end = self.seg_end[:, None]
+        predicted = end - first_positive
+        tp = cum_y[end] - cum_y[first_positive]
+        fp = predicted - tp
+        n, n_positive = self.counts()
+        n_negative = n - n_positive
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tpr = np.where(n_positive[:, None] > 0, tp / np.maximum(n_positive, 1)[:, None], np.nan)
+            fpr = np.where(n_negative[:, None] > 0, fp / np.maximum(n_negative, 1)[:, None], np.nan)
+        return {"tpr": tpr, "fpr": fpr}
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def subgroup_report(
+    frame: pd.DataFrame,
+    attributes: Sequence[str],
+    y_true,
+    y_prob,
+    thresholds: Dict[str, float],
+    min_count: int = MIN_CELL_COUNT,
+    min_class_count: int = MIN_CELL_CLASS_COUNT,
+) -> Dict:
+    """Metrics for every observed combination of ``attributes``.
+
+    Cells below ``min_count`` rows report their count only; AUROC also needs
+    ``min_class_count`` positives and negatives.
+    """
+    engine = SubgroupEngine.build(frame, attributes, y_true, y_prob)
+    n, n_positive = engine.counts()
+    n_negative = n - n_positive
+    auroc = engine.auroc()
+    ece = engine.ece()
+    names = list(thresholds)
+    rates = engine.rates([thresholds[name] for name in names])
+
+    supported = n >= min_count
+    auroc_supported = supported & (n_positive >= min_class_count) & (n_negative >= min_class_count)
+    cells = []
+    for idx, label in enumerate(engine.labels):
+        cell = {
+            "groups": {attribute: str(value) for attribute, value in zip(attributes, label)},
+            "count": int(n[idx]),
+            "supported": bool(supported[idx]),
+        }
+        if supported[idx]:
+            cell["positive_rate"] = float(n_positive[idx] / n[idx])
+            cell["ece"] = _optional(ece[idx])
+            cell["auroc"] = _optional(auroc[idx]) if auroc_supported[idx] else None
+            cell["operating_points"] = {
+                name: {"tpr": _optional(rates["tpr"][idx, j]), "fpr": _optional(rates["fpr"][idx, j])}
+                for j, name in enumerate(names)
+            }
+        cells.append(cell)
+
+    return {
+        "attributes": list(attributes),
+        "cells": cells,
+        "n_cells": engine.n_cells,
+        "n_supported": int(supported.sum()),
+        "min_count": min_count,
+        "min_class_count": min_class_count,
+    }
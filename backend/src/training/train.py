@@ -4,36 +4,94 @@ import argparse
 import json
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 import joblib
-
-from ..config import ARTIFACT_DIR
-from .data import FEATURE_COLUMNS, compute_reference_values, load_data, sample_background
-from .pipeline import fit_primary_with_calibration
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.pipeline import Pipeline
+
+from ..config import ARTIFACT_DIR, MODEL_BACKEND
+from ..monitoring import build_drift_profile
+from .data import (
+    CATEGORICAL_COLUMNS,
+    FEATURE_COLUMNS,
+    NUMERIC_COLUMNS,
+    compute_reference_values,
+    load_data,
+    sample_background,
+)
+from .pipeline import (
+    BACKENDS,
+    fit_primary_with_calibration,
+    load_tuned_params,
+    positive_proba_from_encoded,
+    unwrap_pipeline,
+)
 from .split import split_dataset
 
+# most recent model versions kept in model_metadata.json's lineage
+LINEAGE_MAX = 50
+
+
+def extend_lineage(previous_metadata: Dict, entry: Dict) -> List[Dict]:
+    """``previous_metadata``'s lineage with ``entry`` (the new model version) appended."""
+    lineage = list(previous_metadata.get("lineage") or [])
+    if not lineage and previous_metadata.get("model_version"):
+        lineage.append({"model_version": previous_metadata["model_version"], "mode": "full"})
+    return (lineage + [entry])[-LINEAGE_MAX:]
+
+
+def build_reference(X_train, calibrated_model) -> Dict:
+    """``feature_reference.json`` contents: reference values plus the drift profile."""
+    reference = compute_reference_values(X_train)
+    # encode once instead of once per calibrated fold
+    train_scores = positive_proba_from_encoded(calibrated_model, unwrap_pipeline(calibrated_model)[:-1].transform(X_train))
+    reference["drift_profile"] = build_drift_profile(X_train, train_scores, CATEGORICAL_COLUMNS, NUMERIC_COLUMNS)
+    return reference
+
 
-def train(data_path: str, artifact_dir: Path) -> None:
+def train(data_path: str, artifact_dir: Path, backend: str = MODEL_BACKEND) -> None:
     dataset = load_data(data_path)
-    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(dataset)
+    train_from_splits(split_dataset(dataset), artifact_dir, backend)
 
-    base_model, calibrated_model = fit_primary_with_calibration(X_train, y_train, X_val, y_val)
+
+def train_from_splits(
+    splits,
+    artifact_dir: Path,
+    backend: str = MODEL_BACKEND,
+) -> Tuple[Pipeline, CalibratedClassifierCV]:
+    """Fit and persist the primary model on already-split data; returns (base, calibrated).
+
+    Hyperparameters written to ``artifact_dir`` by ``training.tune`` for the
+    same backend replace the defaults.
+    """
+    X_train, X_val, X_test, y_train, y_val, y_test = splits
+
+    params = load_tuned_params(artifact_dir, backend)
+    base_model, calibrated_model = fit_primary_with_calibration(
+        X_train, y_train, X_val, y_val, backend, params=params
+    )
 
     artifact_dir.mkdir(parents=True, exist_ok=True)
     joblib.dump(calibrated_model, artifact_dir / "model.joblib")
     joblib.dump(base_model, artifact_dir / "base_model.joblib")
 
-    reference = compute_reference_values(X_train)
     with (artifact_dir / "feature_reference.json").open("w") as handle:
-        json.dump(reference, handle, indent=2)
+        json.dump(build_reference(X_train, calibrated_model), handle, indent=2)
 
     background = sample_background(X_train)
     background.to_csv(artifact_dir / "background_sample.csv", index=False)
 
+    version = f"{backend}-calibrated-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M')}"
+    training_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     metadata = {
-        "model_version": f"gbm-calibrated-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M')}",
-        "training_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "model_version": version,
+        "training_date": training_date,
         "feature_list": FEATURE_COLUMNS,
+        "backend": backend,
+        "tuned_params": params,
+        # a full retrain starts a new chain of versions
+        "lineage": [{"model_version": version, "mode": "full", "date": training_date, "train_rows": int(len(X_train))}],
     }
     with (artifact_dir / "model_metadata.json").open("w") as handle:
         json.dump(metadata, handle, indent=2)
@@ -47,6 +105,8 @@ def train(data_path: str, artifact_dir: Path) -> None:
     with (artifact_dir / "split_summary.json").open("w") as handle:
         json.dump(split_info, handle, indent=2)
 
+    return base_model, calibrated_model
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Train Discharge Compass model")
@@ -56,12 +116,13 @@ def parse_args() -> argparse.Namespace:
         default=str(ARTIFACT_DIR),
         help="Directory to write artifacts",
     )
+    parser.add_argument("--backend", choices=BACKENDS, default=MODEL_BACKEND, help="Primary model implementation")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    train(args.data, Path(args.artifacts))
+    train(args.data, Path(args.artifacts), args.backend)
 
 
 if __name__ == "__main__":
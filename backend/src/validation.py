@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
 
 RACE_VALUES = {"Caucasian", "AfricanAmerican", "Asian", "Hispanic", "Other", "Unknown"}
 GENDER_VALUES = {"Male", "Female", "Unknown/Invalid"}
@@ -61,3 +65,106 @@ def validate_features(payload: Dict) -> None:
             raise ValueError(f"{feature} must be >= {low}")
         if value > high:
             raise ValueError(f"{feature} must be <= {high}")
+
+
+CATEGORY_VALUES = {
+    "race": RACE_VALUES,
+    "gender": GENDER_VALUES,
+    "age": AGE_VALUES,
+    "A1Cresult": A1C_VALUES,
+    "metformin": MED_STATUS_VALUES,
+    "insulin": MED_STATUS_VALUES,
+    "change": MED_CHANGE_VALUES,
+    "diabetesMed": DIABETES_MED_VALUES,
+}
+
+
+@dataclass
+class FrameValidation:
+    valid_mask: np.ndarray
+    errors: List[Dict]
+
+    @property
+    def n_invalid(self) -> int:
+        return int((~self.valid_mask).sum())
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    max_errors: int | None = None,
+    row_offset: int = 0,
+    row_numbers: np.ndarray | None = None,
+) -> FrameValidation:
+    """Validate every row of a batch at once.
+
+    Applies the same rules as ``validate_features`` column by column using
+    vectorized masks, so numeric columns may still hold the raw parsed
+    values. Errors are reported per cell with 1-based row numbers, shifted
+    by ``row_offset`` when validating one chunk of a larger upload, or taken
+    from ``row_numbers`` when the chunk's rows are not contiguous.
+    """
+    n_rows = len(df)
+    invalid = np.zeros(n_rows, dtype=bool)
+    cell_errors: List[Tuple[np.ndarray, str, str]] = []
+
+    for feature, allowed in CATEGORY_VALUES.items():
+        bad = ~df[feature].isin(allowed).to_numpy()
+        if bad.any():
+            invalid |= bad
+            cell_errors.append((bad, feature, f"{feature} must be one of the allowed categories"))
+
+    for feature, (low, high) in NUMERIC_RANGES.items():
+        raw = df[feature]
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        missing = raw.isna().to_numpy()
+        not_numeric = np.isnan(values) & ~missing
+        with np.errstate(invalid="ignore"):
+            too_low = values < low
+            too_high = values > high
+        # every numeric feature is a count or an id, scored as an integer
+        fractional = np.isfinite(values) & (values != np.round(values))
+        for bad, message in (
+            (missing, f"{feature} is required"),
+            (not_numeric, f"{feature} must be a number"),
+            (fractional, f"{feature} must be a whole number"),
+            (too_low, f"{feature} must be >= {low}"),
+            (too_high, f"{feature} must be <= {high}"),
+        ):
+            if bad.any():
+                invalid |= bad
+                cell_errors.append((bad, feature, message))
+
+    if not cell_errors:
+        return FrameValidation(valid_mask=~invalid, errors=[])
+
+    # order cell errors by row without materialising one dict per bad cell
+    rows = np.concatenate([np.flatnonzero(bad) for bad, _, _ in cell_errors])
+    which = np.concatenate([np.full(int(bad.sum()), idx) for idx, (bad, _, _) in enumerate(cell_errors)])
+    order = np.argsort(rows, kind="stable")
+    if max_errors is not None:
+        order = order[:max_errors]
+
+    if row_numbers is None:
+        row_numbers = np.arange(n_rows) + row_offset + 1
+    errors: List[Dict] = []
+    for row, idx in zip(rows[order].tolist(), which[order].tolist()):
+        _, feature, message = cell_errors[idx]
+        errors.append(
+            {
+                "row": int(row_numbers[row]),
+                "column": feature,
+                "value": _jsonable(df[feature].iat[row]),
+                "message": message,
+            }
+        )
+    return FrameValidation(valid_mask=~invalid, errors=errors)
+
+
+def _jsonable(value):
+    if value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
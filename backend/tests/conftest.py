@@ -0,0 +1,15 @@
+import pytest
+
+from backend.src import config
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_cache(tmp_path, monkeypatch):
+    """Point the cleaned-data and score caches at the test's tmp_path instead of backend/data/cache.
+
+    The environment variable covers config reloads and subprocesses.
+    """
+    cache_dir = tmp_path / "data-cache"
+    monkeypatch.setenv("DATA_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(config, "DATA_CACHE_DIR", cache_dir)
+    return cache_dir
@@ -0,0 +1,105 @@
+import io
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from backend.src import database
+from backend.src.audit import AUDIT_RECORDS, AuditLog, FileSink, SqliteSink, read_audit_files
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+
+def test_file_sink_rotates_and_replays_in_order(tmp_path):
+    log = AuditLog(FileSink(tmp_path, max_bytes=2000), lambda: "v1", batch_size=10**6, flush_seconds=60)
+    for i in range(40):
+        log.record_prediction(f"id-{i}", {**VALID_PAYLOAD, "num_medications": i}, {"probability": i / 40, "top_features": []})
+        if i % 10 == 9:
+            assert log.flush() == 10
+    frame = pd.DataFrame([VALID_PAYLOAD] * 3)
+    log.record_batch(frame, np.array([0.1, 0.2, 0.3]), np.array(["b-0", "b-1", "b-2"]))
+    log.stop()
+
+    assert len(list(tmp_path.glob("audit-*.jsonl.gz"))) > 1
+    records = list(read_audit_files(tmp_path))
+    assert [r["prediction_id"] for r in records] == [f"id-{i}" for i in range(40)] + ["b-0", "b-1", "b-2"]
+    assert records[7]["inputs"]["num_medications"] == 7
+    assert records[-1]["probability"] == 0.3
+    assert {r["model_version"] for r in records} == {"v1"}
+
+
+def test_replay_skips_truncated_tail(tmp_path):
+    log = AuditLog(FileSink(tmp_path), lambda: "v1", flush_seconds=60)
+    for i in range(5):
+        log.record_prediction(f"id-{i}", VALID_PAYLOAD, {"probability": 0.5})
+        log.flush()
+    segment = next(tmp_path.glob("audit-*.jsonl.gz"))
+    data = segment.read_bytes()
+    segment.write_bytes(data[:-7])
+    log.stop()
+
+    assert [r["prediction_id"] for r in read_audit_files(tmp_path)] == [f"id-{i}" for i in range(4)]
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    log = AuditLog(FileSink(tmp_path), lambda: "v1", max_queue=5, batch_size=10**6, flush_seconds=60)
+    dropped = AUDIT_RECORDS.value("dropped")
+    for i in range(8):
+        log.record_prediction(f"id-{i}", VALID_PAYLOAD, {"probability": 0.5})
+    log.record_batch(pd.DataFrame([VALID_PAYLOAD] * 2), [0.1, 0.2], ["b-0", "b-1"])
+    assert log.queue_depth() == 5
+    assert AUDIT_RECORDS.value("dropped") - dropped == 5
+    log.stop()
+    assert len(list(read_audit_files(tmp_path))) == 5
+
+
+def test_sqlite_sink_writes_one_row_per_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "audit.db")
+    monkeypatch.setattr(database, "_conn", None)
+    database.init_db()
+    log = AuditLog(SqliteSink(), lambda: "v1", flush_seconds=60)
+    log.record_batch(pd.DataFrame([VALID_PAYLOAD] * 4), np.full(4, 0.25), [f"b-{i}" for i in range(4)])
+    log.stop()
+
+    rows = database.get_conn().execute("SELECT record_json FROM audit_log ORDER BY id").fetchall()
+    assert [json.loads(row["record_json"])["prediction_id"] for row in rows] == [f"b-{i}" for i in range(4)]
+
+
+def test_sqlite_sink_does_not_commit_request_transactions(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "audit.db")
+    monkeypatch.setattr(database, "_conn", None)
+    database.init_db()
+    shared = database.get_conn()
+    # a request handler mid-transaction on the shared connection
+    shared.execute("INSERT INTO users (email, name, password_hash, created_at) VALUES ('a@b.c', 'A', 'x', 'now')")
+    writer = threading.Thread(target=SqliteSink().write, args=(['{"prediction_id": "p-1"}'],))
+    writer.start()
+    # the sink waits on SQLite's write lock instead of joining this transaction
+    writer.join(timeout=0.3)
+    shared.rollback()
+    writer.join()
+
+    assert shared.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+    assert shared.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0] == 1
+
+
+def test_endpoints_audit_every_prediction(tmp_path, monkeypatch):
+    client = build_client(tmp_path, monkeypatch)
+    import backend.src.main as main
+
+    single = client.post("/predict", json=VALID_PAYLOAD).json()
+    frame = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "gender": "Male"}])
+    batch = client.post(
+        "/predict-batch", files={"file": ("rows.csv", io.BytesIO(frame.to_csv(index=False).encode()), "text/csv")}
+    ).json()
+    assert 'dc_queue_depth{queue="audit"}' in client.get("/metrics-runtime").text
+    main.audit_log.stop()
+
+    records = {r["prediction_id"]: r for r in read_audit_files(tmp_path / "audit")}
+    assert set(records) == {single["prediction_id"]} | {row["prediction_id"] for row in batch["results"]}
+    assert records[single["prediction_id"]]["top_features"] == single["top_features"]
+    assert records[batch["results"][1]["prediction_id"]]["inputs"]["gender"] == "Male"
+    batch_record = records[batch["results"][1]["prediction_id"]]
+    assert set(batch_record) == set(records[single["prediction_id"]])
+    assert batch_record["risk_tier"] == batch["results"][1]["risk_tier"]
+    assert batch_record["top_features"] is None
@@ -0,0 +1,95 @@
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from backend.src.batch_io import REQUIRED_COLUMNS, BatchParseError, MissingColumnsError, iter_batch_chunks, iter_xlsx_chunks
+from backend.tests.test_predict import VALID_PAYLOAD
+
+
+def make_workbook(rows, columns=REQUIRED_COLUMNS) -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append([f" {col} " for col in columns])
+    for row in rows:
+        sheet.append([row[col] for col in columns])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_iter_xlsx_chunks_streams_typed_chunks():
+    contents = make_workbook([VALID_PAYLOAD] * 5)
+    chunks = list(iter_xlsx_chunks(contents, chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[1].index.tolist() == [2, 3]
+    assert list(chunks[0].columns) == REQUIRED_COLUMNS
+    assert str(chunks[0]["race"].dtype) == "string"
+    assert chunks[0]["time_in_hospital"].dtype.kind == "i"
+
+
+def test_iter_xlsx_chunks_checks_header():
+    contents = make_workbook([VALID_PAYLOAD], columns=REQUIRED_COLUMNS[:-1])
+    with pytest.raises(MissingColumnsError) as exc_info:
+        next(iter_xlsx_chunks(contents, chunk_rows=2))
+    assert exc_info.value.missing == ["diabetesMed"]
+
+
+def read_csv(contents: bytes, chunk_rows: int = 1000) -> pd.DataFrame:
+    return pd.concat(list(iter_batch_chunks("batch.csv", contents, chunk_rows)))
+
+
+def test_read_csv_pins_column_types():
+    rows = [{**VALID_PAYLOAD, "A1Cresult": "None"}, {**VALID_PAYLOAD, "num_procedures": None}]
+    df = read_csv(pd.DataFrame(rows).to_csv(index=False).encode())
+    assert df["A1Cresult"].tolist() == ["None", ">7"] and str(df["A1Cresult"].dtype) == "string"
+    assert df["num_procedures"].dtype == "float64" and df["num_procedures"].isna().tolist() == [False, True]
+
+
+def test_read_csv_keeps_text_in_numeric_columns_for_validation():
+    rows = [VALID_PAYLOAD, {**VALID_PAYLOAD, "time_in_hospital": "abc"}]
+    df = read_csv(pd.DataFrame(rows).to_csv(index=False).encode())
+    assert df["time_in_hospital"].tolist()[1] == "abc"
+
+
+def test_read_csv_reports_malformed_files():
+    contents = pd.DataFrame([VALID_PAYLOAD]).to_csv(index=False).encode() + b",".join([b"x"] * 19) + b"\n"
+    with pytest.raises(BatchParseError, match="Expected 18 fields"):
+        read_csv(contents)
+
+
+def test_iter_xlsx_chunks_counts_blank_rows():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(REQUIRED_COLUMNS)
+    sheet.append([VALID_PAYLOAD[col] for col in REQUIRED_COLUMNS])
+    sheet.append([None] * len(REQUIRED_COLUMNS))
+    sheet.append([VALID_PAYLOAD[col] for col in REQUIRED_COLUMNS])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    chunks = list(iter_xlsx_chunks(buffer.getvalue(), chunk_rows=10))
+    assert chunks[0].index.tolist() == [0, 2]
+
+
+def test_csv_falls_back_after_streamed_chunks():
+    rows = [VALID_PAYLOAD] * 5 + [{**VALID_PAYLOAD, "time_in_hospital": "abc"}]
+    contents = pd.DataFrame(rows).to_csv(index=False).encode()
+    chunks = list(iter_batch_chunks("batch.csv", contents, chunk_rows=2))
+    df = pd.concat(chunks)
+    assert df.index.tolist() == list(range(6))
+    assert df["time_in_hospital"].tolist()[-1] == "abc"
+
+
+@pytest.mark.parametrize("filename", ["batch.parquet", "batch.arrow"])
+def test_columnar_uploads_stream_in_chunks(filename):
+    frame = pd.DataFrame([VALID_PAYLOAD] * 5)
+    buffer = io.BytesIO()
+    if filename.endswith(".parquet"):
+        frame.to_parquet(buffer, index=False)
+    else:
+        frame.to_feather(buffer)
+    buffer.seek(0)
+    chunks = list(iter_batch_chunks(filename, buffer, chunk_rows=2))
+    assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+    assert list(chunks[0].columns) == REQUIRED_COLUMNS
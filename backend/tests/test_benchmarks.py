@@ -0,0 +1,94 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from backend.benchmarks.compare import compare
+from backend.benchmarks.harness import measure, synthetic_frame
+from backend.src.validation import validate_frame
+
+
+def test_synthetic_frame_is_deterministic_and_valid():
+    first = synthetic_frame(200, seed=7, with_target=True)
+    second = synthetic_frame(200, seed=7, with_target=True)
+    assert first.equals(second)
+    assert validate_frame(first.drop(columns="readmitted")).n_invalid == 0
+
+
+def test_measure_reports_percentiles():
+    record = measure(lambda: sum(range(1000)), rows=1000, repeats=3)
+    assert set(record["latency_ms"]) == {"mean", "p50", "p95", "p99", "max"}
+    assert record["throughput_rows_per_s"] > 0
+
+
+def test_compare_flags_regressions():
+    def report(p50, throughput):
+        return {
+            "results": [
+                {
+                    "case": "predict_proba",
+                    "rows": 100,
+                    "latency_ms": {"p50": p50, "p95": p50},
+                    "peak_memory_mb": 1.0,
+                    "throughput_rows_per_s": throughput,
+                }
+            ]
+        }
+
+    rows = compare(report(10.0, 1000.0), report(13.0, 700.0), tolerance=0.1)
+    flagged = {row["metric"] for row in rows if row["regression"]}
+    assert flagged == {"latency_ms.p50", "latency_ms.p95", "throughput_rows_per_s"}
+    assert not any(row["regression"] for row in compare(report(10.0, 1000.0), report(10.5, 980.0)))
+
+
+def test_compare_without_baseline_exits_cleanly(tmp_path, monkeypatch, capsys):
+    from backend.benchmarks import compare as compare_module
+
+    current = tmp_path / "bench.json"
+    current.write_text(json.dumps({"results": []}))
+    monkeypatch.setattr(sys, "argv", ["compare", str(current), "--baseline", str(tmp_path / "missing.json")])
+    compare_module.main()
+    assert "make bench-baseline" in capsys.readouterr().err
+
+
+def test_loadtest_reports_per_request_latency(tmp_path, monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from backend.benchmarks.loadtest import parse_mix, run_load
+    from backend.src import database
+    from backend.tests.test_predict import build_client
+
+    build_client(tmp_path, monkeypatch)
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "loadtest.db")
+    monkeypatch.setattr(database, "_conn", None)
+    database.init_db()
+    from backend.src.main import app
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await run_load(client, parse_mix("predict=3,auth=1"), concurrency=2, duration=0.5, batch_rows=5)
+
+    report = asyncio.run(go())
+    assert report["overall"]["requests"] > 0
+    assert report["overall"]["errors"] == 0
+    assert set(report["by_request"]) == {"predict", "auth"}
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_benchmark_cli_runs_against_its_fixture(tmp_path):
+    # a fresh interpreter, so the config is first imported the way the CLI imports it
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.run", "--sizes", "1", "--cases", "predict",
+         "--repeats", "1", "--max-train-rows", "0", "--output", str(output)],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        timeout=300,
+    )
+    assert [record["case"] for record in json.loads(output.read_text())["results"]] == ["predict"]
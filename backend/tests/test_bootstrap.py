@@ -0,0 +1,44 @@
+import numpy as np
+from sklearn.metrics import average_precision_score, brier_score_loss, roc_auc_score
+
+from backend.src.training.bootstrap import _SortedSample, _metrics_from_counts, confidence_intervals
+from backend.src.training.metrics import calibration_curve_data, expected_calibration_error
+
+
+def test_replicate_metrics_match_sklearn_on_resamples():
+    rng = np.random.default_rng(0)
+    n = 500
+    y_true = (rng.random(n) < 0.3).astype(int)
+    # rounded scores so the resamples contain ties
+    y_prob = np.round(np.clip(0.3 * y_true + rng.random(n) * 0.7, 0, 1), 2)
+    sample = _SortedSample(y_true, y_prob)
+
+    indices = rng.integers(0, n, size=(3, n))
+    counts = np.stack([np.bincount(np.argsort(sample.order)[rows], minlength=n) for rows in indices])
+    metrics = _metrics_from_counts(sample, counts)
+    for i, rows in enumerate(indices):
+        y, p = y_true[rows], y_prob[rows]
+        assert abs(metrics["auroc"][i] - roc_auc_score(y, p)) < 1e-9
+        assert abs(metrics["auprc"][i] - average_precision_score(y, p)) < 1e-6
+        assert abs(metrics["brier"][i] - brier_score_loss(y, p)) < 1e-9
+        assert abs(metrics["ece"][i] - expected_calibration_error(y, p)) < 1e-9
+
+
+def test_confidence_intervals_bracket_point_estimate():
+    rng = np.random.default_rng(1)
+    y_true = (rng.random(2000) < 0.4).astype(int)
+    y_prob = np.clip(0.4 * y_true + rng.random(2000) * 0.6, 0, 1)
+
+    intervals = confidence_intervals(y_true, y_prob, n_replicates=200, n_jobs=1)
+
+    auroc = roc_auc_score(y_true, y_prob)
+    assert intervals["auroc"]["low"] < auroc < intervals["auroc"]["high"]
+    for metric in ("auprc", "brier", "ece"):
+        assert intervals[metric]["low"] <= intervals[metric]["high"]
+    assert confidence_intervals(y_true[:0], y_prob[:0])["auroc"] == {"low": None, "high": None}
+
+
+def test_calibration_curve_skips_empty_bins():
+    curve = calibration_curve_data(np.array([0, 1, 1]), np.array([0.05, 0.95, 1.0]))
+    assert [point["count"] for point in curve] == [1, 1]
+    assert curve[0]["bin_start"] == 0.0 and curve[1]["bin_end"] == 1.0
@@ -0,0 +1,114 @@
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.harness import synthetic_frame
+from backend.src import database
+from backend.src.audit import read_audit_files
+from backend.src.modeling import escalation_mask, risk_tier_codes, tiered_predict_proba
+from backend.src.training import orchestrate
+from backend.src.training.orchestrate import stage_keys
+from backend.src.training.data import FEATURE_COLUMNS, TARGET_COLUMN, Dataset, clean_frame
+from backend.src.training.distill import DistilledStudent, distill_from_splits, distillation_report
+from backend.src.training.pipeline import build_baseline_model
+from backend.src.training.split import split_dataset
+from backend.tests.test_feedback import use_temp_db
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+
+def synthetic_splits(rows: int = 6000):
+    frame = clean_frame(synthetic_frame(rows, seed=2, with_target=True))
+    return split_dataset(Dataset(X=frame[FEATURE_COLUMNS], y=frame[TARGET_COLUMN]))
+
+
+def test_student_escalates_only_rows_near_thresholds(tmp_path):
+    splits = synthetic_splits()
+    X_train, _, X_test, y_train, _, y_test = splits
+    teacher = build_baseline_model().fit(X_train, y_train)
+    student, report = distill_from_splits(splits, teacher, tmp_path, kind="trees", margin=0.05)
+    assert (tmp_path / "student_model.joblib").exists()
+
+    teacher_probs = teacher.predict_proba(X_test)[:, 1]
+    student_probs = student.predict_proba(X_test)[:, 1]
+    probs, escalated = tiered_predict_proba(X_test, 0.05, model=teacher, student=student)
+    np.testing.assert_allclose(probs[escalated], teacher_probs[escalated])
+    np.testing.assert_allclose(probs[~escalated], student_probs[~escalated])
+    assert report["escalated_fraction"] == escalated.mean()
+    assert report["tier_agreement"] == (risk_tier_codes(probs) == risk_tier_codes(teacher_probs)).mean()
+    assert report["tier_agreement"] >= report["student_tier_agreement"]
+    assert 0 < report["escalated_fraction"] < 1
+
+    # no margin never escalates; a margin spanning [0, 1] always does
+    assert distillation_report(student, teacher, X_test, y_test, margin=0.0)["escalated_fraction"] == 0.0
+    everything = distillation_report(student, teacher, X_test, y_test, margin=1.0)
+    assert everything["escalated_fraction"] == 1.0
+    assert everything["tier_agreement"] == 1.0
+
+
+def test_linear_student_tracks_teacher_logits():
+    X_train, _, X_test, y_train, _, _ = synthetic_splits()
+    teacher = build_baseline_model().fit(X_train, y_train)
+    student = DistilledStudent("linear").fit(X_train, teacher.predict_proba(X_train)[:, 1])
+    error = np.abs(student.predict_proba(X_test)[:, 1] - teacher.predict_proba(X_test)[:, 1])
+    assert error.mean() < 0.02
+
+
+def test_fast_batch_mode_reports_escalations(tmp_path, monkeypatch):
+    client = build_client(tmp_path, monkeypatch)
+    use_temp_db(tmp_path, monkeypatch)
+    import backend.src.main as main
+
+    teacher = joblib.load(tmp_path / "model.joblib")
+    rows = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "gender": "Male", "time_in_hospital": 9}] * 5)
+    targets = np.tile([0.05, 0.9], 5)
+    student = DistilledStudent("linear").fit(rows[FEATURE_COLUMNS], targets, teacher_version="test")
+    joblib.dump(student, tmp_path / "student_model.joblib")
+    full = teacher.predict_proba(rows[FEATURE_COLUMNS])[:, 1]
+    fast = student.predict_proba(rows[FEATURE_COLUMNS])[:, 1]
+    kept = ~escalation_mask(fast)
+    assert kept.any()
+
+    def upload(**params):
+        files = {"file": ("rows.csv", io.BytesIO(rows.to_csv(index=False).encode()), "text/csv")}
+        return client.post("/predict-batch", params=params, files=files).json()
+
+    body = upload(fast=True)
+    assert body["summary"]["escalated"] == int((~kept).sum())
+    expected = np.where(kept, fast, full)
+    assert [r["probability"] for r in body["results"]] == [round(p, 4) for p in expected]
+
+    # both logs say which model produced each score
+    main.audit_log.flush()
+    audited = {r["prediction_id"]: r["scored_by"] for r in read_audit_files(tmp_path / "audit")}
+    ids = [r["prediction_id"] for r in body["results"]]
+    assert [audited[i] for i in ids] == ["student" if k else "model" for k in kept]
+    main.prediction_log.flush()
+    versions = {row["id"]: row["model_version"] for row in database.get_conn().execute("SELECT id, model_version FROM predictions")}
+    assert [versions[i] for i in ids] == ["test+student" if k else "test" for k in kept]
+
+    plain = upload()
+    assert "escalated" not in plain["summary"]
+    assert [r["probability"] for r in plain["results"]] == [round(p, 4) for p in full]
+
+
+def test_student_of_an_older_model_is_not_served(tmp_path, monkeypatch):
+    client = build_client(tmp_path, monkeypatch)
+    rows = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "gender": "Male", "time_in_hospital": 9}] * 5)
+    student = DistilledStudent("linear").fit(rows[FEATURE_COLUMNS], np.tile([0.05, 0.9], 5), teacher_version="replaced")
+    joblib.dump(student, tmp_path / "student_model.joblib")
+
+    files = {"file": ("rows.csv", io.BytesIO(rows.to_csv(index=False).encode()), "text/csv")}
+    body = client.post("/predict-batch", params={"fast": True}, files=files).json()
+    assert body["summary"]["escalated"] == len(rows)
+
+
+def test_distill_key_ignores_evaluation_settings(tmp_path, monkeypatch):
+    data_path = tmp_path / "train.csv"
+    data_path.write_text("rows")
+    keys = stage_keys(data_path.as_posix())
+    monkeypatch.setattr(orchestrate, "BOOTSTRAP_REPLICATES", 7)
+    changed = stage_keys(data_path.as_posix())
+    assert changed["evaluate"] != keys["evaluate"]
+    assert changed["train"] == keys["train"] and changed["distill"] == keys["distill"]
@@ -1,6 +1,7 @@
 import numpy as np
+from fairlearn.metrics import MetricFrame, equalized_odds_difference, false_positive_rate, true_positive_rate
 
-from backend.src.training.fairness import compute_group_fairness
+from backend.src.training.fairness import GroupConfusion, compute_group_fairness, fairness_curve
 
 
 def test_compute_group_fairness_returns_keys():
@@ -15,3 +16,35 @@ def test_compute_group_fairness_returns_keys():
     assert "fpr_difference" in report
     assert "by_group" in report
     assert "overall" in report
+
+
+def test_group_confusion_matches_fairlearn_at_every_threshold():
+    rng = np.random.default_rng(0)
+    n = 2000
+    groups = rng.choice(["A", "B", "C", "D"], size=n, p=[0.5, 0.3, 0.19, 0.01])
+    y_true = (rng.random(n) < 0.3).astype(int)
+    y_prob = np.round(np.clip(0.3 * y_true + rng.random(n) * 0.7, 0, 1), 2)
+
+    confusion = GroupConfusion.build(y_true, y_prob, groups)
+    for threshold in [0.0, 0.25, 0.5, 0.73, 1.0]:
+        y_pred = (y_prob >= threshold).astype(int)
+        frame = MetricFrame(
+            metrics={"tpr": true_positive_rate, "fpr": false_positive_rate},
+            y_true=y_true,
+            y_pred=y_pred,
+            sensitive_features=groups,
+        )
+        report = compute_group_fairness(y_true, y_prob, groups, threshold=threshold, confusion=confusion)
+        for metric in ("tpr", "fpr"):
+            for group, value in frame.by_group[metric].items():
+                assert abs(report["by_group"][metric][group] - value) < 1e-12
+            assert abs(report["overall"][metric] - frame.overall[metric]) < 1e-12
+
+        reliable = np.isin(groups, report["reliable_groups"])
+        expected = equalized_odds_difference(y_true[reliable], y_pred[reliable], sensitive_features=groups[reliable])
+        assert abs(report["equalized_odds_difference"] - expected) < 1e-12
+
+    assert "D" not in report["reliable_groups"]
+    curve = fairness_curve(y_true, y_prob, groups, confusion=confusion)
+    assert len(curve["thresholds"]) == len(curve["tpr"]["A"]) == len(curve["equalized_odds_difference"])
+    assert curve["tpr"]["A"][0] == 1.0 and curve["fpr"]["A"][-1] <= curve["fpr"]["A"][0]
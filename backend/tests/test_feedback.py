@@ -0,0 +1,123 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import brier_score_loss, roc_auc_score
+
+from backend.src import database
+from backend.src.feedback import PredictionLog, ingest_outcomes, performance_report
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+
+def use_temp_db(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "feedback.db")
+    monkeypatch.setattr(database, "_conn", None)
+    database.init_db()
+
+
+def test_incremental_feedback_metrics_match_full_recompute(tmp_path, monkeypatch):
+    use_temp_db(tmp_path, monkeypatch)
+    rng = np.random.default_rng(0)
+    n = 3000
+    y = (rng.random(n) < 0.3).astype(int)
+    # scores on the histogram grid, so the histogram metrics are exact
+    p = np.round(np.clip(0.3 * y + 0.7 * rng.random(n), 0, 1), 2)
+    race = rng.choice(["Caucasian", "AfricanAmerican"], size=n)
+    clock = iter(np.linspace(0, 3 * 86400, n))
+    log = PredictionLog(lambda: "test", batch_size=256, clock=lambda: next(clock))
+    for i in range(n):
+        log.add([f"id-{i}"], [p[i]], {"race": [race[i]], "gender": ["Female"], "age": ["[60-70)"]})
+
+    # outcomes arrive in three deliveries, one of them repeating earlier ids
+    first = ingest_outcomes({f"id-{i}": int(y[i]) for i in range(0, 1000)}, log, 86400)
+    ingest_outcomes({f"id-{i}": int(y[i]) for i in range(1000, n)}, log, 86400)
+    repeat = ingest_outcomes({"id-5": 1, "unknown": 0}, log, 86400)
+    assert first == {"received": 1000, "matched": 1000, "unmatched": 0}
+    assert repeat == {"received": 2, "matched": 0, "unmatched": 2}
+
+    report = performance_report(since=0, threshold=0.5)
+    assert report["outcomes"] == n
+    assert abs(report["metrics"]["auroc"] - roc_auc_score(y, p)) < 1e-9
+    assert abs(report["metrics"]["brier"] - brier_score_loss(y, p)) < 1e-9
+    for group in ("Caucasian", "AfricanAmerican"):
+        mask = race == group
+        metrics = report["subgroups"]["race"]["by_group"][group]["metrics"]
+        assert abs(metrics["auroc"] - roc_auc_score(y[mask], p[mask])) < 1e-9
+    tpr = {g: ((p >= 0.5) & (y == 1) & (race == g)).sum() / ((y == 1) & (race == g)).sum() for g in set(race)}
+    assert abs(report["subgroups"]["race"]["tpr_difference"] - abs(tpr["Caucasian"] - tpr["AfricanAmerican"])) < 1e-12
+
+    # only windows starting on or after day 2
+    assert performance_report(since=2 * 86400, threshold=0.5)["outcomes"] == int((np.linspace(0, 3 * 86400, n) >= 2 * 86400).sum())
+
+
+def test_feedback_endpoints_join_on_prediction_ids(tmp_path, monkeypatch):
+    client = build_client(tmp_path, monkeypatch)
+    use_temp_db(tmp_path, monkeypatch)
+
+    single = client.post("/predict", json=VALID_PAYLOAD).json()
+    assert single["prediction_id"]
+    frame = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "gender": "Male"}])
+    batch = client.post(
+        "/predict-batch", files={"file": ("rows.csv", io.BytesIO(frame.to_csv(index=False).encode()), "text/csv")}
+    ).json()
+    batch_ids = [row["prediction_id"] for row in batch["results"]]
+    assert len(set(batch_ids)) == 2
+
+    response = client.post(
+        "/feedback",
+        json={
+            "outcomes": [
+                {"prediction_id": single["prediction_id"], "readmitted": True},
+                {"prediction_id": batch_ids[0], "readmitted": False},
+                {"prediction_id": batch_ids[1], "readmitted": True},
+                {"prediction_id": "never-served", "readmitted": False},
+            ]
+        },
+    )
+    assert response.json() == {"received": 4, "matched": 3, "unmatched": 1}
+
+    report = client.get("/feedback/performance", params={"days": 7}).json()
+    assert report["outcomes"] == 3
+    assert report["subgroups"]["gender"]["by_group"]["Male"]["count"] == 1
+    assert client.get("/feedback/performance", params={"days": 0}).status_code == 422
+
+
+def test_prediction_log_writes_from_background_thread(tmp_path, monkeypatch):
+    use_temp_db(tmp_path, monkeypatch)
+    log = PredictionLog(lambda: "test", batch_size=2, flush_seconds=60)
+    groups = {"race": ["Asian"], "gender": ["Male"], "age": ["[60-70)"]}
+    log.add(["a"], [0.2], groups)
+    log.add(["b"], [0.7], groups)
+    # a full batch wakes the writer without waiting for the interval
+    for _ in range(100):
+        if len(database.get_predictions(["a", "b"])) == 2:
+            break
+        time.sleep(0.02)
+    assert len(database.get_predictions(["a", "b"])) == 2
+
+    log.add(["c"], [0.4], groups)
+    log.stop()
+    assert [row["id"] for row in database.get_predictions(["c"])] == ["c"]
+
+
+def test_concurrent_feedback_records_an_outcome_once(tmp_path, monkeypatch):
+    use_temp_db(tmp_path, monkeypatch)
+    log = PredictionLog(lambda: "test")
+    log.add(["a"], [0.6], {"race": ["Asian"], "gender": ["Male"], "age": ["[60-70)"]})
+    log.flush()
+
+    lookup = database.get_predictions
+
+    def slow_lookup(ids, conn=None):
+        found = lookup(ids, conn)
+        time.sleep(0.2)
+        return found
+
+    # both deliveries would pass the lookup before either inserts
+    monkeypatch.setattr(database, "get_predictions", slow_lookup)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: ingest_outcomes({"a": 1}, log, 86400), range(2)))
+    assert sorted(r["matched"] for r in results) == [0, 1]
+    assert performance_report(since=0, threshold=0.5)["outcomes"] == 1
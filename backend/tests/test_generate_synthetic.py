@@ -0,0 +1,36 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from backend.src.training.data import FEATURE_COLUMNS
+from backend.src.validation import validate_frame
+
+ROOT = Path(__file__).resolve().parents[2]
+REFERENCE = ROOT / "data" / "sample_synthetic.csv"
+
+
+def load_generator():
+    spec = importlib.util.spec_from_file_location("generate_synthetic", ROOT / "scripts" / "generate_synthetic.py")
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look their module up while the class body runs
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generated_rows_are_valid_and_reproducible(tmp_path):
+    generator = load_generator()
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    generator.generate(REFERENCE.as_posix(), first, 5000, seed=3, chunk_rows=2000)
+    generator.generate(REFERENCE.as_posix(), second, 5000, seed=3, chunk_rows=2000)
+
+    rows = pd.read_csv(first, keep_default_na=False, na_values=[""])
+    assert len(rows) == 5000
+    assert validate_frame(rows[FEATURE_COLUMNS]).n_invalid == 0
+    reference = pd.read_csv(REFERENCE, keep_default_na=False, na_values=[""])
+    rates = rows["readmitted"].value_counts(normalize=True)
+    for label, rate in reference["readmitted"].value_counts(normalize=True).items():
+        assert abs(rates[label] - rate) < 0.03
+    assert first.read_bytes() == second.read_bytes()
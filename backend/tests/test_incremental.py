@@ -0,0 +1,103 @@
+import copy
+import json
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.src.training import incremental
+from backend.src.training.data import load_data
+from backend.src.training.incremental import train_incremental, warm_start_fit
+from backend.src.training.split import split_dataset
+from backend.src.training.train import train_from_splits
+from backend.tests.test_streaming import make_archive
+
+
+def initial_model(tmp_path):
+    history = tmp_path / "history.csv"
+    make_archive(history, rows=1500, seed=0)
+    train_from_splits(split_dataset(load_data(history.as_posix(), use_cache=False)), tmp_path, "gbm")
+    return json.loads((tmp_path / "model_metadata.json").read_text())["model_version"]
+
+
+def test_incremental_update_adds_rounds_and_records_lineage(tmp_path):
+    first_version = initial_model(tmp_path)
+    new_data = tmp_path / "new.csv"
+    make_archive(new_data, rows=800, seed=1)
+
+    summary = train_incremental(new_data.as_posix(), tmp_path, n_new_trees=20, auroc_tolerance=1.0)
+    assert summary["mode"] == "incremental"
+    assert summary["rounds"] == 320
+    assert summary["previous_version"] == first_version
+
+    metadata = json.loads((tmp_path / "model_metadata.json").read_text())
+    assert [entry["mode"] for entry in metadata["lineage"]] == ["full", "incremental"]
+    assert metadata["lineage"][-1]["model_version"] == metadata["model_version"] == summary["model_version"]
+    assert (tmp_path / "archive" / f"base_model-{first_version}.joblib").exists()
+    assert joblib.load(tmp_path / "base_model.joblib").steps[-1][1].n_estimators_ == 320
+
+    frame = load_data(new_data.as_posix(), use_cache=False).X
+    probs = joblib.load(tmp_path / "model.joblib").predict_proba(frame)[:, 1]
+    assert ((probs > 0) & (probs < 1)).all()
+
+
+def test_auroc_guardrail_rejects_update_without_history(tmp_path):
+    first_version = initial_model(tmp_path)
+    served = (tmp_path / "model.joblib").read_bytes()
+    new_data = tmp_path / "new.csv"
+    make_archive(new_data, rows=800, seed=2)
+
+    # a negative tolerance demands an improvement no update can guarantee
+    summary = train_incremental(new_data.as_posix(), tmp_path, n_new_trees=10, auroc_tolerance=-1.0)
+    assert summary["mode"] == "rejected"
+    assert summary["model_version"] == first_version
+    assert (tmp_path / "model.joblib").read_bytes() == served
+    assert json.loads((tmp_path / "model_metadata.json").read_text())["model_version"] == first_version
+
+
+def test_auroc_guardrail_falls_back_to_full_retrain_on_history(tmp_path, monkeypatch):
+    first_version = initial_model(tmp_path)
+    new_data = tmp_path / "new.csv"
+    make_archive(new_data, rows=800, seed=2)
+
+    def useless_update(base_model, X, y, n_new_trees):
+        # refit on shuffled labels: validation AUROC drops to chance
+        model = copy.deepcopy(base_model)
+        model.steps[-1][1].fit(model[:-1].transform(X), np.random.default_rng(0).permutation(y.to_numpy()))
+        return model
+
+    monkeypatch.setattr(incremental, "warm_start_fit", useless_update)
+    summary = train_incremental(
+        new_data.as_posix(), tmp_path, n_new_trees=10, auroc_tolerance=0.05, history_path=(tmp_path / "history.csv").as_posix()
+    )
+    assert summary["mode"] == "full_fallback"
+    assert summary["full_retrain_val_auroc"] >= summary["previous_val_auroc"] - 0.05
+    assert summary["history_rows"] == 1500
+
+    metadata = json.loads((tmp_path / "model_metadata.json").read_text())
+    assert [entry["mode"] for entry in metadata["lineage"]] == ["full", "full_fallback"]
+    assert metadata["lineage"][-1]["train_rows"] == 1500 + summary["train_rows"]
+    for name in ("model", "base_model"):
+        assert (tmp_path / "archive" / f"{name}-{first_version}.joblib").exists()
+    assert (tmp_path / "archive" / f"feature_reference-{first_version}.json").exists()
+
+
+def test_hist_models_are_not_warm_started(tmp_path):
+    history = tmp_path / "history.csv"
+    make_archive(history, rows=1500, seed=0)
+    splits = split_dataset(load_data(history.as_posix(), use_cache=False))
+    base, _ = train_from_splits(splits, tmp_path, "hist")
+    with pytest.raises(ValueError, match="gbm backend"):
+        warm_start_fit(base, splits[0], splits[3])
+
+    first_version = json.loads((tmp_path / "model_metadata.json").read_text())["model_version"]
+    new_data = tmp_path / "new.csv"
+    make_archive(new_data, rows=800, seed=1)
+    summary = train_incremental(new_data.as_posix(), tmp_path, auroc_tolerance=1.0)
+    assert (summary["mode"], summary["reason"], summary["model_version"]) == ("rejected", "hist_needs_history", first_version)
+
+    # with the history, the update is a guarded full retrain
+    summary = train_incremental(new_data.as_posix(), tmp_path, auroc_tolerance=1.0, history_path=history.as_posix())
+    assert summary["mode"] == "full_fallback"
+    assert summary["model_version"].startswith("hist-")
+    assert json.loads((tmp_path / "model_metadata.json").read_text())["lineage"][-1]["mode"] == "full_fallback"
@@ -0,0 +1,30 @@
+from backend.src.instrumentation import MetricsRegistry
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/predict")
+    histogram.observe(0.5, "/predict")
+    histogram.observe(5.0, "/predict")
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/predict",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/predict",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/predict",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/predict"} 3' in text
+
+
+def test_metrics_runtime_reports_stages(tmp_path, monkeypatch):
+    client = build_client(tmp_path, monkeypatch)
+    response = client.post("/predict", json=VALID_PAYLOAD)
+    assert response.status_code == 200
+    server_timing = response.headers["Server-Timing"]
+    for stage in ("validate", "score", "explain", "total"):
+        assert f"{stage};dur=" in server_timing
+
+    text = client.get("/metrics-runtime").text
+    assert 'dc_request_stage_duration_seconds_count{route="/predict",stage="score"}' in text
+    assert 'dc_model_info{model_version="test"} 1.0' in text
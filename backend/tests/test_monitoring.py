@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from backend.src.monitoring import DriftMonitor, build_drift_profile
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+CATEGORICAL = ["race", "gender"]
+NUMERIC = ["time_in_hospital", "num_lab_procedures"]
+
+
+def make_frame(n: int, seed: int, shift: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "race": rng.choice(["Caucasian", "AfricanAmerican", "Asian"], size=n, p=[0.6, 0.3, 0.1]),
+            "gender": rng.choice(["Female", "Male"], size=n),
+            "time_in_hospital": rng.integers(1, 14, size=n),
+            "num_lab_procedures": np.round(rng.normal(45 + shift, 15, size=n)),
+        }
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_drift_monitor_flags_shifted_feature_only():
+    reference = make_frame(20000, seed=0)
+    scores = np.random.default_rng(0).beta(2, 5, size=len(reference))
+    profile = build_drift_profile(reference, scores, CATEGORICAL, NUMERIC)
+    clock = FakeClock()
+    monitor = DriftMonitor(lambda: profile, window_seconds=60, n_windows=10, clock=clock)
+
+    live = make_frame(5000, seed=1, shift=25.0)
+    live_scores = np.random.default_rng(1).beta(2, 5, size=len(live))
+    monitor.record(live.iloc[:2500], live_scores[:2500])
+    monitor.record(live.iloc[2500:], live_scores[2500:])
+    monitor.record({**live.iloc[0].to_dict(), "race": "Martian"}, 0.3)
+
+    report = monitor.report(span_seconds=600)
+    monitor.stop()
+    assert report["window"]["rows"] == 5001
+    assert report["features"]["num_lab_procedures"]["status"] == "significant"
+    assert report["features"]["num_lab_procedures"]["ks"] > 0.4
+    for col in ("race", "gender", "time_in_hospital"):
+        assert report["features"][col]["status"] == "stable"
+    assert report["features"]["race"]["ks"] is None
+    assert report["score"]["status"] == "stable"
+    assert report["drifted_features"] == ["num_lab_procedures"]
+
+
+def test_drift_windows_roll_off():
+    reference = make_frame(2000, seed=0)
+    profile = build_drift_profile(reference, np.full(len(reference), 0.2), CATEGORICAL, NUMERIC)
+    clock = FakeClock()
+    monitor = DriftMonitor(lambda: profile, window_seconds=60, n_windows=3, clock=clock)
+
+    monitor.record(make_frame(100, seed=1), np.full(100, 0.2))
+    monitor.drain()
+    clock.now += 120
+    monitor.record(make_frame(50, seed=2), np.full(50, 0.2))
+
+    assert monitor.report(span_seconds=60)["window"]["rows"] == 50
+    assert monitor.report(span_seconds=180)["window"]["rows"] == 150
+    clock.now += 300
+    assert monitor.report(span_seconds=180)["features"]["race"]["status"] == "no_data"
+    assert len(monitor._windows) <= 3
+
+
+
+def test_drift_monitor_reloads_reference_for_new_model_version():
+    profiles = {
+        "v1": build_drift_profile(make_frame(2000, seed=0), np.full(2000, 0.2), CATEGORICAL, NUMERIC),
+        "v2": build_drift_profile(make_frame(2000, seed=0, shift=25.0), np.full(2000, 0.2), CATEGORICAL, NUMERIC),
+    }
+    served = {"version": "v1"}
+    monitor = DriftMonitor(lambda: profiles[served["version"]], clock=FakeClock(), version=lambda: served["version"])
+
+    monitor.record(make_frame(500, seed=1, shift=25.0), np.full(500, 0.2))
+    assert monitor.report(span_seconds=600)["features"]["num_lab_procedures"]["status"] == "significant"
+
+    served["version"] = "v2"
+    assert monitor.report(span_seconds=600)["window"]["rows"] == 0
+    monitor.record(make_frame(500, seed=1, shift=25.0), np.full(500, 0.2))
+    report = monitor.report(span_seconds=600)
+    assert report["window"]["rows"] == 500
+    assert report["features"]["num_lab_procedures"]["status"] == "stable"
+
+def test_drift_endpoint_reports_live_traffic(tmp_path, monkeypatch):
+    monkeypatch.setenv("BATCH_CHUNK_ROWS", "2")
+    client = build_client(tmp_path, monkeypatch)
+    assert client.get("/monitoring/drift").status_code == 503
+
+    frame = pd.DataFrame([VALID_PAYLOAD] * 50)
+    reference_path = tmp_path / "feature_reference.json"
+    reference = json.loads(reference_path.read_text())
+    reference["drift_profile"] = build_drift_profile(frame, np.full(50, 0.5), CATEGORICAL, NUMERIC)
+    reference_path.write_text(json.dumps(reference))
+    import backend.src.modeling as modeling
+
+    modeling.load_reference.cache_clear()
+
+    for _ in range(3):
+        assert client.post("/predict", json={**VALID_PAYLOAD, "gender": "Male"}).status_code == 200
+    report = client.get("/monitoring/drift", params={"window_minutes": 30}).json()
+    assert report["window"]["rows"] == 3
+    assert report["features"]["gender"]["status"] == "significant"
+    assert client.get("/monitoring/drift", params={"window_minutes": 0}).status_code == 422
+    assert 'dc_queue_depth{queue="drift"}' in client.get("/metrics-runtime").text
+
+    # a rejected upload leaves no trace, even for chunks scored before the bad row
+    rows = [VALID_PAYLOAD] * 4 + [{**VALID_PAYLOAD, "gender": "Robot"}]
+    upload = pd.DataFrame(rows).to_csv(index=False).encode()
+    response = client.post("/predict-batch", files={"file": ("rows.csv", upload, "text/csv")})
+    assert response.status_code == 422
+    report = client.get("/monitoring/drift", params={"window_minutes": 30}).json()
+    assert report["window"]["rows"] == 3
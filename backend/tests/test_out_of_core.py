@@ -0,0 +1,59 @@
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from backend.benchmarks.harness import synthetic_frame
+from backend.src.training.data import load_data
+from backend.src.training.out_of_core import HOLDOUT_EVERY, SketchPreprocessor, train_out_of_core
+from backend.src.training.pipeline import build_baseline_model
+from backend.src.training.streaming import stream_evaluate
+
+
+def test_sketch_preprocessor_matches_one_pass_statistics():
+    frame = synthetic_frame(1000, seed=3)
+    chunked = SketchPreprocessor()
+    for start in range(0, len(frame), 300):
+        chunked.partial_fit(frame.iloc[start : start + 300])
+    whole = SketchPreprocessor().fit(frame)
+
+    np.testing.assert_allclose(chunked.mean_, frame[chunked.numeric_columns].mean().to_numpy())
+    np.testing.assert_allclose(chunked.scale_, frame[chunked.numeric_columns].std(ddof=0).to_numpy())
+    assert chunked.categories_ == whole.categories_
+
+    # a large offset wipes out sum-of-squares variance but not the merged deviations
+    shifted = frame.assign(**{col: frame[col] + 1e9 for col in chunked.numeric_columns})
+    offset = SketchPreprocessor()
+    for start in range(0, len(shifted), 300):
+        offset.partial_fit(shifted.iloc[start : start + 300])
+    np.testing.assert_allclose(offset.scale_, chunked.scale_, rtol=1e-6)
+    encoded = chunked.transform(frame)
+    assert encoded.shape == (1000, len(chunked.get_feature_names_out()))
+    # every row has each numeric column plus exactly one category per categorical column
+    assert (np.diff(encoded.indptr) <= len(chunked.numeric_columns) + len(chunked.categorical_columns)).all()
+    unseen = frame.iloc[:1].assign(race="Martian")
+    race = chunked.categorical_columns.index("race")
+    race_block = slice(chunked._offsets[race], chunked._offsets[race] + len(chunked.categories_[race]))
+    assert chunked.transform(unseen)[:, race_block].nnz == 0
+
+
+def test_out_of_core_baseline_matches_in_memory_auroc(tmp_path):
+    data_path = tmp_path / "large.csv"
+    synthetic_frame(40000, seed=1, with_target=True).to_csv(data_path, index=False)
+
+    pipeline, report = train_out_of_core(data_path.as_posix(), chunk_rows=7000)
+    dataset = load_data(data_path.as_posix(), use_cache=False)
+    holdout = (np.arange(len(dataset.y)) % HOLDOUT_EVERY) == 0
+    assert report["holdout_rows"] == holdout.sum()
+    assert report["train_rows"] == (~holdout).sum()
+
+    in_memory = build_baseline_model().fit(dataset.X[~holdout], dataset.y[~holdout])
+    reference_auroc = roc_auc_score(dataset.y[holdout], in_memory.predict_proba(dataset.X[holdout])[:, 1])
+    streamed_auroc = roc_auc_score(dataset.y[holdout], pipeline.predict_proba(dataset.X[holdout])[:, 1])
+    assert abs(streamed_auroc - reference_auroc) < 0.01
+    assert abs(report["holdout_metrics"]["auroc"] - streamed_auroc) < 1e-3
+
+    # the saved pipeline plugs into the streaming evaluator as the baseline
+    model_path = tmp_path / "baseline_model.joblib"
+    joblib.dump(pipeline, model_path)
+    metrics = stream_evaluate(data_path.as_posix(), in_memory, baseline_model=joblib.load(model_path), chunk_rows=7000)
+    assert metrics["metrics"]["baseline"]["auroc"] > 0.6
@@ -1,3 +1,4 @@
+import io
 import json
 from pathlib import Path
 
@@ -50,7 +51,7 @@ def create_dummy_artifacts(tmp_path: Path) -> None:
 
     reference = {col: df[col].iloc[0] for col in FEATURE_COLUMNS}
     with (tmp_path / "feature_reference.json").open("w") as handle:
-        json.dump(reference, handle)
+        json.dump(reference, handle, default=int)
 
     with (tmp_path / "model_metadata.json").open("w") as handle:
         json.dump(
@@ -69,7 +70,7 @@ def create_dummy_artifacts(tmp_path: Path) -> None:
         json.dump({"generated_at": "2026-02-11", "metrics": {}}, handle)
 
 
-def build_client(tmp_path, monkeypatch, api_key: str | None = None):
+def build_client(tmp_path, monkeypatch, api_key: str | None = None, admin_key: str | None = None):
     create_dummy_artifacts(tmp_path)
     monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
     monkeypatch.setenv("MODEL_PATH", str(tmp_path / "model.joblib"))
@@ -78,10 +79,15 @@ def build_client(tmp_path, monkeypatch, api_key: str | None = None):
     monkeypatch.setenv("METADATA_PATH", str(tmp_path / "model_metadata.json"))
     monkeypatch.setenv("FAIRNESS_PATH", str(tmp_path / "fairness_report.json"))
     monkeypatch.setenv("METRICS_PATH", str(tmp_path / "eval_metrics.json"))
+    monkeypatch.setenv("AUDIT_DIR", str(tmp_path / "audit"))
     if api_key:
         monkeypatch.setenv("API_KEY", api_key)
     else:
         monkeypatch.delenv("API_KEY", raising=False)
+    if admin_key:
+        monkeypatch.setenv("ADMIN_API_KEY", admin_key)
+    else:
+        monkeypatch.delenv("ADMIN_API_KEY", raising=False)
 
     from importlib import reload
     import backend.src.config as config
@@ -116,3 +122,92 @@ def test_predict_requires_api_key(tmp_path, monkeypatch):
 
     response = client.post("/predict", json=VALID_PAYLOAD, headers={"X-API-Key": "secret"})
     assert response.status_code == 200
+
+
+def _batch_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    pd.DataFrame(rows).to_csv(buffer, index=False)
+    return buffer.getvalue().encode()
+
+
+def test_predict_batch_rejects_invalid_rows(client):
+    rows = [VALID_PAYLOAD, {**VALID_PAYLOAD, "race": "Martian", "num_medications": 1000}]
+    response = client.post("/predict-batch", files={"file": ("batch.csv", _batch_csv(rows), "text/csv")})
+    assert response.status_code == 422
+    errors = response.json()["errors"]
+    assert {(e["row"], e["column"]) for e in errors} == {(2, "race"), (2, "num_medications")}
+
+
+def test_predict_batch_scores_valid_rows_only(client):
+    rows = [{**VALID_PAYLOAD, "time_in_hospital": "abc"}, VALID_PAYLOAD]
+    response = client.post(
+        "/predict-batch?valid_only=true",
+        files={"file": ("batch.csv", _batch_csv(rows), "text/csv")},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [r["row"] for r in payload["results"]] == [2]
+    assert payload["summary"]["invalid"] == 1
+    assert payload["errors"][0]["message"] == "time_in_hospital must be a number"
+
+
+def test_predict_batch_parquet_roundtrip(client):
+    buffer = io.BytesIO()
+    pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "A1Cresult": "None"}]).to_parquet(buffer, index=False)
+    response = client.post(
+        "/predict-batch?output=arrow",
+        files={"file": ("batch.parquet", buffer.getvalue(), "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.file"
+    results = pd.read_feather(io.BytesIO(response.content))
+    assert results["row"].tolist() == [1, 2]
+    assert results["risk_tier"].isin(["low", "medium", "high"]).all()
+
+
+def test_predict_batch_xlsx_numbers_rows_across_chunks(tmp_path, monkeypatch):
+    from backend.tests.test_batch_io import make_workbook
+
+    monkeypatch.setenv("BATCH_CHUNK_ROWS", "2")
+    client = build_client(tmp_path, monkeypatch)
+    rows = [VALID_PAYLOAD] * 4 + [{**VALID_PAYLOAD, "gender": "Robot"}]
+    response = client.post(
+        "/predict-batch?valid_only=true",
+        files={"file": ("batch.xlsx", make_workbook(rows), "application/octet-stream")},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [r["row"] for r in payload["results"]] == [1, 2, 3, 4]
+    assert payload["errors"][0]["row"] == 5
+
+
+def test_predict_batch_streams_columnar_results_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setenv("BATCH_CHUNK_ROWS", "2")
+    client = build_client(tmp_path, monkeypatch)
+    rows = [VALID_PAYLOAD] * 2 + [{**VALID_PAYLOAD, "gender": "Robot"}] + [VALID_PAYLOAD] * 2
+    response = client.post(
+        "/predict-batch?valid_only=true&output=parquet",
+        files={"file": ("batch.csv", _batch_csv(rows), "text/csv")},
+    )
+    assert response.status_code == 200
+    results = pd.read_parquet(io.BytesIO(response.content))
+    assert results["row"].tolist() == [1, 2, 4, 5]
+    assert results["prediction_id"].nunique() == 4
+    import pyarrow.parquet as pq
+
+    summary = json.loads(pq.read_schema(io.BytesIO(response.content)).metadata[b"summary"])
+    assert summary["total"] == 4 and summary["invalid"] == 1
+
+
+def test_risk_tier_array_matches_scalar():
+    import numpy as np
+
+    from backend.src.modeling import risk_tier, risk_tier_array, summarize_probabilities
+
+    probs = np.array([0.0, 0.1999, 0.2, 0.35, 0.5, 0.99, 1.0])
+    assert risk_tier_array(probs).tolist() == [risk_tier(p) for p in probs]
+
+    summary = summarize_probabilities(probs)
+    assert (summary["low"], summary["medium"], summary["high"]) == (2, 2, 3)
+    assert sum(summary["histogram"]["counts"]) == len(probs)
+    assert summary["quantiles"]["p50"] == 35.0
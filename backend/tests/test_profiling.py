@@ -0,0 +1,54 @@
+import pstats
+
+from backend.tests.test_predict import VALID_PAYLOAD, build_client
+
+
+def test_profiler_captures_and_serves_profiles(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+    client = build_client(tmp_path, monkeypatch, admin_key="admin")
+    client.headers["X-API-Key"] = "admin"
+
+    response = client.put("/admin/profiler", json={"enabled": True, "sample_rate": 1.0, "max_files": 2})
+    assert response.json()["enabled"] is True
+
+    for _ in range(3):
+        response = client.post("/predict", json=VALID_PAYLOAD, headers={"X-Request-ID": "abc123"})
+        assert response.headers["X-Request-ID"] == "abc123"
+    client.put("/admin/profiler", json={"enabled": False})
+
+    profiles = client.get("/admin/profiles").json()
+    predict_profiles = [p for p in profiles if p["route"] == "/predict"]
+    assert len(profiles) == 2
+    assert predict_profiles[0]["request_id"] == "abc123"
+    assert predict_profiles[0]["model_version"] == "test"
+
+    download = client.get(f"/admin/profiles/{predict_profiles[0]['name']}")
+    assert download.status_code == 200
+    stats_path = tmp_path / "downloaded.pstats"
+    stats_path.write_bytes(download.content)
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+
+    assert client.get("/admin/profiles/..%2Fmodel.joblib").status_code == 404
+
+
+def test_profiler_keeps_only_slow_requests(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setenv("PROFILE_ENABLED", "true")
+    monkeypatch.setenv("PROFILE_SLOW_MS", "600000")
+    client = build_client(tmp_path, monkeypatch, admin_key="admin")
+    client.headers["X-API-Key"] = "admin"
+
+    client.post("/predict", json=VALID_PAYLOAD)
+    assert client.get("/admin/profiles").json() == []
+
+
+def test_admin_routes_closed_without_admin_key(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+    client = build_client(tmp_path, monkeypatch, api_key="client")
+    headers = {"X-API-Key": "client"}
+    assert client.put("/admin/profiler", json={"enabled": True}, headers=headers).status_code == 403
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+
+    client = build_client(tmp_path, monkeypatch, admin_key="admin")
+    assert client.get("/admin/profiler").status_code == 401
+    assert client.get("/admin/profiler", headers={"X-API-Key": "admin"}).status_code == 200
@@ -0,0 +1,95 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+
+from backend.src.training import recalibrate as recalibrate_module
+from backend.src.training.data import load_data
+from backend.src.training.pipeline import build_baseline_model, decision_scores
+from backend.src.training.recalibrate import calibrate_scores, recalibrate
+from backend.tests.test_predict import build_client
+from backend.tests.test_streaming import make_archive
+
+
+def write_artifacts(tmp_path):
+    train_path = tmp_path / "train.csv"
+    make_archive(train_path, rows=2000, seed=0)
+    train = load_data(train_path.as_posix(), use_cache=False)
+    base = build_baseline_model().fit(train.X, train.y)
+    calibrated = CalibratedClassifierCV(FrozenEstimator(base), method="sigmoid").fit(train.X, train.y)
+    joblib.dump(base, tmp_path / "base_model.joblib")
+    joblib.dump(calibrated, tmp_path / "model.joblib")
+    (tmp_path / "model_metadata.json").write_text(json.dumps({"model_version": "gbm-calibrated-1", "backend": "gbm"}))
+    return base
+
+
+@pytest.mark.parametrize("method", ["sigmoid", "isotonic"])
+def test_calibrating_cached_scores_matches_sklearn(tmp_path, method):
+    base = write_artifacts(tmp_path)
+    data_path = tmp_path / "new.csv"
+    make_archive(data_path, rows=1000, seed=1)
+    data = load_data(data_path.as_posix(), use_cache=False)
+
+    scores = decision_scores(base.steps[-1][1], base[:-1].transform(data.X))
+    fast = calibrate_scores(base, scores, data.y.to_numpy(), method)
+    reference = CalibratedClassifierCV(FrozenEstimator(base), method=method).fit(data.X, data.y)
+    np.testing.assert_allclose(fast.predict_proba(data.X), reference.predict_proba(data.X), atol=1e-12)
+
+
+def test_recalibrate_fixes_shifted_calibration_and_reuses_scores(tmp_path, monkeypatch):
+    write_artifacts(tmp_path)
+    # left over from an earlier incremental update
+    metadata_path = tmp_path / "model_metadata.json"
+    metadata_path.write_text(json.dumps({**json.loads(metadata_path.read_text()), "incremental": {"mode": "incremental"}}))
+    data_path = tmp_path / "shifted.csv"
+    make_archive(data_path, rows=3000, seed=2)
+    # the readmission rate roughly doubles, ranking is unchanged
+    frame = pd.read_csv(data_path)
+    rng = np.random.default_rng(3)
+    frame.loc[rng.random(len(frame)) < 0.3, "readmitted"] = "<30"
+    frame.to_csv(data_path, index=False)
+
+    metadata = recalibrate(data_path.as_posix(), tmp_path, "isotonic", cache_dir=tmp_path / "cache")
+    info = metadata["recalibration"]
+    assert metadata["model_version"].startswith("gbm-recalibrated-")
+    assert info["previous_version"] == "gbm-calibrated-1"
+    assert [entry["mode"] for entry in metadata["lineage"]] == ["full", "recalibrate"]
+    assert "incremental" not in metadata
+    assert info["holdout"]["recalibrated"]["ece"] < info["holdout"]["previous"]["ece"]
+    assert (tmp_path / "archive" / "model-gbm-calibrated-1.joblib").exists()
+    assert json.loads((tmp_path / "model_metadata.json").read_text())["model_version"] == metadata["model_version"]
+    assert not list(tmp_path.glob("*.tmp"))
+    assert isinstance(joblib.load(tmp_path / "model.joblib"), CalibratedClassifierCV)
+
+    # a second pass on the same file reads the cached scores instead of the data
+    monkeypatch.setattr(recalibrate_module, "load_data", lambda *_: pytest.fail("scores were not cached"))
+    again = recalibrate(data_path.as_posix(), tmp_path, "sigmoid", cache_dir=tmp_path / "cache")
+    assert again["recalibration"]["previous_version"] == metadata["model_version"]
+
+
+def test_recalibrate_endpoint_swaps_served_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("ADMIN_DATA_DIR", str(tmp_path / "data"))
+    client = build_client(tmp_path, monkeypatch, admin_key="admin")
+    client.headers["X-API-Key"] = "admin"
+    data_path = tmp_path / "data" / "new.csv"
+    data_path.parent.mkdir()
+    make_archive(data_path, rows=500, seed=4)
+    assert client.get("/health").json()["model_version"] == "test"
+
+    response = client.post("/admin/recalibrate", json={"data_path": "new.csv", "method": "sigmoid"})
+    assert response.status_code == 200
+    version = response.json()["model_version"]
+    assert client.get("/health").json()["model_version"] == version
+    import backend.src.modeling as modeling
+
+    assert isinstance(modeling.load_model(), CalibratedClassifierCV)
+    assert client.post("/admin/recalibrate", json={"data_path": "missing.csv"}).status_code == 422
+    for outside in ("../model_metadata.json", str(tmp_path / "model_metadata.json"), "/etc/passwd"):
+        response = client.post("/admin/recalibrate", json={"data_path": outside})
+        assert response.json()["detail"] == "data_path must be inside ADMIN_DATA_DIR"
+    assert client.post("/admin/recalibrate", json={"data_path": "new.csv"}, headers={"X-API-Key": "wrong"}).status_code == 401
+    assert client.post("/admin/recalibrate", json={"data_path": data_path.as_posix(), "method": "beta"}).status_code == 422
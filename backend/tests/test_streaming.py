@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.src.training.data import FEATURE_COLUMNS, iter_data_chunks, load_data
+from backend.src.training.evaluate import compute_group_metrics
+from backend.src.training.fairness import compute_group_fairness, fairness_curve
+from backend.src.training.metrics import calibration_curve_data, classification_metrics, operating_point_metrics
+from backend.src.training.streaming import stream_evaluate
+
+BASE_ROW = {
+    "race": "Caucasian",
+    "gender": "Female",
+    "age": "[60-70)",
+    "admission_type_id": 1,
+    "discharge_disposition_id": 1,
+    "admission_source_id": 7,
+    "time_in_hospital": 4,
+    "num_lab_procedures": 50,
+    "num_procedures": 2,
+    "num_medications": 14,
+    "number_outpatient": 0,
+    "number_emergency": 1,
+    "number_inpatient": 0,
+    "A1Cresult": ">7",
+    "metformin": "Steady",
+    "insulin": "Up",
+    "change": "Ch",
+    "diabetesMed": "Yes",
+}
+
+
+class RoundedScoreModel:
+    """Deterministic scores on a 0.001 grid, so every distinct score gets its own histogram bin."""
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        raw = 0.05 * X["time_in_hospital"] + 0.004 * X["num_lab_procedures"] + 0.1 * (X["race"] == "Caucasian")
+        p = np.round(np.clip(raw.to_numpy(dtype=float) / 1.2, 0, 1), 3)
+        return np.column_stack([1 - p, p])
+
+
+def make_archive(path: Path, rows: int = 1500, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame([BASE_ROW] * rows)
+    frame["race"] = rng.choice(["Caucasian", "AfricanAmerican", "Asian"], size=rows, p=[0.6, 0.35, 0.05])
+    frame["gender"] = rng.choice(["Female", "Male"], size=rows)
+    frame["age"] = rng.choice(["[10-20)", "[50-60)", "[60-70)"], size=rows)
+    frame["time_in_hospital"] = rng.integers(1, 14, size=rows)
+    frame["num_lab_procedures"] = rng.integers(1, 100, size=rows)
+    frame["readmitted"] = np.where(rng.random(rows) < 0.1 + 0.04 * frame["time_in_hospital"], "<30", "NO")
+    frame.to_csv(path, index=False)
+
+
+def test_iter_data_chunks_matches_load_data(tmp_path: Path):
+    data_path = tmp_path / "archive.csv"
+    make_archive(data_path, rows=250)
+    chunks = list(iter_data_chunks(data_path.as_posix(), chunk_rows=100))
+    assert [len(chunk.y) for chunk in chunks] == [100, 100, 50]
+    full = load_data(data_path.as_posix(), use_cache=False)
+    streamed = pd.concat([chunk.X for chunk in chunks], ignore_index=True)
+    assert streamed["num_lab_procedures"].tolist() == full.X["num_lab_procedures"].tolist()
+    assert streamed["race"].astype(str).tolist() == full.X["race"].astype(str).tolist()
+
+
+def test_stream_evaluate_matches_in_memory_metrics(tmp_path: Path):
+    data_path = tmp_path / "archive.csv"
+    make_archive(data_path)
+    model = RoundedScoreModel()
+
+    report = stream_evaluate(data_path.as_posix(), model, baseline_model=model, chunk_rows=333)
+
+    dataset = load_data(data_path.as_posix(), use_cache=False)
+    X, y = dataset.X[FEATURE_COLUMNS], dataset.y.to_numpy()
+    probs = model.predict_proba(X)[:, 1]
+    assert report["rows"] == len(y)
+
+    expected = classification_metrics(y, probs)
+    for name in ("primary", "baseline"):
+        for metric, value in expected.items():
+            assert abs(report["metrics"][name][metric] - value) < 1e-9
+
+    assert report["operating_points"]["threshold_0_5"] == operating_point_metrics(y, probs, 0.5)
+    streamed_top = report["operating_points"]["top_15_percent"]
+    assert abs(streamed_top["threshold"] - np.quantile(probs, 0.85)) < 1e-3
+    assert streamed_top == operating_point_metrics(y, probs, streamed_top["threshold"])
+
+    for streamed_bin, exact_bin in zip(report["calibration_curve"], calibration_curve_data(y, probs)):
+        assert streamed_bin["count"] == exact_bin["count"]
+        assert abs(streamed_bin["mean_pred"] - exact_bin["mean_pred"]) < 1e-9
+
+    race = X["race"].astype(str).to_numpy()
+    exact_groups = compute_group_metrics(y, probs, race)
+    for group, info in exact_groups.items():
+        streamed = report["subgroup_performance"]["race"][group]
+        assert streamed["count"] == info["count"]
+        assert abs(streamed["metrics"]["auroc"] - info["metrics"]["auroc"]) < 1e-9
+
+    exact_curve = fairness_curve(y, probs, race)
+    assert report["fairness"]["curves"]["race"]["tpr"] == exact_curve["tpr"]
+    assert report["fairness"]["curves"]["race"]["equalized_odds_difference"] == exact_curve["equalized_odds_difference"]
+    gender = X["gender"].astype(str).to_numpy()
+    threshold = report["fairness"]["metrics"]["gender"]["threshold_used"]
+    exact_fairness = compute_group_fairness(y, probs, gender, threshold=threshold)
+    assert report["fairness"]["metrics"]["gender"]["by_group"] == exact_fairness["by_group"]
+    assert set(report["subgroup_performance"]["age"]) == {"Under 30", "[50-60)", "[60-70)"}
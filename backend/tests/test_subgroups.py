@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+from backend.src.training.metrics import expected_calibration_error
+from backend.src.training.subgroups import SubgroupEngine, subgroup_report
+
+
+def make_cohort(n: int = 3000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "race": rng.choice(["A", "B", "C"], size=n, p=[0.6, 0.38, 0.02]),
+            "gender": rng.choice(["Female", "Male"], size=n),
+        }
+    )
+    y_true = (rng.random(n) < 0.3).astype(int)
+    y_prob = np.round(np.clip(0.25 * y_true + rng.random(n) * 0.75, 0, 1), 2)
+    return frame, y_true, y_prob
+
+
+def test_engine_matches_per_cell_sklearn_metrics():
+    frame, y_true, y_prob = make_cohort()
+    engine = SubgroupEngine.build(frame, ["race", "gender"], y_true, y_prob)
+    auroc = engine.auroc()
+    ece = engine.ece()
+    rates = engine.rates([0.3, 0.6])
+
+    for idx, (race, gender) in enumerate(engine.labels):
+        mask = ((frame["race"] == race) & (frame["gender"] == gender)).to_numpy()
+        y, p = y_true[mask], y_prob[mask]
+        assert abs(auroc[idx] - roc_auc_score(y, p)) < 1e-12
+        assert abs(ece[idx] - expected_calibration_error(y, p)) < 1e-12
+        for j, threshold in enumerate([0.3, 0.6]):
+            predicted = p >= threshold
+            assert abs(rates["tpr"][idx, j] - predicted[y == 1].mean()) < 1e-12
+            assert abs(rates["fpr"][idx, j] - predicted[y == 0].mean()) < 1e-12
+
+
+def test_report_enforces_minimum_support():
+    frame, y_true, y_prob = make_cohort()
+    report = subgroup_report(frame, ["race", "gender"], y_true, y_prob, {"half": 0.5}, min_count=100)
+
+    assert report["n_cells"] == 6
+    small = [cell for cell in report["cells"] if cell["groups"]["race"] == "C"]
+    assert all(not cell["supported"] and "auroc" not in cell for cell in small)
+    large = [cell for cell in report["cells"] if cell["supported"]]
+    assert large and all(cell["auroc"] is not None and "half" in cell["operating_points"] for cell in large)
@@ -1,10 +1,19 @@
 import json
+import shutil
 from pathlib import Path
 
+import joblib
+import numpy as np
 import pandas as pd
 
+from backend.src.training.data import CATEGORICAL_COLUMNS, load_data
 from backend.src.training.evaluate import evaluate
+from backend.src.training.importance import encoded_blocks, global_permutation_importance
+from backend.src.training.orchestrate import run_pipeline
+from backend.src.training.pipeline import fit_primary_with_calibration, positive_proba_from_encoded
+from backend.src.training.split import split_dataset
 from backend.src.training.train import train
+from backend.src.training.tune import tune
 
 VALID_PAYLOAD = {
     "race": "Caucasian",
@@ -71,3 +80,133 @@ def test_train_and_evaluate(tmp_path: Path):
         fairness_payload = json.load(handle)
     assert "metrics" in fairness_payload
     assert "race" in fairness_payload["metrics"]
+
+
+def test_load_data_caches_typed_frame(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path)
+    cache_dir = tmp_path / "cache"
+
+    fresh = load_data(data_path.as_posix(), cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+    cached = load_data(data_path.as_posix(), cache_dir=cache_dir)
+
+    pd.testing.assert_frame_equal(fresh.X, cached.X)
+    assert cached.y.tolist() == fresh.y.tolist()
+    assert all(str(cached.X[col].dtype) == "category" for col in CATEGORICAL_COLUMNS)
+    assert cached.X["time_in_hospital"].dtype == "int8"
+
+    # editing the source invalidates the cache key
+    make_dataset(data_path, rows=30)
+    assert len(load_data(data_path.as_posix(), cache_dir=cache_dir).X) == 30
+
+
+def test_run_pipeline_skips_unchanged_stages(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path, rows=200)
+
+    manifest = run_pipeline(data_path.as_posix(), tmp_path, tmp_path / "metrics.json")
+    assert set(manifest["stages"]) == {"train", "evaluate", "distill"}
+    assert (tmp_path / "student_model.joblib").exists()
+    assert (tmp_path / "model.joblib").exists()
+    assert (tmp_path / "metrics.json").exists()
+
+    model_mtime = (tmp_path / "model.joblib").stat().st_mtime_ns
+    again = run_pipeline(data_path.as_posix(), tmp_path)
+    assert again["stages"] == manifest["stages"]
+    assert (tmp_path / "model.joblib").stat().st_mtime_ns == model_mtime
+
+    # a model installed outside the pipeline (incremental update, recalibration)
+    # is evaluated and distilled again, but not retrained
+    shutil.copyfile(tmp_path / "base_model.joblib", tmp_path / "model.joblib")
+    swapped = run_pipeline(data_path.as_posix(), tmp_path)["stages"]
+    assert swapped["train"] == manifest["stages"]["train"]
+    for stage in ("evaluate", "distill"):
+        assert swapped[stage]["completed_at"] != manifest["stages"][stage]["completed_at"]
+    assert run_pipeline(data_path.as_posix(), tmp_path)["stages"] == swapped
+
+    # new data reruns both stages
+    make_dataset(data_path, rows=220)
+    rerun = run_pipeline(data_path.as_posix(), tmp_path)
+    assert rerun["stages"]["train"]["key"] != manifest["stages"]["train"]["key"]
+
+
+def test_positive_proba_from_encoded_matches_predict_proba(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path, rows=200)
+    X_train, X_val, X_test, y_train, y_val, _ = split_dataset(load_data(data_path.as_posix(), use_cache=False))
+    base_model, calibrated = fit_primary_with_calibration(X_train, y_train, X_val, y_val)
+
+    encoded = base_model[:-1].transform(X_test)
+    np.testing.assert_allclose(
+        positive_proba_from_encoded(calibrated, encoded),
+        calibrated.predict_proba(X_test)[:, 1],
+    )
+    np.testing.assert_allclose(
+        positive_proba_from_encoded(base_model, encoded),
+        base_model.predict_proba(X_test)[:, 1],
+    )
+
+
+def test_hist_backend_handles_native_categoricals(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path, rows=200)
+
+    train(data_path.as_posix(), tmp_path, backend="hist")
+
+    with (tmp_path / "model_metadata.json").open() as handle:
+        assert json.load(handle)["backend"] == "hist"
+    model = joblib.load(tmp_path / "model.joblib")
+    rows = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "race": "NotARace"}])
+    probs = model.predict_proba(rows)[:, 1]
+    assert np.all((probs >= 0) & (probs <= 1))
+
+
+def test_tune_writes_params_that_train_consumes(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path, rows=200)
+
+    payload = tune(data_path.as_posix(), tmp_path, backend="gbm", n_candidates=4, min_budget=5, max_budget=20, n_jobs=1)
+    assert [rung["candidates"] for rung in payload["report"]["rungs"]] == [4, 1]
+    assert payload["params"]["n_estimators"] == 20
+
+    train(data_path.as_posix(), tmp_path, backend="gbm")
+    with (tmp_path / "model_metadata.json").open() as handle:
+        assert json.load(handle)["tuned_params"] == payload["params"]
+    base_model = joblib.load(tmp_path / "base_model.joblib")
+    assert base_model.steps[-1][1].n_estimators == 20
+
+
+def test_encoded_permutation_importance_blocks_and_intervals(tmp_path: Path):
+    data_path = tmp_path / "train.csv"
+    make_dataset(data_path, rows=200)
+    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(load_data(data_path.as_posix(), use_cache=False))
+    base_model, calibrated = fit_primary_with_calibration(X_train, y_train, X_val, y_val)
+
+    preprocess = base_model[:-1]
+    blocks = encoded_blocks(preprocess)
+    assert sorted(blocks) == sorted(X_test.columns)
+    assert len(blocks["time_in_hospital"]) == 1
+    onehot = preprocess.named_steps["preprocess"].named_transformers_["cat"].named_steps["onehot"]
+    assert len(blocks["gender"]) == len(onehot.categories_[CATEGORICAL_COLUMNS.index("gender")])
+    covered = np.concatenate(list(blocks.values()))
+    assert sorted(covered) == list(range(preprocess.transform(X_test.iloc[:1]).shape[1]))
+
+    importance = global_permutation_importance(calibrated, X_test, y_test, n_repeats=3, max_rows=20, n_jobs=1)
+    assert list(importance) == list(X_test.columns)
+    for stats in importance.values():
+        assert stats["ci_low"] <= stats["mean"] <= stats["ci_high"]
+
+
+def test_prune_cache_drops_least_recently_used_files(tmp_path):
+    import os
+
+    from backend.src.training.data import prune_cache
+
+    for age, name in enumerate(["newest.parquet", "middle.npz", "oldest.parquet"]):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+    (tmp_path / "notes.txt").write_bytes(b"x" * 1000)
+    prune_cache(tmp_path, max_bytes=250, keep=tmp_path / "newest.parquet")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["middle.npz", "newest.parquet", "notes.txt"]
@@ -1,4 +1,6 @@
-from backend.src.validation import validate_features
+import pandas as pd
+
+from backend.src.validation import validate_features, validate_frame
 
 VALID_PAYLOAD = {
     "race": "Caucasian",
@@ -64,3 +66,37 @@ def test_validation_rejects_out_of_range_counts():
         assert "num_medications" in str(exc)
     else:
         raise AssertionError("Expected validation error")
+
+
+def test_validate_frame_reports_cells():
+    df = pd.DataFrame(
+        [
+            VALID_PAYLOAD,
+            {**VALID_PAYLOAD, "gender": "Robot", "time_in_hospital": 0},
+            {**VALID_PAYLOAD, "number_inpatient": None},
+        ]
+    )
+    report = validate_frame(df)
+    assert report.valid_mask.tolist() == [True, False, False]
+    assert [(e["row"], e["column"]) for e in report.errors] == [
+        (2, "gender"),
+        (2, "time_in_hospital"),
+        (3, "number_inpatient"),
+    ]
+    assert report.errors[2]["message"] == "number_inpatient is required"
+
+
+def test_validate_frame_caps_errors():
+    df = pd.DataFrame([{**VALID_PAYLOAD, "race": "InvalidRace"}] * 50)
+    report = validate_frame(df, max_errors=10)
+    assert report.n_invalid == 50
+    assert len(report.errors) == 10
+
+
+def test_validate_frame_rejects_fractional_counts():
+    df = pd.DataFrame([VALID_PAYLOAD, {**VALID_PAYLOAD, "time_in_hospital": 4.9}, {**VALID_PAYLOAD, "num_procedures": "2.0"}])
+    report = validate_frame(df)
+    assert report.valid_mask.tolist() == [True, False, True]
+    assert report.errors == [
+        {"row": 2, "column": "time_in_hospital", "value": 4.9, "message": "time_in_hospital must be a whole number"}
+    ]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+DEFAULT_REFERENCE = "data/sample_synthetic.csv"
+TARGET_COLUMN = "readmitted"
+
+
+@dataclass
+class CopulaModel:
+    """Gaussian copula over the numeric columns for one label value."""
+
+    sorted_values: List[np.ndarray]
+    cholesky: np.ndarray
+
+
+@dataclass
+class SyntheticProfile:
+    columns: List[str]
+    categorical_columns: List[str]
+    numeric_columns: List[str]
+    categories: Dict[str, np.ndarray]
+    # joint distribution of categorical tuples (label included) observed in the reference
+    combo_codes: np.ndarray
+    combo_probs: np.ndarray
+    marginal_probs: Dict[str, np.ndarray]
+    # copula per label code; key -1 when the reference has no label column
+    copulas: Dict[int, CopulaModel]
+    label_index: int | None
+
+
+def _fit_copula(numeric: np.ndarray) -> CopulaModel:
+    n_rows, n_cols = numeric.shape
+    sorted_values = [np.sort(numeric[:, j]) for j in range(n_cols)]
+    # normal scores of the ranks; ties broken by order, which is fine for a copula fit
+    ranks = numeric.argsort(axis=0).argsort(axis=0)
+    scores = ndtri((ranks + 0.5) / n_rows)
+    corr = np.corrcoef(scores, rowvar=False) if n_rows > 1 else np.eye(n_cols)
+    corr = np.nan_to_num(corr) + np.eye(n_cols) * 1e-6
+    return CopulaModel(sorted_values=sorted_values, cholesky=np.linalg.cholesky(corr))
+
+
+def fit_profile(reference: pd.DataFrame) -> SyntheticProfile:
+    categorical_columns = [c for c in reference.columns if not pd.api.types.is_numeric_dtype(reference[c])]
+    numeric_columns = [c for c in reference.columns if c not in categorical_columns]
+
+    categories: Dict[str, np.ndarray] = {}
+    codes = np.empty((len(reference), len(categorical_columns)), dtype=np.int32)
+    for j, col in enumerate(categorical_columns):
+        col_codes, uniques = pd.factorize(reference[col].fillna("Unknown").astype(str), sort=True)
+        codes[:, j] = col_codes
+        categories[col] = np.asarray(uniques, dtype=object)
+
+    combo_codes, combo_counts = np.unique(codes, axis=0, return_counts=True)
+    marginal_probs = {
+        col: np.bincount(codes[:, j], minlength=len(categories[col])) / len(reference)
+        for j, col in enumerate(categorical_columns)
+    }
+
+    label_index = categorical_columns.index(TARGET_COLUMN) if TARGET_COLUMN in categorical_columns else None
+    numeric = reference[numeric_columns].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float)
+    copulas: Dict[int, CopulaModel] = {}
+    if label_index is None:
+        copulas[-1] = _fit_copula(numeric)
+    else:
+        for label in range(len(categories[TARGET_COLUMN])):
+            mask = codes[:, label_index] == label
+            copulas[label] = _fit_copula(numeric[mask])
+
+    return SyntheticProfile(
+        columns=list(reference.columns),
+        categorical_columns=categorical_columns,
+        numeric_columns=numeric_columns,
+        categories=categories,
+        combo_codes=combo_codes,
+        combo_probs=combo_counts / combo_counts.sum(),
+        marginal_probs=marginal_probs,
+        copulas=copulas,
+        label_index=label_index,
+    )
+
+
+def _sample_copula(model: CopulaModel, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    z = rng.standard_normal((n_rows, model.cholesky.shape[0])) @ model.cholesky.T
+    u = ndtr(z)
+    out = np.empty_like(u)
+    for j, values in enumerate(model.sorted_values):
+        # inverse empirical CDF: only values seen in the reference are produced
+        idx = np.minimum((u[:, j] * len(values)).astype(np.int64), len(values) - 1)
+        out[:, j] = values[idx]
+    return out
+
+
+def sample_chunk(
+    profile: SyntheticProfile,
+    n_rows: int,
+    rng: np.random.Generator,
+    smoothing: float = 0.1,
+) -> pd.DataFrame:
+    codes = profile.combo_codes[rng.choice(len(profile.combo_probs), size=n_rows, p=profile.combo_probs)]
+    if smoothing > 0:
+        # a fraction of cells is redrawn from the marginals so tuples unseen
+        # in a small reference still appear
+        for j, col in enumerate(profile.categorical_columns):
+            if j == profile.label_index:
+                continue
+            redraw = rng.random(n_rows) < smoothing
+            probs = profile.marginal_probs[col]
+            codes[redraw, j] = rng.choice(len(probs), size=int(redraw.sum()), p=probs)
+
+    numeric = np.empty((n_rows, len(profile.numeric_columns)))
+    if profile.label_index is None:
+        numeric[:] = _sample_copula(profile.copulas[-1], n_rows, rng)
+    else:
+        labels = codes[:, profile.label_index]
+        for label, model in profile.copulas.items():
+            mask = labels == label
+            if mask.any() and model.sorted_values[0].size:
+                numeric[mask] = _sample_copula(model, int(mask.sum()), rng)
+
+    data = {}
+    for j, col in enumerate(profile.categorical_columns):
+        data[col] = pd.Categorical.from_codes(codes[:, j], categories=profile.categories[col])
+    for j, col in enumerate(profile.numeric_columns):
+        data[col] = numeric[:, j].astype(np.int64)
+    return pd.DataFrame(data)[profile.columns]
+
+
+def generate(
+    reference_path: str,
+    out_path: Path,
+    n_rows: int,
+    seed: int = 0,
+    chunk_rows: int = 1_000_000,
+    smoothing: float = 0.1,
+) -> None:
+    """Stream ``n_rows`` synthetic rows to CSV or Parquet, one chunk in memory at a time.
+
+    Output is deterministic for a given seed and chunk size.
+    """
+    profile = fit_profile(pd.read_csv(reference_path, keep_default_na=False, na_values=[""]))
+    rng = np.random.default_rng(seed)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    parquet = out_path.suffix in {".parquet", ".pq"}
+
+    writer = None
+    written = 0
+    try:
+        while written < n_rows:
+            chunk = sample_chunk(profile, min(chunk_rows, n_rows - written), rng, smoothing)
+            if parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(out_path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate schema-valid synthetic patients at scale")
+    parser.add_argument("--reference", default=DEFAULT_REFERENCE, help="CSV whose distributions are reproduced")
+    parser.add_argument("--rows", type=int, required=True, help="Number of rows to generate")
+    parser.add_argument("--out", required=True, help="Output path (.csv or .parquet)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="Rows generated and written per chunk")
+    parser.add_argument(
+        "--smoothing",
+        type=float,
+        default=0.1,
+        help="Fraction of categorical cells redrawn from the marginals",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    start = time.perf_counter()
+    out_path = Path(args.out)
+    generate(args.reference, out_path, args.rows, args.seed, args.chunk_rows, args.smoothing)
+    print(f"Wrote {args.rows} rows to {out_path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()